@@ -0,0 +1,113 @@
+########################
+# Array Operands       #
+########################
+
+import json
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from app.exceptions import ValidationError
+
+# Saved operands and results start with this prefix so they are never mistaken for numbers.
+ARRAY_PREFIX = "array:"
+
+# Arrays with up to this many elements are saved inline; larger ones are saved as a reference
+# (digest, shape and, for arrays read from a file, the file's path).
+INLINE_ELEMENTS = 16
+
+
+class ArrayOperand:
+    # A float64 NumPy array used as a calculation operand or result. Two operands are equal when
+    # their digests are, so comparing history entries never compares array contents. A reference
+    # restored from history carries no data: it is read back from its source file on first use
+    # (and checked against the digest), and results, which have no file, stay digest-only.
+    def __init__(self, data: Any = None, source: Optional[str] = None, digest: Optional[str] = None, shape: Optional[Tuple[int, ...]] = None):
+        import numpy as np
+
+        self._data = None if data is None else np.ascontiguousarray(data, dtype=np.float64)
+        self.source = source
+        self._digest = digest
+        self._shape = shape
+
+    @property
+    def data(self) -> Any:
+        if self._data is None:
+            if self.source is None:
+                raise ValidationError(f"Array data is not saved for {self}")
+            data = load_array(self.source)._data
+            if array_digest(data) != self._digest:
+                raise ValidationError(f"Array file changed since it was recorded: {self.source}")
+            self._data = data
+        return self._data
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = array_digest(self._data)
+        return self._digest
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape if self._data is None else self._data.shape
+
+    @property
+    def inline(self) -> bool:
+        return self._data is not None and self.source is None and self._data.size <= INLINE_ELEMENTS
+
+    def __str__(self) -> str:
+        if self.inline:
+            return ARRAY_PREFIX + json.dumps(self._data.tolist())
+        fields = f"sha256={self.digest};shape={'x'.join(str(size) for size in self.shape)}"
+        return f"{ARRAY_PREFIX}{fields};source={self.source}" if self.source else ARRAY_PREFIX + fields
+
+    def __repr__(self) -> str:
+        return f"ArrayOperand({self})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArrayOperand):
+            return NotImplemented
+        return self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    @staticmethod
+    def parse(text: str) -> "ArrayOperand":
+        body = text.strip()[len(ARRAY_PREFIX):]
+        if not body.startswith("sha256="):
+            return ArrayOperand(json.loads(body))
+        fields = dict(part.split("=", 1) for part in body.split(";", 2))
+        shape = tuple(int(size) for size in fields["shape"].split("x") if size)
+        return ArrayOperand(source=fields.get("source"), digest=fields["sha256"], shape=shape)
+
+
+def array_digest(data: Any) -> str:
+    # Digest of the shape and float64 contents; 16 hex digits keep references short.
+    import hashlib
+
+    digest = hashlib.sha256(repr(data.shape).encode("ascii"))
+    digest.update(data.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def load_array(path: Union[str, Path]) -> ArrayOperand:
+    # Reads a .npy file, or a comma-separated text file with one matrix row per line.
+    import numpy as np
+
+    try:
+        if str(path).endswith(".npy"):
+            data = np.load(path, allow_pickle=False)
+        else:
+            data = np.loadtxt(path, delimiter=",", ndmin=1)
+        return ArrayOperand(data, source=str(path))
+    except (OSError, ValueError) as error:
+        raise ValidationError(f"Cannot load array from {path}: {error}") from error
+
+
+def to_array(value: Any) -> Any:
+    # NumPy view of an operand: arrays as they are, scalars as 0-d arrays.
+    import numpy as np
+
+    if isinstance(value, ArrayOperand):
+        return value.data
+    return np.asarray(float(value) if not hasattr(value, "shape") else value, dtype=np.float64)
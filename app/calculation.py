@@ -2,9 +2,45 @@ from dataclasses import dataclass, field
 import datetime
 from decimal import Decimal, InvalidOperation
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Union
 
+from app.array_operands import ARRAY_PREFIX, ArrayOperand
 from app.exceptions import OperationError
+from app.operations import AggregateOperation, OperationFactory, divide, power, root
+
+
+class Vector(tuple):
+    # Operand list of an aggregate calculation; saved as "[1, 2, 3]" in the operand columns.
+    def __str__(self) -> str:
+        return "[" + ", ".join(str(value) for value in self) + "]"
+
+    @staticmethod
+    def parse(text: str, backend: str = "decimal") -> "Vector":
+        inner = text.strip()[1:-1].strip()
+        return Vector(parse_number(value, backend) for value in inner.split(",")) if inner else Vector()
+
+
+def parse_number(text: str, backend: str = "decimal") -> Union[Decimal, float, int]:
+    # A saved number as the numeric backend that computed it represents it, so a reloaded row
+    # recomputes (and compares) in the same arithmetic: floats for "float", ints for integral
+    # values under "int" (anything else there was computed in Decimal).
+    text = text.strip()
+    if backend == "float":
+        return float(text)
+    if backend == "int":
+        digits = text[1:] if text[:1] in "+-" else text
+        if digits.isdigit() and digits.isascii():
+            return int(text)
+    return Decimal(text)
+
+
+def parse_operand(text: str, backend: str = "decimal") -> Union[Decimal, float, int, Vector, ArrayOperand]:
+    text = text.strip()
+    if text.startswith(ARRAY_PREFIX):
+        return ArrayOperand.parse(text)
+    return Vector.parse(text, backend) if text.startswith("[") else parse_number(text, backend)
+
+BUILT_IN_OPERATIONS = frozenset(("Addition", "Subtraction", "Multiplication", "Division", "Power", "Root"))
 
 
 @dataclass
@@ -24,16 +60,12 @@ class Calculation:
             "Addition": lambda x, y: x + y,
             "Subtraction": lambda x, y: x - y,
             "Multiplication": lambda x, y: x * y,
-            "Division": lambda x, y: x / y,
-            "Power": lambda x, y: x**y,
-            "Root": lambda x, y: (
-                Decimal(pow(float(x), 1 / float(y)))
-                if x >= 0 and y > 0
-                else self._raise_invalid_root(x, y)
-            ),
+            "Division": divide,
+            "Power": power,
+            "Root": lambda x, y: root(x, y) if x >= 0 and y > 0 else self._raise_invalid_root(x, y),
         }
 
-        operation = operations.get(self.operation)
+        operation = operations.get(self.operation) or self._registered_operation()
         if not operation:
             logging.error("Unsupported operation: %s", self.operation)
             raise OperationError(f"Unsupported operation: {self.operation}")
@@ -44,6 +76,16 @@ class Calculation:
             logging.error("Invalid operation: %s", error)
             raise OperationError(f"Invalid operation: {error}")
 
+    def _registered_operation(self):
+        # Operations added through OperationFactory.register_operation (aggregates, plugins).
+        operation_class = OperationFactory.class_for(self.operation)
+        if operation_class is None:
+            return None
+        operation = OperationFactory.instance(operation_class)
+        if isinstance(operation, AggregateOperation):
+            return lambda x, y: operation.execute_vectors([x] if operation.arity == 1 else [x, y])
+        return operation.execute
+
     @staticmethod
     def _raise_invalid_root(x: Decimal, y: Decimal):
         if y == 0:
@@ -62,16 +104,26 @@ class Calculation:
         }
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "Calculation":
+    def from_dict(data: Dict[str, Any], backend: str = "decimal") -> "Calculation":
+        # Numbers are read as `backend` (CalculatorConfig.numeric_backend) represents them.
+        if str(data.get("result", "")).startswith(ARRAY_PREFIX):
+            # Array results are saved as digests of arrays that may be large or no longer on disk,
+            # so they are trusted rather than recomputed.
+            return Calculation.restore(data, backend)
+        if not Calculation.is_supported(data.get("operation")):
+            # Saved by a plugin that is not configured (or no longer loads): the row cannot be
+            # recomputed, so its saved result is kept rather than failing the whole history.
+            logging.warning("Operation %s is not available. Using saved result.", data.get("operation"))
+            return Calculation.restore(data, backend)
         try:
             calc = Calculation(
                 operation=data["operation"],
-                operand1=Decimal(data["operand1"]),
-                operand2=Decimal(data["operand2"]),
+                operand1=parse_operand(data["operand1"], backend),
+                operand2=parse_operand(data["operand2"], backend),
             )
 
             calc.timestamp = datetime.datetime.fromisoformat(data["timestamp"])
-            saved_result = Decimal(data["result"])
+            saved_result = parse_number(data["result"], backend)
             if calc.result != saved_result:
                 logging.warning(
                     "Calculated result %s does not match saved result %s. Using calculated result.",
@@ -82,6 +134,43 @@ class Calculation:
         except (KeyError, InvalidOperation, ValueError) as error:
             logging.error("Invalid data for creating Calculation: %s", error)
             raise OperationError(f"Invalid data for creating Calculation: {error}")
+
+    @staticmethod
+    def is_supported(operation: str) -> bool:
+        # Whether calculate() can recompute this operation now.
+        if operation in BUILT_IN_OPERATIONS:
+            return True
+        try:
+            return OperationFactory.class_for(operation) is not None
+        except ValueError:
+            return False
+
+    @staticmethod
+    def with_result(operation: str, operand1: Any, operand2: Any, result: Any) -> "Calculation":
+        # A new Calculation whose result is already known (from the result cache); it is not recomputed.
+        calc = object.__new__(Calculation)
+        calc.operation = operation
+        calc.operand1 = operand1
+        calc.operand2 = operand2
+        calc.result = result
+        calc.timestamp = datetime.datetime.now()
+        return calc
+
+    @staticmethod
+    def restore(data: Dict[str, Any], backend: str = "decimal") -> "Calculation":
+        # Rebuilds a Calculation from trusted serialized data, keeping the saved result instead of recomputing it.
+        try:
+            calc = object.__new__(Calculation)
+            calc.operation = data["operation"]
+            calc.operand1 = parse_operand(data["operand1"], backend)
+            calc.operand2 = parse_operand(data["operand2"], backend)
+            calc.result = parse_operand(data["result"], backend)
+            calc.timestamp = datetime.datetime.fromisoformat(data["timestamp"])
+            return calc
+        except (KeyError, InvalidOperation, ValueError) as error:
+            logging.error("Invalid data for restoring Calculation: %s", error)
+            raise OperationError(f"Invalid data for restoring Calculation: {error}")
+
     def __str__(self) -> str:
         return f"{self.operation}({self.operand1}, {self.operand2}) = {self.result} at {self.timestamp.isoformat()}"
     
@@ -105,8 +194,9 @@ class Calculation:
     
     def format_result(self, precision: int = 10) -> str:
 
+        result = self.result if isinstance(self.result, Decimal) else Decimal(str(self.result))
         try: 
-            return str(self.result.normalize().quantize(
+            return str(result.normalize().quantize(
                 Decimal('0.' + '0' * precision)
             ).normalize())
         except (InvalidOperation): #pragma: no cover
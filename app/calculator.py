@@ -1,18 +1,44 @@
+from concurrent.futures import Future
 from decimal import Decimal
+from functools import partial
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-import pandas as pd
-
-from app.calculation import Calculation
+from app.array_operands import ArrayOperand
+from app.calculation import Calculation, Vector
 from app.calculator_config import CalculatorConfig
-from app.calculator_memento import CalculatorMemento
+from app.calculator_logging import (
+    SAMPLE_EVICTION,
+    SAMPLE_SAVE,
+    SAMPLE_STRATEGY,
+    configure_logging,
+    elapsed_ms,
+    log_event,
+)
+from app.calculator_macros import Macro, MacroStore
+from app.calculator_memento import (
+    CalculatorMemento,
+    MementoStack,
+    read_memento_stacks,
+    write_memento_stacks,
+)
 from app.exceptions import OperationError, ValidationError
-from app.history import HistoryObserver
+from app.history import HistoryObserver, HistoryView
+from app.history_analytics import AnalyticsFrame
+from app.history_interning import InternPool
+from app.history_journal import HistoryJournal
+from app.history_partitions import PartitionedHistory
+from app.memory_report import MemoryReport, estimate_size, process_peak_rss, shallow_size, traced_memory
 from app.input_validators import InputValidator
-from app.operations import Operation
+from app.operations import AggregateOperation, ArrayOperation, Operation, OperationFactory
+from app.result_cache import WARMABLE_OPERATIONS, ResultCache
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
 
 Number = Union[int, float, Decimal]
 CalculationResult = Union[Number, str]
@@ -32,21 +58,175 @@ class Calculator:
 
         self._setup_logging()
 
+        self.intern_pool = InternPool(self.config.history_interning)
+        self._init_state()
+
+        self._setup_directories()
+        # Plugins are registered by name only (saved history may name them); each is imported
+        # the first time it is used.
+        OperationFactory.discover_plugins(self.config.operation_plugin_specs)
+        self.macros = MacroStore(self.config.macro_file, self.config.default_encoding)
+        if self.config.result_cache_size:
+            self.result_cache = ResultCache(
+                self.config.result_cache_file,
+                self.config.result_cache_size,
+                self.config.numeric_backend,
+            )
+        self.journal = (
+            HistoryJournal(self.config)
+            if self.config.history_partition == "none"
+            else PartitionedHistory(self.config)
+        )
+
+        if self.config.history_load == "eager":
+            try: 
+                self.load_history()
+            except Exception as e:
+                self._set_aside_unreadable_history(e)
+        else:
+            self._defer_history_load()
+        
+        logging.info("Calculator initialized with configuration: %s", self.config )
+
+    def _init_state(self) -> None:
+        # In-memory state only; no logging or disk access so that lightweight sessions can reuse it.
+        self.history_version = 0
+        self._analytics_frames: Dict[bool, AnalyticsFrame] = {}
         self.observers: List[HistoryObserver] = []
+        self._pending_load: Optional[Future] = None
+        self._load_lock = threading.Lock()
+        self._io_lock = threading.Lock()
         self.history: List[Calculation] = []
+        self._last_persisted: Optional[Calculation] = None
         self.operation_strategy: Optional[Operation] = None
+        self.result_cache: Optional[ResultCache] = None
+        self._memory_peak = 0
+        self._unreported_calculations = 0
 
-        self.undo_stack: List[CalculatorMemento] = []
-        self.redo_stack: List[CalculatorMemento] = []
+        self.undo_stack: List[CalculatorMemento] = self._new_memento_stack()
+        self.redo_stack: List[CalculatorMemento] = self._new_memento_stack()
 
-        self._setup_directories()
+    def _new_memento_stack(self) -> MementoStack:
+        return MementoStack(
+            max_depth=self.config.max_undo_depth,
+            max_bytes=self.config.max_undo_bytes,
+        )
 
-        try: 
-            self.load_history()
+    @property
+    def history(self) -> List[Calculation]:
+        self.ensure_history_loaded()
+        return self._history
+
+    @history.setter
+    def history(self, calculations: List[Calculation]) -> None:
+        # Replacing the list (undo, redo, load, direct assignment) cannot be journaled as appends,
+        # so the next save writes a full snapshot. It also supersedes a saved history still loading.
+        self._pending_load = None
+        self._history = calculations
+        self._history_rewritten = True
+        self._analytics_frames = {}
+        self.touch_history()
+
+    @property
+    def history_loaded(self) -> bool:
+        return self._pending_load is None
+
+    def _defer_history_load(self) -> None:
+        # history_load = "lazy" reads the saved history on first access to it; "background" starts
+        # reading at once on a worker thread. Either way calculations can be made meanwhile: they
+        # go into the live list and are merged behind the saved history when it is needed.
+        self._pending_load = Future()
+        # Until then, calculations are appended after whatever is saved, not a rewrite of it.
+        self._history_rewritten = False
+        if self.config.history_load == "background":
+            threading.Thread(target=self._run_history_load, name="history-loader", daemon=True).start()
+
+    def _run_history_load(self) -> None:
+        future = self._pending_load
+        if future is None:
+            return
+        with self._load_lock:
+            if future.running() or future.done():
+                return
+            future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self._read_saved_history())
         except Exception as e:
-            logging.error(f"Failed to load existing history: {e}")
-        
-        logging.info("Calculator initialized with configuration: %s", self.config )
+            future.set_exception(e)
+
+    def _read_saved_history(self) -> List[Calculation]:
+        # Only reading the files holds the I/O lock; recomputing the rows does not block saves.
+        with self._io_lock:
+            rows = self.journal.read() if self.journal.exists() else []
+        build = partial(
+            Calculation.from_dict if self.config.verify_history else Calculation.restore,
+            backend=self.config.numeric_backend,
+        )
+        calculations = [self.intern_pool.build(row, build) for row in rows]
+        if self.result_cache is not None:
+            self.result_cache.warm(calculations)
+        return calculations
+
+    def ensure_history_loaded(self) -> None:
+        # Blocks until a lazily or background-loaded history is merged in; a no-op once it is.
+        future = self._pending_load
+        if future is None:
+            return
+        self._run_history_load()
+        try:
+            loaded = future.result()
+        except Exception as e:
+            self._set_aside_unreadable_history(e)
+            loaded = []
+        self._merge_loaded_history(loaded)
+
+    def _set_aside_unreadable_history(self, error: Exception) -> None:
+        # Starting with an empty history must not let the next save overwrite the saved one.
+        logging.error(f"Failed to load existing history: {error}")
+        try:
+            moved = self.journal.quarantine()
+        except OSError as e:
+            logging.error(f"Could not move unreadable history aside: {e}")
+            return
+        for path in moved:
+            logging.warning(f"Unreadable history moved to {path}")
+
+    def _merge_loaded_history(self, loaded: List[Calculation]) -> None:
+        made = self._history
+        if made:
+            # Calculations auto-saved before the load finished may already be in the saved rows.
+            made_rows = {tuple(calc.to_dict().values()) for calc in made}
+            while loaded and tuple(loaded[-1].to_dict().values()) in made_rows:
+                loaded.pop()
+            for name in ("undo_stack", "redo_stack"):
+                setattr(self, name, self._rebase_stack(getattr(self, name), loaded))
+
+        limit = self.config.max_history_size
+        rewritten = self._history_rewritten
+        self.history = (loaded + made)[-limit:]
+        # The saved rows are on disk already; only calculations made meanwhile still need saving.
+        self._history_rewritten = rewritten
+        if self._last_persisted is None and loaded:
+            self._last_persisted = loaded[-1]
+        logging.info(f"History loaded from {self.journal.location}. Total calculations: {len(self._history)}")
+        if self.config.persist_undo and not made:
+            self.load_undo_state()
+
+    def _rebase_stack(self, stack: MementoStack, loaded: List[Calculation]) -> MementoStack:
+        # Snapshots taken before the load finished lack the saved history in front of them.
+        limit = self.config.max_history_size
+        rebased = self._new_memento_stack()
+        rebased.extend(
+            CalculatorMemento((loaded + memento.history)[-limit:], memento.timestamp)
+            for memento in stack
+        )
+        rebased.merged_steps += getattr(stack, "merged_steps", 0)
+        rebased.dropped_steps += getattr(stack, "dropped_steps", 0)
+        return rebased
+
+    def touch_history(self) -> None:
+        # Bumps the version that HistoryView uses to detect changes; call after mutating history in place.
+        self.history_version += 1
 
     def _setup_logging(self)-> None:
 
@@ -54,12 +234,7 @@ class Calculator:
             os.makedirs(self.config.log_dir, exist_ok=True)
             log_file = self.config.log_file.resolve()
 
-            logging.basicConfig(
-                filename=str(log_file), 
-                level=logging.DEBUG,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                force=True
-            )
+            self.log_sampler = configure_logging(self.config)
             logging.info("Logging initialized. Log file: %s", log_file)
         except Exception as e:
             print(f"Failed to set up logging: {e}")
@@ -83,109 +258,312 @@ class Calculator:
     
     def set_operation(self, operation: Operation) -> None:
         self.operation_strategy = operation
-        logging.info(f"Operation strategy set to: {operation.__class__.__name__}")
+        logging.info("Operation strategy set to: %s", operation.__class__.__name__, extra={"sample": SAMPLE_STRATEGY})
     
     def perform_operation(self, a: Union[str, Number], b: Union[str, Number]) -> CalculationResult:
 
         if not self.operation_strategy:
             logging.error("No operation strategy set.")
             raise OperationError("No operation strategy set.")
+        started = time.perf_counter()
         try:
 
             # Validate inputs and perform the operation using the current strategy. 
-            # The validated inputs are converted to Decimal for consistent precision in calculations. 
+            # The validated inputs are converted by the configured numeric backend (Decimal by default).
             # The result of the operation is stored in a Calculation instance, which is then added to the history and observers are notified of the new calculation.
             validated_a = InputValidator.validate_number(a, self.config)
             validated_b = InputValidator.validate_number(b, self.config)
             
-            result = self.operation_strategy.execute(validated_a, validated_b)
+            result, cached = self._execute(validated_a, validated_b)
 
-            calculation = Calculation(
-                operation = str(self.operation_strategy), 
-                operand1 = validated_a,
-                operand2 = validated_b,
-            ) 
-
-            # Save the current state before performing the operation to enable undo functionality.
-            self.undo_stack.append(CalculatorMemento(self.history.copy()))
-
-            # Clear the redo stack whenever a new operation is performed, as the redo history is no longer valid after a new operation.
-            self.redo_stack.clear()
+            operation = str(self.operation_strategy)
+            if cached and operation in WARMABLE_OPERATIONS:
+                # For these operations the cached result is exactly what Calculation would compute.
+                calculation = Calculation.with_result(operation, validated_a, validated_b, result)
+            else:
+                calculation = Calculation(
+                    operation = operation, 
+                    operand1 = validated_a,
+                    operand2 = validated_b,
+                ) 
 
-            # Append the new calculation to the history 
-            self.history.append(calculation)
-            
-            if len(self.history) > self.config.max_history_size:
-                removed_calculation = self.history.pop(0)
-                logging.info(f"History limit exceeded. Removed oldest calculation: {removed_calculation}"  )
-            
-            self.notify_observers(calculation)
+            self._record(calculation, started)
             
             return result
         except ValidationError as e:
             logging.error(f"Input validation error: {e}")
+            self._log_error_event("perform_operation", e, started)
             raise OperationError(f"Input validation error: {str(e)}")
         except Exception as e:
             logging.error(f"Operation error: {e}")
+            self._log_error_event("perform_operation", e, started)
             raise OperationError(f"Operation error: {str(e)}")
+
+    def perform_aggregate(self, *operand_lists: Iterable[Union[str, Number]]) -> CalculationResult:
+        # Runs an aggregate strategy (sum, mean, dot, ...) over whole operand lists and records it
+        # as a single calculation: one validation pass, one undo snapshot and one notification
+        # (so one auto-save) for the whole batch.
+        if not isinstance(self.operation_strategy, AggregateOperation):
+            logging.error("Operation strategy does not take operand lists.")
+            raise OperationError("Operation strategy does not take operand lists.")
+        started = time.perf_counter()
+        try:
+            vectors = [Vector(InputValidator.validate_many(values, self.config)) for values in operand_lists]
+            self.operation_strategy.validate_vectors(vectors)
+            calculation = Calculation(
+                operation=str(self.operation_strategy),
+                operand1=vectors[0],
+                operand2=vectors[1] if len(vectors) > 1 else Vector(),
+            )
+            self._record(calculation, started)
+            return calculation.result
+        except ValidationError as e:
+            logging.error(f"Input validation error: {e}")
+            self._log_error_event("perform_aggregate", e, started)
+            raise OperationError(f"Input validation error: {str(e)}")
+        except Exception as e:
+            logging.error(f"Operation error: {e}")
+            self._log_error_event("perform_aggregate", e, started)
+            raise OperationError(f"Operation error: {str(e)}")
+
+    def perform_array(self, a: Any, b: Any) -> ArrayOperand:
+        # Runs an array strategy (vadd, vscale, matmul, solve). Operands may be numbers, array file
+        # paths or arrays; see InputValidator.validate_array.
+        if not isinstance(self.operation_strategy, ArrayOperation):
+            logging.error("Operation strategy does not take array operands.")
+            raise OperationError("Operation strategy does not take array operands.")
+        started = time.perf_counter()
+        try:
+            calculation = Calculation(
+                operation=str(self.operation_strategy),
+                operand1=InputValidator.validate_array(a, self.config),
+                operand2=InputValidator.validate_array(b, self.config),
+            )
+            self._record(calculation, started)
+            return calculation.result
+        except ValidationError as e:
+            logging.error(f"Input validation error: {e}")
+            self._log_error_event("perform_array", e, started)
+            raise OperationError(f"Input validation error: {str(e)}")
+        except Exception as e:
+            logging.error(f"Operation error: {e}")
+            self._log_error_event("perform_array", e, started)
+            raise OperationError(f"Operation error: {str(e)}")
+
+    def replay_macro(self, macro: Macro, inputs: Iterable[Union[str, Number]], record: bool = False) -> List[CalculationResult]:
+        # Runs a macro over every input and returns one result per input. Each input goes through
+        # one fused evaluation (Macro.compile) and nothing is added to history. With record=True
+        # every step is performed as a regular calculation instead, with its own history entry,
+        # undo snapshot and observer notification.
+        started = time.perf_counter()
+        try:
+            values = InputValidator.validate_many(inputs, self.config)
+            run = self._record_macro_steps(macro, started) if record else macro.compile(self.config)
+            results = []
+            for index, value in enumerate(values):
+                try:
+                    results.append(run(value))
+                except (ValidationError, OperationError, ArithmeticError, ValueError) as e:
+                    raise OperationError(f"Macro {macro.name} failed on input {index + 1} ({value}): {e}") from e
+        except ValidationError as e:
+            logging.error(f"Input validation error: {e}")
+            self._log_error_event("replay_macro", e, started)
+            raise OperationError(f"Input validation error: {str(e)}")
+        except OperationError as e:
+            logging.error(f"Operation error: {e}")
+            self._log_error_event("replay_macro", e, started)
+            raise
+        except Exception as e:
+            logging.error(f"Operation error: {e}")
+            self._log_error_event("replay_macro", e, started)
+            raise OperationError(f"Operation error: {str(e)}")
+        logging.info(f"Macro {macro.name} replayed over {len(results)} input(s)")
+        log_event("macro", name=macro.name, inputs=len(results), recorded=record, duration_ms=elapsed_ms(started))
+        return results
+
+    def _record_macro_steps(self, macro: Macro, started: float) -> Callable[[Number], Number]:
+        steps = [
+            (OperationFactory.create_operation(step.operation), InputValidator.validate_number(step.operand, self.config))
+            for step in macro.steps
+        ]
+
+        def run(value: Number) -> Number:
+            for operation, operand in steps:
+                result = operation.execute(value, operand)
+                self._record(Calculation(operation=str(operation), operand1=value, operand2=operand), started)
+                value = result
+            return value
+
+        return run
+
+    def _record(self, calculation: Calculation, started: float) -> None:
+        # The live list is used directly so that a saved history still loading is not waited for.
+        history = self._history
+        self.intern_pool.calculation(calculation)
+
+        # Save the current state before performing the operation to enable undo functionality.
+        self.undo_stack.append(CalculatorMemento(history.copy()))
+
+        # Clear the redo stack whenever a new operation is performed, as the redo history is no longer valid after a new operation.
+        self.redo_stack.clear()
+
+        # Append the new calculation to the history 
+        history.append(calculation)
+        
+        if len(history) > self.config.max_history_size:
+            removed_calculation = history.pop(0)
+            logging.info(
+                "History limit exceeded. Removed oldest calculation: %s",
+                removed_calculation,
+                extra={"sample": SAMPLE_EVICTION},
+            )
+        self.touch_history()
+        log_event(
+            "calculation",
+            calculation=calculation,
+            history_size=len(history),
+            duration_ms=elapsed_ms(started),
+        )
+        
+        self.notify_observers(calculation)
+
+        if self.config.memory_report_every:
+            self._unreported_calculations += 1
+            if self._unreported_calculations >= self.config.memory_report_every:
+                self.memory_report()
+
+    def _execute(self, a: Number, b: Number) -> Tuple[Number, bool]:
+        # Runs the strategy, consulting the persistent result cache first when one is configured.
+        # Returns the result and whether it came from the cache.
+        cache = self.result_cache
+        if cache is None:
+            return self.operation_strategy.execute(a, b), False
+        operation = str(self.operation_strategy)
+        result = cache.get(operation, a, b)
+        if result is not None:
+            return result, True
+        result = self.operation_strategy.execute(a, b)
+        cache.put(operation, a, b, result)
+        return result, False
+
+    def _log_error_event(self, source: str, error: Exception, started: float) -> None:
+        log_event(
+            "error",
+            logging.ERROR,
+            source=source,
+            error_type=type(error).__name__,
+            message=str(error),
+            duration_ms=elapsed_ms(started),
+        )
     
-    def save_history(self) -> None:
+    def save_history(self, sync: bool = False) -> None:
+        # Appends are fsynced according to config.durability; sync=True forces any pending fsync now.
+        started = time.perf_counter()
         try: 
 
             self.config.history_dir.mkdir(parents=True, exist_ok=True)
-            history_data = [
-                {
-                    'operation': calc.operation,
-                    'operand1': str(calc.operand1),
-                    'operand2': str(calc.operand2),
-                    'result': str(calc.result),
-                    'timestamp': calc.timestamp.isoformat()
-                }
-                for calc in self.history
-            ]
-
-            if history_data: 
-                
-                df = pd.DataFrame(history_data)
-
-                df.to_csv(self.config.history_file, index=False)
-                logging.info(f"History saved to {self.config.history_file}")
-            
-            else: 
-                pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']).to_csv(self.config.history_file, index=False)
-                logging.info(f"History file created: {self.config.history_file}")
+            pending = self._unsaved_calculations()
+
+            if pending is None or self.journal.checkpoint_due(len(pending)):
+                mode, rows, path = "checkpoint", len(self.history), self.journal.location
+                self.journal.checkpoint(self.history)
+                logging.info(f"History saved to {self.journal.location}")
+            elif pending:
+                mode, rows, path = "append", len(pending), self.journal.journal_location
+                with self._io_lock:
+                    self.journal.append(pending)
+                logging.info(
+                    "Appended %d calculation(s) to %s",
+                    len(pending),
+                    self.journal.journal_location,
+                    extra={"sample": SAMPLE_SAVE},
+                )
+            else:
+                mode, rows, path = "unchanged", 0, self.journal.location
+
+            self._mark_persisted()
+            if self.config.persist_undo:
+                self.save_undo_state()
+            if sync:
+                self.journal.sync()
+            if self.result_cache is not None:
+                self.result_cache.flush()
+            log_event("save", mode=mode, rows=rows, path=path, duration_ms=elapsed_ms(started))
         except Exception as e:
             logging.error(f"Failed to save history: {e}")
+            self._log_error_event("save_history", e, started)
             raise OperationError(f"Failed to save history: {str(e)}")
+
+    def save_undo_state(self) -> None:
+        write_memento_stacks(self.config.undo_file, self.undo_stack, self.redo_stack, self._history_tip())
+        logging.info(f"Undo state saved to {self.config.undo_file}")
+
+    def load_undo_state(self) -> bool:
+        # Restores the undo/redo stacks lazily; a file saved for a different history is ignored.
+        # An unreadable undo file only costs the undo state: the stacks start empty and the history
+        # it was loaded with is kept.
+        try:
+            stacks = read_memento_stacks(
+                self.config.undo_file, self._history_tip(), self.intern_pool, self.config.numeric_backend
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as error:
+            logging.warning(f"Ignoring unreadable undo state in {self.config.undo_file}: {error}")
+            return False
+        if stacks is None:
+            logging.info(f"No matching undo state in {self.config.undo_file}")
+            return False
+        self.undo_stack = self._new_memento_stack()
+        self.redo_stack = self._new_memento_stack()
+        self.undo_stack.extend(stacks[0])
+        self.redo_stack.extend(stacks[1])
+        logging.info(f"Undo state loaded from {self.config.undo_file}: {len(self.undo_stack)} undo, {len(self.redo_stack)} redo")
+        return True
+
+    def _history_tip(self) -> Optional[Dict[str, Any]]:
+        return self.history[-1].to_dict() if self.history else None
+
+    def _unsaved_calculations(self) -> Optional[List[Calculation]]:
+        # Calculations appended since the last save, or None when only a full snapshot can represent the change.
+        # Reads the live list, so saving calculations made while the saved history loads does not wait for it.
+        history = self._history
+        if self._history_rewritten or not self.journal.exists():
+            return None
+        if self._last_persisted is None:
+            return list(history)
+        for index in range(len(history) - 1, -1, -1):
+            if history[index] is self._last_persisted:
+                return history[index + 1:]
+        return None
+
+    def _mark_persisted(self) -> None:
+        self._last_persisted = self._history[-1] if self._history else None
+        self._history_rewritten = False
         
     def load_history(self) -> None:
+        started = time.perf_counter()
         try: 
-            if self.config.history_file.exists():
-                df = pd.read_csv(self.config.history_file)
-
-                if not df.empty: 
-                    self.history = [
-                        Calculation.from_dict({ 
-                            'operation': row['operation'], 
-                            'operand1': row['operand1'], 
-                            'operand2': row['operand2'], 
-                            'result': row['result'], 
-                            'timestamp': row['timestamp'] 
-                        })
-                        for _, row in df.iterrows()
-                    ]
-                    logging.info(f"History loaded from {self.config.history_file}. Total calculations: {len(self.history)}")
+            if self.journal.exists():
+                self.history = self._read_saved_history()
+
+                if self.history: 
+                    logging.info(f"History loaded from {self.journal.location}. Total calculations: {len(self.history)}")
                 else:
-                    self.history = []
-                    logging.info(f"History file is empty: {self.config.history_file}")
+                    logging.info(f"History file is empty: {self.journal.location}")
             else:
                 self.history = []
-                logging.info(f"History file does not exist: {self.config.history_file}")
+                logging.info(f"History file does not exist: {self.journal.location}")
+            self._mark_persisted()
+            if self.config.persist_undo:
+                self.load_undo_state()
         except Exception as e:
             logging.error(f"Failed to load history: {e}")
+            self._log_error_event("load_history", e, started)
             raise OperationError(f"Failed to load history: {str(e)}")
         
-    def get_history_dataframe(self) -> pd.DataFrame:
+    def get_history_dataframe(self) -> "pd.DataFrame":
+        # pandas is imported on first use, so programs that never ask for a frame do not load it.
+        import pandas as pd
+
         history_data = []
         
         for calc in self.history:
@@ -197,6 +575,15 @@ class Calculator:
                 "timestamp": calc.timestamp.isoformat()  # Convert datetime to ISO format string
             })
         return pd.DataFrame(history_data)
+
+    def get_analytics_dataframe(self, decimal: bool = False) -> "pd.DataFrame":
+        # Typed, cached frame for pandas/NumPy analysis: float64 numbers (Decimal objects with decimal=True),
+        # datetime64 timestamps and a categorical operation column. New calculations are appended
+        # incrementally; undo, redo, clear and load rebuild it. Treat the returned frame as read-only.
+        frame = self._analytics_frames.get(decimal)
+        if frame is None:
+            frame = self._analytics_frames[decimal] = AnalyticsFrame(decimal)
+        return frame.refresh(self.history)
     
     def show_history(self) -> None:
         return [
@@ -205,27 +592,102 @@ class Calculator:
         ]
 
     def get_history(self) -> List[Calculation]:
+        # Defensive copy; use history_view() when the caller only reads.
         return self.history.copy()
 
+    def history_view(self) -> HistoryView:
+        return HistoryView(self)
+
     def clear_history(self) -> None:
+        self._pending_load = None
         self.history.clear()
+        self._history_rewritten = True
+        self._analytics_frames = {}
+        self.touch_history()
         self.undo_stack.clear()
         self.redo_stack.clear()
         logging.info("History cleared.")
     
+    def undo_memory_usage(self) -> Dict[str, int]:
+        # Metric for undo/redo memory: entry counts, estimated bytes and how many steps were compacted away.
+        usage: Dict[str, int] = {}
+        for name, stack in (("undo", self.undo_stack), ("redo", self.redo_stack)):
+            usage[f"{name}_entries"] = len(stack)
+            usage[f"{name}_bytes"] = (
+                stack.memory_bytes()
+                if isinstance(stack, MementoStack)
+                else sum(memento.memory_bytes() for memento in stack)
+            )
+            usage[f"{name}_merged_steps"] = getattr(stack, "merged_steps", 0)
+            usage[f"{name}_dropped_steps"] = getattr(stack, "dropped_steps", 0)
+        return usage
+
+    def memory_report(self) -> MemoryReport:
+        # Estimated memory held by history, undo and redo snapshots, caches and observers; logged as
+        # a "memory" event. Each object is counted once, in the first category that reaches it, so
+        # snapshots only add what they do not share with the live history. Snapshots persisted to
+        # disk and not yet loaded are not read. A history still loading is not waited for.
+        # Sharing can only be seen by walking the whole object graph, so a report costs time linear
+        # in the history size times the undo depth (tens of milliseconds for 1000 calculations and
+        # 100 snapshots); it is taken on request or every memory_report_every calculations.
+        seen: set = set()
+        history_bytes = estimate_size([self._history], seen)
+        undo_bytes = estimate_size([self.undo_stack], seen)
+        redo_bytes = estimate_size([self.redo_stack], seen)
+        cache_bytes = sum(frame.memory_bytes() for frame in self._analytics_frames.values())
+        cache_bytes += self.intern_pool.memory_bytes(seen)
+        if self.result_cache is not None:
+            cache_bytes += self.result_cache.memory_bytes(seen)
+        report = MemoryReport(
+            history_bytes=history_bytes,
+            undo_bytes=undo_bytes,
+            redo_bytes=redo_bytes,
+            cache_bytes=cache_bytes,
+            observer_bytes=shallow_size(self.observers, seen),
+            history_entries=len(self._history),
+            undo_entries=len(self.undo_stack),
+            redo_entries=len(self.redo_stack),
+            process_peak_rss=process_peak_rss(),
+            **traced_memory(),
+        )
+        self._memory_peak = report.peak_bytes = max(self._memory_peak, report.total_bytes)
+        self._unreported_calculations = 0
+        log_event("memory", **report.to_dict())
+        return report
+
     def undo(self) -> bool:
+        started = time.perf_counter()
+        self.ensure_history_loaded()
         if not self.undo_stack:
             return False
+        # The popped snapshot's list becomes the live history and the current list moves into
+        # the redo snapshot, so neither needs to be copied.
         memento = self.undo_stack.pop()
-        self.redo_stack.append(CalculatorMemento(self.history.copy()))
-        self.history = memento.history.copy()
+        self.redo_stack.append(CalculatorMemento(self.history))
+        self.history = memento.history
+        log_event(
+            "undo",
+            history_size=len(self.history),
+            undo_depth=len(self.undo_stack),
+            redo_depth=len(self.redo_stack),
+            duration_ms=elapsed_ms(started),
+        )
         return True
     
     def redo(self) -> bool:
+        started = time.perf_counter()
+        self.ensure_history_loaded()
         if not self.redo_stack:
             return False
         memento = self.redo_stack.pop()
-        self.undo_stack.append(CalculatorMemento(self.history.copy()))
-        self.history = memento.history.copy()
+        self.undo_stack.append(CalculatorMemento(self.history))
+        self.history = memento.history
+        log_event(
+            "redo",
+            history_size=len(self.history),
+            undo_depth=len(self.undo_stack),
+            redo_depth=len(self.redo_stack),
+            duration_ms=elapsed_ms(started),
+        )
         return True
     
\ No newline at end of file
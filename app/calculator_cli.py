@@ -0,0 +1,70 @@
+########################
+# One-shot CLI         #
+########################
+
+from decimal import Decimal
+import sys
+from typing import List, Optional
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import CalculatorError
+from app.input_validators import InputValidator
+from app.operations import AggregateOperation, ArrayOperation, OperationFactory
+
+USAGE = "Usage: python -m app.calculator_repl OPERATION OPERAND1 OPERAND2 [--save]"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Computes one two-operand operation, prints the result and exits: 0 on success, 1 when the
+    # operation fails, 2 on bad usage. Nothing is read from or written to disk and no logging is
+    # set up, unless --save asks for the calculation to be added to the saved history; only then
+    # is the Calculator (and everything it imports) loaded.
+    args = list(sys.argv[1:] if argv is None else argv)
+    save = "--save" in args
+    if save:
+        args.remove("--save")
+    if len(args) != 3:
+        print(USAGE, file=sys.stderr)
+        return 2
+    name, a, b = args
+
+    try:
+        config = CalculatorConfig()
+        operation = _binary_operation(name, config)
+        if save:
+            result = _perform_and_save(operation, a, b)
+        else:
+            result = operation.execute(InputValidator.validate_number(a, config), InputValidator.validate_number(b, config))
+    except ValueError as error:
+        print(f"{error}. {USAGE}", file=sys.stderr)
+        return 2
+    except CalculatorError as error:
+        print(f"Operation failed: {error}", file=sys.stderr)
+        return 1
+
+    if isinstance(result, Decimal):
+        result = result.normalize()
+    print(result)
+    return 0
+
+
+def _binary_operation(name: str, config: CalculatorConfig):
+    # Built-in operations need no plugin discovery; plugins are only looked up for other names.
+    try:
+        operation = OperationFactory.create_operation(name)
+    except ValueError:
+        OperationFactory.discover_plugins(config.operation_plugin_specs)
+        operation = OperationFactory.create_operation(name)
+    if isinstance(operation, (AggregateOperation, ArrayOperation)):
+        raise ValueError(f"{name} does not take two numbers")
+    return operation
+
+
+def _perform_and_save(operation, a: str, b: str):
+    from app.calculator import Calculator
+
+    calc = Calculator()
+    calc.set_operation(operation)
+    result = calc.perform_operation(a, b)
+    calc.save_history(sync=True)
+    return result
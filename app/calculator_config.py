@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 from decimal import Decimal
+import logging
 from numbers import Number
 import os
 from pathlib import Path
-from typing import Optional
+import re
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 
@@ -11,6 +13,34 @@ from app.exceptions import ConfigurationError
 
 load_dotenv()
 
+# Numeric backends accepted by CalculatorConfig.numeric_backend:
+#   decimal - every operand becomes a normalized Decimal; exact for +, -, * and correctly rounded
+#             to the Decimal context (28 significant digits) for division. This is the default.
+#   int     - operands that are integral stay Python ints, so +, -, * and exact division are
+#             arbitrary-precision and exact; non-integral operands and inexact quotients fall back to Decimal.
+#   float   - operands become IEEE-754 float64 (about 15-17 significant digits, relative error
+#             up to 2**-53 per operation); NaN and infinity are rejected. Fastest, for analytics only.
+# power follows the backend (int bases are raised as Decimals). root goes through float64 in every
+# backend, so its results carry float64 precision even as Decimals.
+NUMERIC_BACKENDS = ("decimal", "int", "float")
+
+# History partitioning accepted by CalculatorConfig.history_partition: "none" keeps a single
+# snapshot plus journal; "day" and "hour" write one append-only file per period instead.
+HISTORY_PARTITIONS = ("none", "day", "hour")
+
+# When appended history is fsynced (CalculatorConfig.durability); see history_journal.DurabilityPolicy.
+DURABILITY_POLICIES = ("always", "batch", "interval")
+
+# When Calculator reads the saved history (CalculatorConfig.history_load): "eager" in __init__,
+# "lazy" on first access to it, "background" on a worker thread started by __init__.
+HISTORY_LOAD_MODES = ("eager", "lazy", "background")
+
+# Sharing of repeated history data (CalculatorConfig.history_interning); see history_interning.InternPool.
+HISTORY_INTERNING_MODES = ("off", "values", "calculations")
+
+# One operation_plugins entry: name=module.path:ClassName.
+PLUGIN_SPEC = re.compile(r"\w+=[\w.]+:\w+")
+
 
 def get_project_root() -> Path:
     return Path(__file__).resolve().parent.parent
@@ -24,6 +54,29 @@ class CalculatorConfig:
     precision: Optional[int] = None
     max_input_value: Optional[Number] = None
     default_encoding: Optional[str] = None
+    numeric_backend: Optional[str] = None
+    max_undo_depth: Optional[int] = None
+    max_undo_bytes: Optional[int] = None
+    checkpoint_every: Optional[int] = None
+    checkpoint_seconds: Optional[float] = None
+    persist_undo: Optional[bool] = None
+    history_partition: Optional[str] = None
+    history_retention_days: Optional[float] = None
+    history_load: Optional[str] = None
+    durability: Optional[str] = None
+    fsync_every: Optional[int] = None
+    fsync_interval_ms: Optional[float] = None
+    result_cache_size: Optional[int] = None
+    log_level: Optional[str] = None
+    log_max_bytes: Optional[int] = None
+    log_backup_count: Optional[int] = None
+    log_rotate_seconds: Optional[float] = None
+    log_sample_rate: Optional[int] = None
+    event_log: Optional[bool] = None
+    operation_plugins: Optional[str] = None
+    history_interning: Optional[str] = None
+    verify_history: Optional[bool] = None
+    memory_report_every: Optional[int] = None
 
     def __post_init__(self) -> None:
         project_root = get_project_root()
@@ -59,8 +112,147 @@ class CalculatorConfig:
             self.default_encoding or os.getenv("CALCULATOR_DEFAULT_ENCODING", "utf-8")
         )
 
+        self.numeric_backend = (
+            self.numeric_backend or os.getenv("CALCULATOR_NUMERIC_BACKEND", "decimal")
+        ).lower()
+
+        self.max_undo_depth = (
+            self.max_undo_depth
+            if self.max_undo_depth is not None
+            else int(os.getenv("CALCULATOR_MAX_UNDO_DEPTH", "100"))
+        )
+
+        self.max_undo_bytes = (
+            self.max_undo_bytes
+            if self.max_undo_bytes is not None
+            else int(os.getenv("CALCULATOR_MAX_UNDO_BYTES", str(16 * 1024 * 1024)))
+        )
+
+        self.checkpoint_every = (
+            self.checkpoint_every
+            if self.checkpoint_every is not None
+            else int(os.getenv("CALCULATOR_CHECKPOINT_EVERY", "100"))
+        )
+
+        self.checkpoint_seconds = (
+            self.checkpoint_seconds
+            if self.checkpoint_seconds is not None
+            else float(os.getenv("CALCULATOR_CHECKPOINT_SECONDS", "300"))
+        )
+
+        persist_undo_env = os.getenv("CALCULATOR_PERSIST_UNDO", "false").lower()
+        self.persist_undo = (
+            self.persist_undo if self.persist_undo is not None else persist_undo_env == "true"
+        )
+
+        self.history_partition = (
+            self.history_partition or os.getenv("CALCULATOR_HISTORY_PARTITION", "none")
+        ).lower()
+
+        # 0 keeps partitions forever.
+        self.history_retention_days = (
+            self.history_retention_days
+            if self.history_retention_days is not None
+            else float(os.getenv("CALCULATOR_HISTORY_RETENTION_DAYS", "0"))
+        )
+
+        self.history_load = (
+            self.history_load or os.getenv("CALCULATOR_HISTORY_LOAD", "eager")
+        ).lower()
+
+        self.durability = (
+            self.durability or os.getenv("CALCULATOR_DURABILITY", "always")
+        ).lower()
+
+        self.fsync_every = (
+            self.fsync_every
+            if self.fsync_every is not None
+            else int(os.getenv("CALCULATOR_FSYNC_EVERY", "10"))
+        )
+
+        self.fsync_interval_ms = (
+            self.fsync_interval_ms
+            if self.fsync_interval_ms is not None
+            else float(os.getenv("CALCULATOR_FSYNC_INTERVAL_MS", "1000"))
+        )
+
+        # Maximum entries in the persistent result cache; 0 disables it.
+        self.result_cache_size = (
+            self.result_cache_size
+            if self.result_cache_size is not None
+            else int(os.getenv("CALCULATOR_RESULT_CACHE_SIZE", "0"))
+        )
+
+        self.log_level = (
+            self.log_level or os.getenv("CALCULATOR_LOG_LEVEL", "INFO")
+        ).upper()
+
+        # Size- and time-based rotation of calculator.log; 0 disables either trigger.
+        self.log_max_bytes = (
+            self.log_max_bytes
+            if self.log_max_bytes is not None
+            else int(os.getenv("CALCULATOR_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+        )
+
+        self.log_backup_count = (
+            self.log_backup_count
+            if self.log_backup_count is not None
+            else int(os.getenv("CALCULATOR_LOG_BACKUP_COUNT", "5"))
+        )
+
+        self.log_rotate_seconds = (
+            self.log_rotate_seconds
+            if self.log_rotate_seconds is not None
+            else float(os.getenv("CALCULATOR_LOG_ROTATE_SECONDS", "0"))
+        )
+
+        # Keep 1 in log_sample_rate hot-path log records (per calculation, save and eviction).
+        self.log_sample_rate = (
+            self.log_sample_rate
+            if self.log_sample_rate is not None
+            else int(os.getenv("CALCULATOR_LOG_SAMPLE_RATE", "1"))
+        )
+
+        event_log_env = os.getenv("CALCULATOR_EVENT_LOG", "false").lower()
+        self.event_log = (
+            self.event_log if self.event_log is not None else event_log_env == "true"
+        )
+
+        # Extra operations as "name=module:Class" entries separated by commas; imported on first use.
+        self.operation_plugins = (
+            self.operation_plugins
+            if self.operation_plugins is not None
+            else os.getenv("CALCULATOR_OPERATION_PLUGINS", "")
+        )
+
+        self.history_interning = (
+            self.history_interning or os.getenv("CALCULATOR_HISTORY_INTERNING", "values")
+        ).lower()
+
+        # Recompute every row of the saved history on load. Histories checked offline with
+        # python -m app.history_audit can turn this off and trust the saved results.
+        verify_history_env = os.getenv("CALCULATOR_VERIFY_HISTORY", "true").lower()
+        self.verify_history = (
+            self.verify_history if self.verify_history is not None else verify_history_env == "true"
+        )
+
+        # Every N calculations, a memory report is taken and logged as a "memory" event (0: never).
+        self.memory_report_every = (
+            self.memory_report_every
+            if self.memory_report_every is not None
+            else int(os.getenv("CALCULATOR_MEMORY_REPORT_EVERY", "0"))
+        )
+
         self.validate()
 
+    @property
+    def operation_plugin_specs(self) -> Dict[str, str]:
+        specs = {}
+        for entry in filter(None, (part.strip() for part in self.operation_plugins.split(","))):
+            name, _, target = entry.partition("=")
+            specs[name.strip()] = target.strip()
+        return specs
+
     @property
     def log_dir(self) -> Path:
         return Path(
@@ -82,12 +274,51 @@ class CalculatorConfig:
             )
         ).resolve()
 
+    @property
+    def history_journal_file(self) -> Path:
+        return Path(
+            os.getenv(
+                "CALCULATOR_HISTORY_JOURNAL_FILE",
+                str(self.history_file.with_name(self.history_file.name + ".journal")),
+            )
+        ).resolve()
+
+    @property
+    def history_partition_dir(self) -> Path:
+        return Path(
+            os.getenv("CALCULATOR_HISTORY_PARTITION_DIR", str(self.history_dir / "partitions"))
+        ).resolve()
+
+    @property
+    def result_cache_file(self) -> Path:
+        return Path(
+            os.getenv("CALCULATOR_RESULT_CACHE_FILE", str(self.history_dir / "calculator_results.sqlite3"))
+        ).resolve()
+
+    @property
+    def macro_file(self) -> Path:
+        return Path(
+            os.getenv("CALCULATOR_MACRO_FILE", str(self.history_dir / "calculator_macros.json"))
+        ).resolve()
+
+    @property
+    def undo_file(self) -> Path:
+        return Path(
+            os.getenv("CALCULATOR_UNDO_FILE", str(self.history_dir / "calculator_undo.jsonl"))
+        ).resolve()
+
     @property
     def log_file(self) -> Path:
         return Path(
             os.getenv("CALCULATOR_LOG_FILE", str(self.log_dir / "calculator.log"))
         ).resolve()
 
+    @property
+    def event_log_file(self) -> Path:
+        return Path(
+            os.getenv("CALCULATOR_EVENT_LOG_FILE", str(self.log_dir / "calculator_events.jsonl"))
+        ).resolve()
+
     def validate(self) -> None:
         if self.max_history_size <= 0:
             raise ConfigurationError("max_history_size must be positive")
@@ -97,3 +328,59 @@ class CalculatorConfig:
             raise ConfigurationError("max_input_value must be positive")
         if not self.default_encoding:
             raise ConfigurationError("default_encoding must be specified")
+        if self.max_undo_depth <= 0:
+            raise ConfigurationError("max_undo_depth must be positive")
+        if self.max_undo_bytes <= 0:
+            raise ConfigurationError("max_undo_bytes must be positive")
+        if self.checkpoint_every <= 0:
+            raise ConfigurationError("checkpoint_every must be positive")
+        if self.checkpoint_seconds <= 0:
+            raise ConfigurationError("checkpoint_seconds must be positive")
+        if self.history_retention_days < 0:
+            raise ConfigurationError("history_retention_days must not be negative")
+        if self.history_partition not in HISTORY_PARTITIONS:
+            raise ConfigurationError(
+                f"history_partition must be one of: {', '.join(HISTORY_PARTITIONS)}"
+            )
+        if self.history_load not in HISTORY_LOAD_MODES:
+            raise ConfigurationError(
+                f"history_load must be one of: {', '.join(HISTORY_LOAD_MODES)}"
+            )
+        if self.history_interning not in HISTORY_INTERNING_MODES:
+            raise ConfigurationError(
+                f"history_interning must be one of: {', '.join(HISTORY_INTERNING_MODES)}"
+            )
+        if self.durability not in DURABILITY_POLICIES:
+            raise ConfigurationError(
+                f"durability must be one of: {', '.join(DURABILITY_POLICIES)}"
+            )
+        if self.fsync_every <= 0:
+            raise ConfigurationError("fsync_every must be positive")
+        if self.fsync_interval_ms <= 0:
+            raise ConfigurationError("fsync_interval_ms must be positive")
+        if self.result_cache_size < 0:
+            raise ConfigurationError("result_cache_size must not be negative")
+        if not isinstance(logging.getLevelName(self.log_level), int):
+            raise ConfigurationError(f"log_level is not a logging level: {self.log_level}")
+        if self.log_max_bytes < 0:
+            raise ConfigurationError("log_max_bytes must not be negative")
+        if self.log_backup_count < 0:
+            raise ConfigurationError("log_backup_count must not be negative")
+        if self.log_rotate_seconds < 0:
+            raise ConfigurationError("log_rotate_seconds must not be negative")
+        # A RotatingFileHandler with no backups never rolls over, so the log would grow without bound.
+        if (self.log_max_bytes or self.log_rotate_seconds) and self.log_backup_count < 1:
+            raise ConfigurationError("log_backup_count must be at least 1 when log rotation is enabled")
+        if self.log_sample_rate <= 0:
+            raise ConfigurationError("log_sample_rate must be positive")
+        if self.memory_report_every < 0:
+            raise ConfigurationError("memory_report_every must not be negative")
+        for name, target in self.operation_plugin_specs.items():
+            if not PLUGIN_SPEC.fullmatch(f"{name}={target}"):
+                raise ConfigurationError(
+                    f"operation_plugins entries must look like name=module:Class, got {name}={target}"
+                )
+        if self.numeric_backend not in NUMERIC_BACKENDS:
+            raise ConfigurationError(
+                f"numeric_backend must be one of: {', '.join(NUMERIC_BACKENDS)}"
+            )
@@ -0,0 +1,137 @@
+########################
+# Logging Setup        #
+########################
+
+from collections import Counter
+from datetime import datetime
+import json
+import logging
+from logging.handlers import RotatingFileHandler
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.calculator_config import CalculatorConfig
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Hot-path events are logged with extra={"sample": SAMPLE_...}; SamplingFilter keeps 1 in
+# log_sample_rate of each of them. Every other record always passes.
+SAMPLE_CALCULATION = "calculation"
+SAMPLE_STRATEGY = "operation_strategy"
+SAMPLE_EVICTION = "history_eviction"
+SAMPLE_SAVE = "history_save"
+
+# Structured events (calculation, error, undo, redo, save) go to their own logger, which never
+# propagates into calculator.log and is switched off entirely unless config.event_log is set.
+EVENT_LOGGER = logging.getLogger("calculator.events")
+EVENT_LOGGER.propagate = False
+EVENT_LOGGER.setLevel(logging.CRITICAL + 1)
+
+
+class SamplingFilter(logging.Filter):
+    # Passes the first of every `rate` records of each sample key and counts the rest. The record
+    # that passes notes how many were suppressed since the previous one, so the log stays honest
+    # about what it left out.
+    def __init__(self, rate: int = 1):
+        super().__init__()
+        self.rate = rate
+        self.seen: Counter = Counter()
+        self.suppressed: Counter = Counter()
+        self._pending: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        if key is None or self.rate <= 1:
+            return True
+        with self._lock:
+            self.seen[key] += 1
+            if (self.seen[key] - 1) % self.rate:
+                self.suppressed[key] += 1
+                self._pending[key] += 1
+                return False
+            skipped = self._pending.pop(key, 0)
+        if skipped:
+            record.msg = f"{record.msg} [{skipped} similar suppressed]"
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {key: {"seen": self.seen[key], "suppressed": self.suppressed[key]} for key in self.seen}
+
+
+class RotatingLogHandler(RotatingFileHandler):
+    # RotatingFileHandler that also rolls over every `interval` seconds (0 disables), so a log is
+    # bounded by size and by age. Backups are numbered calculator.log.1 .. .N either way.
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, interval: float, encoding: Optional[str] = None):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.interval = interval
+        self.rollover_at = time.time() + interval
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if self.interval and time.time() >= self.rollover_at:
+            return 1
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per record. The payload is built from record.event_fields here, so it is
+    # only serialized for records that are actually emitted; values with a to_dict() (such as
+    # Calculation) are expanded with it and anything else JSON cannot encode is written as str().
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "event": record.msg,
+        }
+        for name, value in getattr(record, "event_fields", {}).items():
+            payload[name] = value.to_dict() if hasattr(value, "to_dict") else value
+        return json.dumps(payload, default=str)
+
+
+def log_event(event: str, level: int = logging.INFO, **fields: Any) -> None:
+    # Records a structured event. Costs one level check when the event log is off.
+    if EVENT_LOGGER.isEnabledFor(level):
+        EVENT_LOGGER.log(level, event, extra={"event_fields": fields})
+
+
+def elapsed_ms(started: float) -> float:
+    # Milliseconds since a time.perf_counter() reading, for the events' duration_ms field.
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def _rotating_handler(config: CalculatorConfig, path: Any) -> RotatingLogHandler:
+    return RotatingLogHandler(
+        str(path),
+        max_bytes=config.log_max_bytes,
+        backup_count=config.log_backup_count,
+        interval=config.log_rotate_seconds,
+        encoding=config.default_encoding,
+    )
+
+
+def configure_logging(config: CalculatorConfig) -> SamplingFilter:
+    # Replaces the root handlers with a rotating calculator.log at config.log_level, sets up the
+    # structured event log when enabled, and returns the sampling filter so callers can read its counters.
+    handler = _rotating_handler(config, config.log_file)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    sampler = SamplingFilter(config.log_sample_rate)
+    handler.addFilter(sampler)
+    logging.basicConfig(handlers=[handler], level=config.log_level, force=True)
+
+    for old in EVENT_LOGGER.handlers[:]:
+        EVENT_LOGGER.removeHandler(old)
+        old.close()
+    if config.event_log:
+        events = _rotating_handler(config, config.event_log_file)
+        events.setFormatter(JsonLinesFormatter())
+        EVENT_LOGGER.addHandler(events)
+        EVENT_LOGGER.setLevel(logging.INFO)
+    else:
+        EVENT_LOGGER.setLevel(logging.CRITICAL + 1)
+    return sampler
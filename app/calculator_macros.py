@@ -0,0 +1,127 @@
+########################
+# Macros               #
+########################
+
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from app.calculator_config import CalculatorConfig
+from app.exceptions import OperationError
+from app.history_journal import match_file_mode
+from app.input_validators import InputValidator
+from app.operations import OperationFactory
+
+
+@dataclass
+class MacroStep:
+    # One step of a macro: an operation by factory name ("add", "root", ...) and its second
+    # operand. The first operand is always the previous step's result (or the replayed input).
+    operation: str
+    operand: str
+
+
+@dataclass
+class Macro:
+    name: str
+    steps: List[MacroStep] = field(default_factory=list)
+
+    def compile(self, config: CalculatorConfig) -> Callable[[Any], Any]:
+        # Resolves every operation and validates every step operand once, and returns a function
+        # that runs the whole chain on one input. Nothing else happens per step: no Calculation,
+        # undo snapshot, observer notification or log record.
+        steps = [
+            (OperationFactory.create_operation(step.operation).execute, InputValidator.validate_number(step.operand, config))
+            for step in self.steps
+        ]
+
+        def run(value: Any) -> Any:
+            for execute, operand in steps:
+                value = execute(value, operand)
+            return value
+
+        return run
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "steps": [asdict(step) for step in self.steps]}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Macro":
+        try:
+            return Macro(data["name"], [MacroStep(step["operation"], step["operand"]) for step in data["steps"]])
+        except (KeyError, TypeError) as error:
+            raise OperationError(f"Invalid macro data: {error}") from error
+
+    def __str__(self) -> str:
+        return " -> ".join(f"{step.operation} {step.operand}" for step in self.steps)
+
+
+class MacroRecorder:
+    # A macro being recorded in the REPL. Every recorded operation's result becomes the first
+    # operand of the next one.
+    def __init__(self, name: str):
+        self.macro = Macro(name)
+        self.last_result: Optional[Any] = None
+
+    def record(self, operation: str, operand: str, result: Any) -> None:
+        self.macro.steps.append(MacroStep(operation, operand))
+        self.last_result = result
+
+
+class MacroStore:
+    # Saved macros as one JSON object (name -> macro) in config.macro_file, replaced atomically on
+    # every change.
+    def __init__(self, path: Path, encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.encoding = encoding
+
+    def load(self) -> Dict[str, Macro]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding=self.encoding))
+        except (OSError, ValueError) as error:
+            raise OperationError(f"Failed to read macros: {error}") from error
+        return {name: Macro.from_dict(macro) for name, macro in data.items()}
+
+    def get(self, name: str) -> Macro:
+        macro = self.load().get(name)
+        if macro is None:
+            raise OperationError(f"Unknown macro: {name}")
+        return macro
+
+    def names(self) -> List[str]:
+        return sorted(self.load())
+
+    def save(self, macro: Macro) -> None:
+        macros = self.load()
+        macros[macro.name] = macro
+        self._write(macros)
+
+    def delete(self, name: str) -> bool:
+        macros = self.load()
+        if macros.pop(name, None) is None:
+            return False
+        self._write(macros)
+        return True
+
+    def _write(self, macros: Dict[str, Macro]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding=self.encoding) as handle:
+                json.dump({name: macro.to_dict() for name, macro in macros.items()}, handle, indent=2)
+            match_file_mode(temp_name, self.path)
+            os.replace(temp_name, self.path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+
+
+def read_inputs(path: Union[str, Path], encoding: str = "utf-8") -> List[str]:
+    # Input values from a file, separated by newlines, commas or whitespace.
+    return [value for value in re.split(r"[\s,]+", Path(path).read_text(encoding=encoding)) if value]
@@ -1,31 +1,376 @@
 from dataclasses import dataclass, field
 import datetime
-from typing import Any, Dict, List
+from functools import partial
+import json
+import os
+from pathlib import Path
+import sys
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from app.calculation import Calculation
+from app.exceptions import OperationError
+from app.history_interning import InternPool
+from app.history_journal import match_file_mode
 
 @dataclass
 class CalculatorMemento:
 
     history: List[Calculation]
     timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+    # Where this snapshot was last written to an undo file: (path, offset, length).
+    saved_at: Optional[Tuple[Path, int, int]] = field(default=None, init=False, compare=False, repr=False)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             'history': [calc.to_dict() for calc in self.history],
             'timestamp': self.timestamp.isoformat()
         }
+
+    def memory_bytes(self) -> int:
+        # Bytes owned by this snapshot: the memento and its list of references.
+        # The Calculation objects are shared with the live history and other snapshots, so they are not counted.
+        return sys.getsizeof(self) + sys.getsizeof(self.history)
+
+    def saved_line(self, path: Path) -> Optional[Tuple[int, int]]:
+        # (offset, length) of this snapshot's line in the undo file at path, if it is stored there.
+        if self.saved_at is not None and self.saved_at[0] == path:
+            return self.saved_at[1:]
+        return None
+
+    def bind(self, path: Path, offset: int, length: int) -> None:
+        self.saved_at = (path, offset, length)
     
 
     # class method to convert a Calculation object to a dictionary format suitable for serialization.
     # This method is used when saving the state of the calculator's history to a file or other storage medium.
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'CalculatorMemento':
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        verify: bool = True,
+        pool: Optional[InternPool] = None,
+        backend: str = "decimal",
+    ) -> 'CalculatorMemento':
+        # With verify=False the saved results are trusted and nothing is recomputed (see Calculation.restore).
+        # Numbers are read as the numeric backend that computed them represents them.
+        # With a pool, values and (depending on its mode) whole calculations are shared with the
+        # live history and the other snapshots instead of being duplicated.
+        build = partial(Calculation.from_dict if verify else Calculation.restore, backend=backend)
+        if pool is not None:
+            build = partial(pool.build, build=build)
 
         return cls(
             
             # The history is reconstructed by creating Calculation instances from the list of dictionaries in the 'history' key of the input data.
             # Each dictionary is passed to the from_dict method of the Calculation class to create a Calculation object.
-            history=[Calculation.from_dict(calc) for calc in data['history']],
+            history=[build(calc) for calc in data['history']],
             timestamp=datetime.datetime.fromisoformat(data['timestamp'])    
         )
+
+
+class LazyMemento(CalculatorMemento):
+    # A memento persisted in an undo file; only its byte offset is kept in memory until an undo or
+    # redo actually reaches it, at which point that single line is read and restored without recomputation.
+    def __init__(self, path: Path, offset: int, length: int, pool: Optional[InternPool] = None, backend: str = "decimal"):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.pool = pool
+        self.backend = backend
+        self._memento: Optional[CalculatorMemento] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._memento is not None
+
+    @property
+    def history(self) -> List[Calculation]:
+        return self._load().history
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        return self._load().timestamp
+
+    def raw_line(self) -> bytes:
+        return _read_at(self.path, self.offset, self.length)
+
+    def saved_line(self, path: Path) -> Optional[Tuple[int, int]]:
+        return (self.offset, self.length) if self.path == path else None
+
+    def bind(self, path: Path, offset: int, length: int) -> None:
+        self.path, self.offset, self.length = path, offset, length
+
+    def memory_bytes(self) -> int:
+        if self._memento is None:
+            return sys.getsizeof(self)
+        return sys.getsizeof(self) + self._memento.memory_bytes()
+
+    def _load(self) -> CalculatorMemento:
+        if self._memento is None:
+            try:
+                data = json.loads(self.raw_line())
+            except (OSError, ValueError) as error:
+                raise OperationError(f"Failed to read undo state from {self.path}: {error}")
+            self._memento = CalculatorMemento.from_dict(data, verify=False, pool=self.pool, backend=self.backend)
+        return self._memento
+
+
+def write_memento_stacks(
+    path: Path,
+    undo_stack: List[CalculatorMemento],
+    redo_stack: List[CalculatorMemento],
+    tip: Optional[Dict[str, Any]],
+) -> None:
+    # Saves both stacks as a JSON-lines file, one memento per line, followed by an index line with
+    # the byte offset and length of every entry. The file is append-only: snapshots already in it are
+    # only referenced by the new index, so a save writes just the new snapshots and the index.
+    # Once less than half of the file is still referenced (or it does not end on a complete line),
+    # it is compacted: the live entries are copied byte for byte to a file written next to it and
+    # renamed into place.
+    mementos = [*undo_stack, *redo_stack]
+    size = path.stat().st_size if path.exists() else 0
+    lines = [memento.saved_line(path) for memento in mementos]
+    lines = [line if line and sum(line) <= size else None for line in lines]
+    live = sum(length for _, length in filter(None, lines))
+    if live * 2 >= size and _ends_with_newline(path, size):
+        _append_mementos(path, mementos, lines, len(undo_stack), tip)
+    else:
+        _rewrite_mementos(path, mementos, lines, len(undo_stack), tip)
+
+
+def _append_mementos(path: Path, mementos: List[CalculatorMemento], lines: List, undo: int, tip) -> None:
+    written: List[Tuple[CalculatorMemento, int, int]] = []
+    with open(path, "ab") as handle:
+        for position, memento in enumerate(mementos):
+            if lines[position] is None:
+                line = json.dumps(memento.to_dict()).encode("utf-8") + b"\n"
+                lines[position] = (handle.tell(), len(line))
+                written.append((memento, *lines[position]))
+                handle.write(line)
+        handle.write(_index_line(lines, undo, tip))
+        handle.flush()
+        os.fsync(handle.fileno())
+    for memento, offset, length in written:
+        memento.bind(path, offset, length)
+
+
+def _rewrite_mementos(path: Path, mementos: List[CalculatorMemento], lines: List, undo: int, tip) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    new_lines: List[Tuple[int, int]] = []
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for memento, saved in zip(mementos, lines):
+                if saved is not None:
+                    line = _read_at(path, *saved)
+                elif isinstance(memento, LazyMemento) and not memento.loaded:
+                    line = memento.raw_line()
+                else:
+                    line = json.dumps(memento.to_dict()).encode("utf-8") + b"\n"
+                new_lines.append((handle.tell(), len(line)))
+                handle.write(line)
+            handle.write(_index_line(new_lines, undo, tip))
+            handle.flush()
+            os.fsync(handle.fileno())
+        match_file_mode(temp_path, path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    for memento, (offset, length) in zip(mementos, new_lines):
+        memento.bind(path, offset, length)
+
+
+def _index_line(lines: List[Tuple[int, int]], undo: int, tip: Optional[Dict[str, Any]]) -> bytes:
+    index = {
+        "undo": undo,
+        "redo": len(lines) - undo,
+        "tip": tip,
+        "offsets": [offset for offset, _ in lines],
+        "lengths": [length for _, length in lines],
+    }
+    return json.dumps(index).encode("utf-8") + b"\n"
+
+
+def _read_at(path: Path, offset: int, length: int) -> bytes:
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        return handle.read(length)
+
+
+def _ends_with_newline(path: Path, size: int) -> bool:
+    return size > 0 and _read_at(path, size - 1, 1) == b"\n"
+
+
+def read_memento_stacks(
+    path: Path,
+    tip: Optional[Dict[str, Any]],
+    pool: Optional[InternPool] = None,
+    backend: str = "decimal",
+) -> Optional[Tuple[List[LazyMemento], List[LazyMemento]]]:
+    # Reads only the last index line and returns lazy undo/redo stacks, or None when the file is
+    # missing or was saved for a different history than the one now loaded.
+    if not path.exists():
+        return None
+    with open(path, "rb") as handle:
+        index = _read_index(handle)
+    if index.get("tip") != tip:
+        return None
+    offsets = index["offsets"]
+    # Files written before entries could be appended out of order have no lengths: their entries
+    # are contiguous and end where the next one starts.
+    if "lengths" in index:
+        lengths = index["lengths"]
+    else:
+        lengths = [end - start for start, end in zip(offsets, [*offsets[1:], index["end"]])]
+    mementos = [LazyMemento(path, start, length, pool, backend) for start, length in zip(offsets, lengths)]
+    return mementos[: index["undo"]], mementos[index["undo"]:]
+
+
+def _read_index(handle) -> Dict[str, Any]:
+    # The last complete index line. Anything after it was left by a save that was interrupted while
+    # appending; the index before it still describes entries that are intact.
+    end = handle.seek(0, os.SEEK_END)
+    while True:
+        line, start = _read_last_line(handle, end)
+        if start == 0:
+            return json.loads(line)
+        if b'"offsets"' in line:
+            try:
+                return json.loads(line)
+            except ValueError:
+                pass
+        end = start
+
+
+def _read_last_line(handle, end: int, block_size: int = 4096) -> Tuple[bytes, int]:
+    # The line that ends at byte `end`, with the offset where it starts.
+    position, data = end, b""
+    while position > 0:
+        step = min(block_size, position)
+        position -= step
+        handle.seek(position)
+        data = handle.read(step) + data
+        newline = data.rfind(b"\n", 0, len(data) - 1)
+        if newline != -1:
+            return data[newline + 1:], position + newline + 1
+    return data, 0
+
+
+class MementoStack(list):
+    # Undo/redo stack bounded by depth and by estimated memory.
+    # Past max_depth the oldest snapshot is dropped; past max_bytes the older half of the stack is
+    # compacted by merging consecutive steps (every other snapshot is dropped, so one undo there
+    # spans two operations) until the stack fits again. Every list method that adds, removes or
+    # reorders entries is overridden, so the recorded sizes always line up with the entries.
+    def __init__(
+        self,
+        mementos: Iterable[CalculatorMemento] = (),
+        max_depth: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        super().__init__()
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self.merged_steps = 0
+        self.dropped_steps = 0
+        # Each entry's size is recorded when it is pushed, so entries that load lazily later
+        # do not skew the running total.
+        self._sizes: List[int] = []
+        self._bytes = 0
+        self.extend(mementos)
+
+    def append(self, memento: CalculatorMemento) -> None:
+        super().append(memento)
+        self._sizes.append(memento.memory_bytes())
+        self._bytes += self._sizes[-1]
+        self._enforce_limits()
+
+    def extend(self, mementos: Iterable[CalculatorMemento]) -> None:
+        for memento in mementos:
+            self.append(memento)
+
+    def insert(self, index: int, memento: CalculatorMemento) -> None:
+        super().insert(index, memento)
+        self._sizes.insert(index, memento.memory_bytes())
+        self._bytes += memento.memory_bytes()
+        self._enforce_limits()
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+            super().__setitem__(index, value)
+            self._sizes[index] = [memento.memory_bytes() for memento in value]
+        else:
+            super().__setitem__(index, value)
+            self._sizes[index] = value.memory_bytes()
+        self._bytes = sum(self._sizes)
+        self._enforce_limits()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        del self._sizes[index]
+        self._bytes = sum(self._sizes)
+
+    def __iadd__(self, mementos: Iterable[CalculatorMemento]) -> "MementoStack":
+        self.extend(mementos)
+        return self
+
+    def __imul__(self, count: int) -> "MementoStack":
+        if count <= 0:
+            self.clear()
+        else:
+            self.extend(list(self) * (count - 1))
+        return self
+
+    def pop(self, index: int = -1) -> CalculatorMemento:
+        memento = super().pop(index)
+        self._bytes -= self._sizes.pop(index)
+        return memento
+
+    def remove(self, memento: CalculatorMemento) -> None:
+        del self[self.index(memento)]
+
+    def clear(self) -> None:
+        super().clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._sizes.reverse()
+
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        pairs = sorted(zip(self, self._sizes), key=lambda pair: key(pair[0]) if key else pair[0], reverse=reverse)
+        super().__setitem__(slice(None), [memento for memento, _ in pairs])
+        self._sizes = [size for _, size in pairs]
+
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def _remove(self, index: int) -> None:
+        self.pop(index)
+
+    def _enforce_limits(self) -> None:
+        if self.max_depth is not None:
+            while len(self) > self.max_depth:
+                self._remove(0)
+                self.dropped_steps += 1
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            self._compact()
+
+    def _compact(self) -> None:
+        while self._bytes > self.max_bytes and len(self) > 2:
+            older_half = len(self) // 2
+            for index in reversed(range(1, older_half, 2)):
+                self._remove(index)
+                self.merged_steps += 1
+            if older_half < 2:
+                self._remove(0)
+                self.dropped_steps += 1
+        while self._bytes > self.max_bytes and self:
+            self._remove(0)
+            self.dropped_steps += 1
@@ -1,23 +1,200 @@
+from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
 import sys
+import time
+from typing import Dict, List, Optional, Set, Tuple
 
 if __package__ is None or __package__ == "":  # pragma: no cover
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+if __name__ == "__main__" and len(sys.argv) > 1:  # pragma: no cover
+    # One-shot mode (python -m app.calculator_repl add 2 3) runs before the REPL's imports.
+    from app.calculator_cli import main
+
+    sys.exit(main())
+
+from app.calculation import Calculation
 from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_macros import MacroRecorder, read_inputs
 from app.exceptions import OperationError, ValidationError
 from app.history import AutoSaveObserver, LoggingObserver
-from app.operations import OperationFactory
+from app.history_audit import default_sources
+from app.history_journal import read_rows
+from app.operations import AggregateOperation, OperationFactory
+
+HISTORY_PAGE_SIZE = 20
+HISTORY_FOLLOW_INTERVAL = 0.5
+HISTORY_USAGE = "Usage: history [N] [--page P] [--tail N] [--follow]"
+MACRO_USAGE = "Usage: macro record NAME | macro end | macro list | macro run NAME VALUE_OR_FILE... [--record] | macro delete NAME"
+
+
+@dataclass
+class HistoryOptions:
+    page_size: Optional[int] = None
+    page: int = 1
+    tail: Optional[int] = None
+    follow: bool = False
+
+
+def parse_history_args(args: List[str]) -> HistoryOptions:
+    options = HistoryOptions()
+    arguments = iter(args)
+    for argument in arguments:
+        if argument == "--follow":
+            options.follow = True
+            continue
+        if argument in ("--page", "--tail"):
+            value = next(arguments, None)
+            if value is None:
+                raise ValueError(f"{argument} needs a value")
+        else:
+            value, argument = argument, "N"
+        if not value.isdigit() or int(value) <= 0:
+            raise ValueError(f"{argument} must be a positive integer")
+        if argument == "--page":
+            options.page = int(value)
+        elif argument == "--tail":
+            options.tail = int(value)
+        else:
+            options.page_size = int(value)
+    return options
+
+
+def write_history_lines(entries, start: int) -> None:
+    # Formats only the given entries and writes them with a single buffered write.
+    sys.stdout.write("".join(f"{index}. {entry}\n" for index, entry in enumerate(entries, start)))
+    sys.stdout.flush()
+
+
+def read_operand_lists(operation: AggregateOperation) -> Optional[List[List[str]]]:
+    # Prompts for the operation's operand lists; values are separated by spaces or commas.
+    # Returns None if the user cancels.
+    print("\nEnter operands separated by spaces (or 'cancel' to abort):")
+    vectors = []
+    for index in range(operation.arity):
+        prompt = "Operands: " if operation.arity == 1 else f"Operand list {index + 1}: "
+        text = input(prompt).strip()
+        if text.lower() == "cancel":
+            return None
+        vectors.append(text.replace(",", " ").split())
+    return vectors
+
+
+def show_history(calc, args: List[str]) -> None:
+    options = parse_history_args(args)
+    view = calc.history_view()
+    total = len(view)
+    paged = options.tail is None and (options.page_size is not None or options.page > 1)
+    page_size = options.page_size or HISTORY_PAGE_SIZE
+
+    if options.tail is not None:
+        start, stop = max(total - options.tail, 0), total
+    elif paged:
+        start = (options.page - 1) * page_size
+        stop = min(start + page_size, total)
+    else:
+        start, stop = 0, total
+
+    if not total and not options.follow:
+        print("No calculations performed yet.")
+        return
+    if start < stop:
+        print("\nCalculation History:")
+        write_history_lines(view[start:stop], start + 1)
+        if paged:
+            print(f"Page {options.page} of {-(-total // page_size)} ({total} calculations)")
+    elif total:
+        print(f"No calculations on page {options.page}.")
 
+    if options.follow:
+        follow_history(calc.config, total + 1)
 
-def calculator_repl() -> None:
+
+def follow_history(config: CalculatorConfig, number: int) -> None:
+    # Prints calculations as they reach the saved history files, from this REPL's saves or from any
+    # other calculator sharing them, until interrupted, like `tail -f`. Rows on disk when following
+    # starts are not printed. A file is re-read only when its size or modification time changes,
+    # and a row already seen is not printed again when a checkpoint moves it to another file.
+    print("Following history (Ctrl+C to stop)...")
+    signatures: Dict[Path, Tuple[int, int]] = {}
+    seen: Set[Tuple[str, ...]] = set()
+    started = False
+    try:
+        while True:
+            rows, complete = [], True
+            for path in default_sources(config):
+                try:
+                    stat = path.stat()
+                    if signatures.get(path) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    # Another process may be appending: a torn final row is skipped, not cut off.
+                    rows.extend(read_rows(path, config.default_encoding, repair=False))
+                except OSError:
+                    # Replaced by a checkpoint between listing and reading; read again next time.
+                    complete = False
+                    continue
+                signatures[path] = (stat.st_mtime_ns, stat.st_size)
+            new = [row for row in rows if tuple(row.values()) not in seen]
+            seen.update(tuple(row.values()) for row in new)
+            if started and new:
+                write_history_lines([Calculation.restore(row, config.numeric_backend) for row in new], number)
+                number += len(new)
+            started = started or complete
+            time.sleep(HISTORY_FOLLOW_INTERVAL)
+    except KeyboardInterrupt:
+        print("\nStopped following history.")
+
+
+def run_macro_command(calc, args: List[str], recorder: Optional[MacroRecorder]) -> Optional[MacroRecorder]:
+    # Handles "macro ..." commands; returns the recorder of the macro being recorded, if any.
+    action = args[0].lower() if args else ""
+    if action == "record" and len(args) == 2:
+        print(f"Recording macro {args[1]}. Operations after the first use the previous result as Operand 1; 'macro end' saves it.")
+        return MacroRecorder(args[1])
+    if action == "end" and len(args) == 1:
+        if recorder is None:
+            print("No macro is being recorded.")
+        elif not recorder.macro.steps:
+            print("Macro has no steps; nothing saved.")
+        else:
+            calc.macros.save(recorder.macro)
+            print(f"Macro {recorder.macro.name} saved: {recorder.macro}")
+        return None
+    if action == "list" and len(args) == 1:
+        macros = calc.macros.load()
+        for name, macro in sorted(macros.items()):
+            print(f"  {name}: {macro}")
+        if not macros:
+            print("No saved macros.")
+        return recorder
+    if action == "delete" and len(args) == 2:
+        print(f"Macro {args[1]} deleted." if calc.macros.delete(args[1]) else f"Unknown macro: {args[1]}")
+        return recorder
+    if action == "run" and len(args) >= 3:
+        values: List[str] = []
+        for arg in args[2:]:
+            if arg != "--record":
+                values.extend(read_inputs(arg, calc.macros.encoding) if Path(arg).is_file() else [arg])
+        results = calc.replay_macro(calc.macros.get(args[1]), values, record="--record" in args)
+        sys.stdout.write("".join(f"{value} -> {result}\n" for value, result in zip(values, results)))
+        return recorder
+    print(MACRO_USAGE)
+    return recorder
+
+
+def calculator_repl(calc: Optional[Calculator] = None) -> None:
+    # Runs the interactive loop on `calc`, or on a Calculator built from the environment.
     print("Welcome to the Calculator REPL!")
     print("Type 'exit' to quit.")
     print("Available operations: add, subtract, multiply, divide, power, root")
+    print(f"Aggregate operations: {', '.join(OperationFactory.aggregate_names())}")
+    print(f"Array operations: {', '.join(OperationFactory.array_names())}")
 
     try:
-        calc = Calculator()
+        if calc is None:
+            calc = Calculator()
         calc.add_observer(LoggingObserver())
         calc.add_observer(AutoSaveObserver(calc))
     except KeyboardInterrupt:
@@ -31,40 +208,47 @@ def calculator_repl() -> None:
         return
 
     print("Calculator initialized. You can start entering operations.")
+    recorder: Optional[MacroRecorder] = None
 
     while True:
         try:
-            command = input("Enter command: ").lower().strip()
+            raw_command = input("Enter command: ").strip()
+            command = raw_command.lower()
 
             if command == "help":
                 print("\nAvailable commands:")
                 print("  add, subtract, multiply, divide, power, root - Perform calculations")
-                print("  history - Show calculation history")
+                print(f"  {', '.join(OperationFactory.aggregate_names())} - Aggregate a list of operands")
+                print(f"  {', '.join(OperationFactory.array_names())} - Array operations on numbers or array files")
+                if OperationFactory.plugin_names():
+                    print(f"  {', '.join(OperationFactory.plugin_names())} - Plugin operations")
+                print("  history [N] [--page P] [--tail N] [--follow] - Show calculation history, paged")
                 print("  clear - Clear calculation history")
                 print("  undo - Undo the last calculation")
                 print("  redo - Redo the last undone calculation")
                 print("  save - Save calculation history to file")
                 print("  load - Load calculation history from file")
+                print("  macro record NAME, macro end - Record a chain of operations; each result feeds the next")
+                print("  macro run NAME VALUE_OR_FILE... [--record] - Replay a macro over many inputs")
+                print("  macro list, macro delete NAME - Manage saved macros")
+                print("  memory - Show memory held by history, undo/redo, caches and observers")
                 print("  exit - Exit the calculator")
                 continue
 
             if command == "exit":
                 try:
-                    calc.save_history()
+                    calc.save_history(sync=True)
                     print("History saved successfully.")
                 except Exception as error:
                     print(f"Failed to save history: {error}")
                 print("Goodbye!")
                 break
 
-            if command == "history":
-                history = calc.show_history()
-                if not history:
-                    print("No calculations performed yet.")
-                else:
-                    print("\nCalculation History:")
-                    for index, line in enumerate(history, 1):
-                        print(f"{index}. {line}")
+            if command == "history" or command.startswith("history "):
+                try:
+                    show_history(calc, command.split()[1:])
+                except ValueError as error:
+                    print(f"{error}. {HISTORY_USAGE}")
                 continue
 
             if command == "clear":
@@ -96,23 +280,43 @@ def calculator_repl() -> None:
                     print(f"Failed to load history: {error}")
                 continue
 
-            if command in ["add", "subtract", "multiply", "divide", "power", "root"]:
+            if command == "memory":
+                print("Memory usage:")
+                for line in calc.memory_report().lines():
+                    print(line)
+                continue
+
+            if command == "macro" or command.startswith("macro "):
+                try:
+                    recorder = run_macro_command(calc, raw_command.split()[1:], recorder)
+                except (OperationError, OSError) as error:
+                    print(f"Macro failed: {error}")
+                continue
+
+            if command in ["add", "subtract", "multiply", "divide", "power", "root"] or command in OperationFactory.plugin_names():
                 try:
                     operation = OperationFactory.create_operation(command)
                     calc.set_operation(operation)
 
                     print("\nEnter operands for the operation (or 'cancel' to abort):")
-                    operand1_input = input("Operand 1: ").strip()
-                    if operand1_input.lower() == "cancel":
-                        print("Operation cancelled.")
-                        continue
+                    if recorder is not None and recorder.macro.steps:
+                        # Recording a macro: the chain continues from the previous result.
+                        operand1_input = recorder.last_result
+                        print(f"Operand 1: {operand1_input}")
+                    else:
+                        operand1_input = input("Operand 1: ").strip()
+                        if operand1_input.lower() == "cancel":
+                            print("Operation cancelled.")
+                            continue
 
                     operand2_input = input("Operand 2: ").strip()
                     if operand2_input.lower() == "cancel":
                         print("Operation cancelled.")
                         continue
 
-                    result = calc.perform_operation(Decimal(operand1_input), Decimal(operand2_input))
+                    result = calc.perform_operation(operand1_input, operand2_input)
+                    if recorder is not None:
+                        recorder.record(command, operand2_input, result)
                     if isinstance(result, Decimal):
                         result = result.normalize()
                     print(f"Result: {result}")
@@ -122,6 +326,40 @@ def calculator_repl() -> None:
                     print(f"Unexpected error: {error}")
                 continue
 
+            if command in OperationFactory.aggregate_names():
+                try:
+                    operation = OperationFactory.create_operation(command)
+                    calc.set_operation(operation)
+                    vectors = read_operand_lists(operation)
+                    if vectors is None:
+                        print("Operation cancelled.")
+                        continue
+                    result = calc.perform_aggregate(*vectors)
+                    if isinstance(result, Decimal):
+                        result = result.normalize()
+                    print(f"Result: {result}")
+                except (ValidationError, OperationError) as error:
+                    print(f"Operation failed: {error}")
+                continue
+
+            if command in OperationFactory.array_names():
+                try:
+                    calc.set_operation(OperationFactory.create_operation(command))
+                    print("\nEnter a number or an array file (.npy or CSV) for each operand (or 'cancel' to abort):")
+                    operand1_input = input("Operand 1: ").strip()
+                    if operand1_input.lower() == "cancel":
+                        print("Operation cancelled.")
+                        continue
+                    operand2_input = input("Operand 2: ").strip()
+                    if operand2_input.lower() == "cancel":
+                        print("Operation cancelled.")
+                        continue
+                    result = calc.perform_array(operand1_input, operand2_input)
+                    print(f"Result:\n{result.data}")
+                except (ValidationError, OperationError) as error:
+                    print(f"Operation failed: {error}")
+                continue
+
             print("Unknown command. Type 'help' for a list of available commands.")
 
         except KeyboardInterrupt:
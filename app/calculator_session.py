@@ -0,0 +1,151 @@
+########################
+# Session Management   #
+########################
+
+import itertools
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.history import HistoryObserver
+
+
+class SharedHistoryStore(HistoryObserver):
+    # One history shared by every session handed out by a CalculatorSessionManager.
+    # It wraps a single fully initialized Calculator, so logging is configured and the history file is read only once.
+    def __init__(self, calculator: Calculator):
+        self.calculator = calculator
+        self._lock = threading.RLock()
+        self._ids = {id(calc) for calc in calculator.history}
+
+    def update(self, calculation: Calculation) -> None:
+        if calculation is None:
+            raise AttributeError("Calculation cannot be None")
+        self.restore([calculation])
+
+    def restore(self, calculations: List[Calculation]) -> None:
+        # Appends calculations that are not already in the store (redo can bring back entries it still holds).
+        with self._lock:
+            history = self.calculator.history
+            for calculation in calculations:
+                if id(calculation) in self._ids:
+                    continue
+                history.append(calculation)
+                self._ids.add(id(calculation))
+            while len(history) > self.calculator.config.max_history_size:
+                self._ids.discard(id(history.pop(0)))
+            self.calculator.touch_history()
+
+    def discard(self, calculations: List[Calculation]) -> None:
+        with self._lock:
+            removed = {id(calc) for calc in calculations} & self._ids
+            if removed:
+                self.calculator.history = [calc for calc in self.calculator.history if id(calc) not in removed]
+                self._ids -= removed
+
+    def snapshot(self) -> List[Calculation]:
+        with self._lock:
+            return self.calculator.history.copy()
+
+    def save(self, sync: bool = False) -> None:
+        with self._lock:
+            self.calculator.save_history(sync)
+
+    def load(self) -> None:
+        with self._lock:
+            self.calculator.load_history()
+            self._ids = {id(calc) for calc in self.calculator.history}
+
+    def __len__(self) -> int:
+        return len(self.calculator.history)
+
+
+class CalculatorSession(Calculator):
+    # Lightweight per-session calculator: its own undo/redo stacks and history view, with
+    # every new calculation also recorded in the shared store. Construction does no I/O.
+    def __init__(self, session_id: str, store: SharedHistoryStore):
+        self.session_id = session_id
+        self.store = store
+        self.config = store.calculator.config
+        self._init_state()
+        self.result_cache = store.calculator.result_cache
+        self.intern_pool = store.calculator.intern_pool
+        self.macros = store.calculator.macros
+        self.observers.append(store)
+
+    def save_history(self, sync: bool = False) -> None:
+        self.store.save(sync)
+
+    def load_history(self) -> None:
+        # Loads the session view from the shared store rather than from disk.
+        self.history = self.store.snapshot()[-self.config.max_history_size:]
+
+    def clear_history(self) -> None:
+        self.store.discard(self.history)
+        super().clear_history()
+
+    def undo(self) -> bool:
+        before = self.history
+        if not super().undo():
+            return False
+        self._sync_store(before, self.history)
+        return True
+
+    def redo(self) -> bool:
+        before = self.history
+        if not super().redo():
+            return False
+        self._sync_store(before, self.history)
+        return True
+
+    def _sync_store(self, before: List[Calculation], after: List[Calculation]) -> None:
+        before_ids = {id(calc) for calc in before}
+        after_ids = {id(calc) for calc in after}
+        self.store.discard([calc for calc in before if id(calc) not in after_ids])
+        self.store.restore([calc for calc in after if id(calc) not in before_ids])
+
+
+class CalculatorSessionManager:
+    # Hands out CalculatorSession objects that share one history store and one logging setup.
+    def __init__(self, config: Optional[CalculatorConfig] = None):
+        self.store = SharedHistoryStore(Calculator(config))
+        self.config = self.store.calculator.config
+        self._sessions: Dict[str, CalculatorSession] = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_session(self, session_id: Optional[str] = None) -> CalculatorSession:
+        with self._lock:
+            session_id = session_id or f"session-{next(self._counter)}"
+            if session_id in self._sessions:
+                raise ValueError(f"Session already exists: {session_id}")
+            session = CalculatorSession(session_id, self.store)
+            self._sessions[session_id] = session
+        logging.info(f"Session created: {session_id}")
+        return session
+
+    def get_session(self, session_id: str) -> CalculatorSession:
+        session = self._sessions.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown session: {session_id}")
+        return session
+
+    def close_session(self, session_id: str) -> None:
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                logging.info(f"Session closed: {session_id}")
+
+    def session_ids(self) -> List[str]:
+        return list(self._sessions)
+
+    def save_history(self, sync: bool = False) -> None:
+        self.store.save(sync)
+
+    def load_history(self) -> None:
+        self.store.load()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
@@ -22,6 +22,21 @@ class ValidationError(CalculatorError):
     pass
 
 
+class BulkValidationError(ValidationError):
+    """
+    Raised when one or more values in a bulk validation fail.
+
+    Every failure is collected before raising; ``failures`` holds
+    ``(index, value, message)`` tuples so callers can report all bad rows at once.
+    """
+
+    def __init__(self, failures):
+        self.failures = list(failures)
+        shown = "; ".join(f"row {index}: {message}" for index, _, message in self.failures[:10])
+        more = f"; and {len(self.failures) - 10} more" if len(self.failures) > 10 else ""
+        super().__init__(f"{len(self.failures)} invalid value(s): {shown}{more}")
+
+
 class OperationError(CalculatorError):
     """
     Raised when a calculation operation fails.
@@ -3,9 +3,11 @@
 ########################
 
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 import logging
-from typing import Any
+from typing import Any, Iterator, Optional, Union
 from app.calculation import Calculation
+from app.calculator_logging import SAMPLE_CALCULATION, SAMPLE_SAVE
 
 
 class HistoryObserver(ABC):
@@ -21,10 +23,14 @@ class LoggingObserver(HistoryObserver):
     def update(self, calculation: Calculation) -> None:
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
+        # Lazy %-formatting: records dropped by level or sampling never build the message.
         logging.info(
-            f"Calculation performed: {calculation.operation} "
-            f"({calculation.operand1}, {calculation.operand2}) = "
-            f"{calculation.result}"
+            "Calculation performed: %s (%s, %s) = %s",
+            calculation.operation,
+            calculation.operand1,
+            calculation.operand2,
+            calculation.result,
+            extra={"sample": SAMPLE_CALCULATION},
         )
 
 
@@ -41,4 +47,48 @@ class AutoSaveObserver(HistoryObserver):
             raise AttributeError("Calculation cannot be None")
         if self.calculator.config.auto_save:
             self.calculator.save_history()
-            logging.info("History auto-saved")
\ No newline at end of file
+            logging.info("History auto-saved", extra={"sample": SAMPLE_SAVE})
+
+
+class HistoryView(Sequence):
+    # Read-only, zero-copy view over a calculator's live history, for callers that only read.
+    # The full view always reflects the current history. Slices are pinned to the history version
+    # they were taken from and raise once the history changes, and so do iterators that were in
+    # progress, instead of silently mixing old and new state.
+    def __init__(self, calculator: Any, indices: Optional[range] = None):
+        self._calculator = calculator
+        self._indices = indices
+        self.version = calculator.history_version
+
+    @property
+    def stale(self) -> bool:
+        return self._indices is not None and self.version != self._calculator.history_version
+
+    def __len__(self) -> int:
+        self._check()
+        if self._indices is None:
+            return len(self._calculator.history)
+        return len(self._indices)
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Calculation, "HistoryView"]:
+        self._check()
+        indices = self._indices if self._indices is not None else range(len(self._calculator.history))
+        if isinstance(item, slice):
+            return HistoryView(self._calculator, indices[item])
+        return self._calculator.history[indices[item]]
+
+    def __iter__(self) -> Iterator[Calculation]:
+        self._check()
+        version = self._calculator.history_version
+        history = self._calculator.history
+        for index in self._indices if self._indices is not None else range(len(history)):
+            if self._calculator.history_version != version:
+                raise RuntimeError("History changed during iteration")
+            yield history[index]
+
+    def __repr__(self) -> str:
+        return f"HistoryView(len={len(self)}, version={self.version})"
+
+    def _check(self) -> None:
+        if self.stale:
+            raise RuntimeError("History view is stale: the history changed after the view was taken")
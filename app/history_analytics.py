@@ -0,0 +1,91 @@
+########################
+# History Analytics    #
+########################
+
+from decimal import Decimal
+import math
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from app.calculation import Calculation
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+NUMERIC_COLUMNS = ("operand1", "operand2", "result")
+SCALARS = (Decimal, int, float)
+
+
+class AnalyticsFrame:
+    # Typed DataFrame of a calculator's history, kept up to date incrementally.
+    # Numeric columns are float64 (or object columns of Decimal with decimal=True), timestamps are
+    # datetime64 and the operation column is categorical. refresh() converts only calculations
+    # appended since the previous call and drops rows evicted from the front; anything else
+    # (undo, redo, clear, load) rebuilds the frame from scratch.
+    def __init__(self, decimal: bool = False):
+        self.decimal = decimal
+        self._frame: Optional["pd.DataFrame"] = None
+        self._last: Optional[Calculation] = None
+
+    def refresh(self, history: Sequence[Calculation]) -> "pd.DataFrame":
+        start = self._cached_prefix(history)
+        if start is None:
+            self._frame = self._build(history)
+        elif start != len(self._frame) or start != len(history):
+            frame = self._frame.iloc[len(self._frame) - start:]
+            new_rows = history[start:]
+            if new_rows:
+                frame = self._append(frame, self._build(new_rows))
+            self._frame = frame.reset_index(drop=True)
+        self._last = history[-1] if history else None
+        return self._frame
+
+    def memory_bytes(self) -> int:
+        # Bytes of the frame's arrays. Decimal cells of object columns are the history's own
+        # objects, so only their references are counted.
+        if self._frame is None:
+            return 0
+        return int(self._frame.memory_usage(index=True, deep=False).sum())
+
+    def _cached_prefix(self, history: Sequence[Calculation]) -> Optional[int]:
+        # Number of leading history entries already in the frame, or None when it must be rebuilt.
+        if self._frame is None:
+            return None
+        if self._last is None:
+            return 0 if self._frame.empty else None
+        for index in range(len(history) - 1, -1, -1):
+            if history[index] is self._last:
+                return index + 1 if index + 1 <= len(self._frame) else None
+        return None
+
+    def _append(self, frame: "pd.DataFrame", new_rows: "pd.DataFrame") -> "pd.DataFrame":
+        import pandas as pd
+
+        categories = frame["operation"].cat.categories.union(new_rows["operation"].cat.categories)
+        frame = frame.assign(operation=frame["operation"].cat.set_categories(categories))
+        new_rows = new_rows.assign(operation=new_rows["operation"].cat.set_categories(categories))
+        return pd.concat([frame, new_rows], ignore_index=True)
+
+    def _build(self, calculations: Sequence[Calculation]) -> "pd.DataFrame":
+        import pandas as pd
+
+        columns = {
+            "operation": pd.Categorical([calc.operation for calc in calculations]),
+        }
+        for name in NUMERIC_COLUMNS:
+            values = [getattr(calc, name) for calc in calculations]
+            # Operand lists and arrays have no scalar value: NaN (None with decimal=True).
+            if self.decimal:
+                columns[name] = pd.Series(
+                    [
+                        value if isinstance(value, Decimal) else Decimal(str(value)) if isinstance(value, SCALARS) else None
+                        for value in values
+                    ],
+                    dtype=object,
+                )
+            else:
+                columns[name] = pd.Series(
+                    [float(value) if isinstance(value, SCALARS) else math.nan for value in values],
+                    dtype="float64",
+                )
+        columns["timestamp"] = pd.Series([calc.timestamp for calc in calculations], dtype="datetime64[ns]")
+        return pd.DataFrame(columns)
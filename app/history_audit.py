@@ -0,0 +1,193 @@
+########################
+# History Audit        #
+########################
+
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from decimal import InvalidOperation
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.array_operands import ARRAY_PREFIX
+from app.calculation import Calculation, parse_operand
+from app.calculator_config import CalculatorConfig
+from app.exceptions import CalculatorError
+from app.history_io import DEFAULT_CHUNK_SIZE, FORMATS, iter_chunks, iter_records, missing_fields
+from app.operations import OperationFactory
+
+Row = Tuple[int, Dict[str, str]]
+
+
+@dataclass
+class Mismatch:
+    # A row whose saved result differs from the recomputed one, or that cannot be recomputed at all
+    # (then `error` says why and `computed` is empty). Rows are numbered from 1 within their file.
+    source: str
+    row: int
+    operation: str
+    operand1: str
+    operand2: str
+    saved: str
+    computed: str = ""
+    error: str = ""
+
+    def __str__(self) -> str:
+        where = f"{self.source} row {self.row}: {self.operation}({self.operand1}, {self.operand2})"
+        if self.error:
+            return f"{where}: {self.error}"
+        return f"{where} saved {self.saved}, computed {self.computed}"
+
+
+@dataclass
+class AuditReport:
+    rows: int = 0
+    skipped: int = 0
+    sources: List[str] = field(default_factory=list)
+    mismatches: List[Mismatch] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    def summary(self) -> str:
+        return (
+            f"Audited {self.rows} row(s) in {len(self.sources)} file(s): "
+            f"{len(self.mismatches)} mismatch(es), {self.skipped} skipped"
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rows": self.rows,
+            "skipped": self.skipped,
+            "sources": self.sources,
+            "mismatches": [asdict(mismatch) for mismatch in self.mismatches],
+        }
+
+
+def audit_chunk(source: str, rows: List[Row], backend: str = "decimal") -> Tuple[int, int, List[Mismatch]]:
+    # Recomputes a chunk of rows the way Calculation.from_dict does, reading numbers as `backend`
+    # (the numeric backend that computed them) represents them. Runs in the worker processes.
+    # Rows with array results are skipped: they are saved as digests and cannot be recomputed.
+    checked = skipped = 0
+    mismatches = []
+    for number, row in rows:
+        missing = missing_fields(row)
+        if not missing and row["result"].startswith(ARRAY_PREFIX):
+            skipped += 1
+            continue
+        checked += 1
+        fields = dict(source=source, row=number, **{name: row[name] or "" for name in ("operation", "operand1", "operand2")})
+        if missing:
+            # Cut short, typically by a crash while the row was being appended.
+            mismatches.append(Mismatch(saved=row["result"] or "", error=f"Incomplete row: no {', '.join(missing)}", **fields))
+            continue
+        try:
+            saved = parse_operand(row["result"], backend)
+            calc = Calculation(row["operation"], parse_operand(row["operand1"], backend), parse_operand(row["operand2"], backend))
+        except (CalculatorError, InvalidOperation, ValueError) as error:
+            mismatches.append(Mismatch(saved=row["result"], error=str(error), **fields))
+            continue
+        if calc.result != saved:
+            mismatches.append(Mismatch(saved=row["result"], computed=str(calc.result), **fields))
+    return checked, skipped, mismatches
+
+
+def default_sources(config: CalculatorConfig) -> List[Path]:
+    # The files holding the saved history: every partition, or the snapshot plus its journal.
+    if config.history_partition != "none":
+        from app.history_partitions import PartitionedHistory
+
+        return [path for _, path in PartitionedHistory(config).partitions()]
+    return [path for path in (config.history_file, config.history_journal_file) if path.exists()]
+
+
+def audit_history(
+    sources: Iterable[Path],
+    fmt: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+    plugins: Optional[Dict[str, str]] = None,
+    backend: str = "decimal",
+) -> AuditReport:
+    # Streams every source in chunks to a pool of `workers` processes (default: one per CPU; 1 runs
+    # in this process). At most two chunks per worker are in flight, so memory stays bounded
+    # whatever the file size. Any format history_io can read is supported.
+    workers = workers or os.cpu_count() or 1
+    report = AuditReport()
+    for source in sources:
+        report.sources.append(str(source))
+        chunks = (
+            (str(source), chunk)
+            for chunk in iter_chunks(enumerate(iter_records(Path(source), fmt, encoding), start=1), chunk_size)
+        )
+        for checked, skipped, mismatches in _run(chunks, workers, plugins, backend):
+            report.rows += checked + skipped
+            report.skipped += skipped
+            report.mismatches.extend(mismatches)
+    return report
+
+
+def _run(
+    chunks: Iterator[Tuple[str, List[Row]]], workers: int, plugins: Optional[Dict[str, str]], backend: str
+) -> Iterator[Tuple[int, int, List[Mismatch]]]:
+    if workers == 1:
+        for source, rows in chunks:
+            yield audit_chunk(source, rows, backend)
+        return
+    # Workers register the same plugins, so rows of plugin operations can be recomputed there.
+    with ProcessPoolExecutor(workers, initializer=OperationFactory.discover_plugins, initargs=(plugins,)) as pool:
+        pending: deque = deque()
+        for source, rows in chunks:
+            pending.append(pool.submit(audit_chunk, source, rows, backend))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Exit status: 0 when every row verifies, 1 when there are mismatches, 2 when the audit failed.
+    parser = argparse.ArgumentParser(description="Recompute every saved history row and report the ones that do not match.")
+    parser.add_argument("sources", nargs="*", type=Path, help="History files (default: the configured history)")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        config = CalculatorConfig()
+        sources = args.sources or default_sources(config)
+        report = audit_history(
+            sources,
+            args.format,
+            args.workers,
+            args.chunk_size,
+            config.default_encoding,
+            config.operation_plugin_specs,
+            config.numeric_backend,
+        )
+    except Exception as error:  # any failure, expected or not, is reported with exit status 2
+        print(f"History audit failed: {error}")
+        return 2
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        for mismatch in report.mismatches:
+            print(mismatch)
+        print(report.summary())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,91 @@
+########################
+# History Interning    #
+########################
+
+from decimal import Decimal
+import sys
+import threading
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+import weakref
+
+from app.calculation import Calculation
+
+# Fields that identify a saved calculation row; rows equal in all of them are the same calculation.
+ROW_FIELDS = ("operation", "operand1", "operand2", "result", "timestamp")
+
+# The value table is cleared when it grows past this many entries, so a history with few repeats
+# cannot make it grow without bound.
+MAX_INTERNED_VALUES = 65536
+
+_SCALARS = (Decimal, int, float)
+
+
+class InternPool:
+    # Flyweight pool for history data. In mode "values", equal operands and results share one
+    # Decimal (or int/float) object and operation names are interned strings. Mode "calculations"
+    # also shares whole Calculation objects between rows that are identical, timestamp included:
+    # the same calculation read back in several undo snapshots (or in the history and a snapshot)
+    # is built once. Those are held weakly and disappear once nothing references them.
+    # Mode "off" returns everything unchanged. Shared objects are never mutated.
+    def __init__(self, mode: str = "values", max_values: int = MAX_INTERNED_VALUES):
+        self.mode = mode
+        self.max_values = max_values
+        self.hits = 0
+        self.misses = 0
+        self._values: Dict[Tuple[type, str], Any] = {}
+        self._calculations: "weakref.WeakValueDictionary[Tuple[str, ...], Calculation]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def value(self, value: Any) -> Any:
+        if self.mode == "off" or not isinstance(value, _SCALARS):
+            return value
+        # str() tells apart values that compare equal but print differently, such as 1 and 1.0.
+        key = (type(value), str(value))
+        shared = self._values.get(key)
+        if shared is not None:
+            self.hits += 1
+            return shared
+        self.misses += 1
+        if len(self._values) >= self.max_values:
+            self._values.clear()
+        return self._values.setdefault(key, value)
+
+    def calculation(self, calc: Calculation) -> Calculation:
+        # Swaps the calculation's fields for their shared copies.
+        if self.mode != "off":
+            calc.operation = sys.intern(calc.operation)
+            calc.operand1 = self.value(calc.operand1)
+            calc.operand2 = self.value(calc.operand2)
+            calc.result = self.value(calc.result)
+        return calc
+
+    def build(self, row: Dict[str, Any], build: Callable[[Dict[str, Any]], Calculation]) -> Calculation:
+        # Calculation for a saved row, built with `build` (Calculation.from_dict or .restore) unless
+        # an identical row was already built and is still alive.
+        if self.mode != "calculations":
+            return self.calculation(build(row))
+        key = tuple(str(row.get(name)) for name in ROW_FIELDS)
+        with self._lock:
+            calc = self._calculations.get(key)
+        if calc is not None:
+            self.hits += 1
+            return calc
+        calc = self.calculation(build(row))
+        with self._lock:
+            return self._calculations.setdefault(key, calc)
+
+    def memory_bytes(self, seen: Optional[Set[int]] = None) -> int:
+        # Estimated bytes of the value table. Objects whose ids are in `seen` (counted already, such
+        # as values shared with the history) are skipped, and every object counted is added to it.
+        # Imported here: memory_report depends on this module through calculator_memento.
+        from app.memory_report import estimate_size
+
+        return estimate_size([self._values], set() if seen is None else seen)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "values": len(self._values),
+            "calculations": len(self._calculations),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,179 @@
+########################
+# History Import/Export #
+########################
+
+import argparse
+from collections import deque
+import csv
+from functools import partial
+from itertools import islice
+import json
+from pathlib import Path
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.calculation import Calculation
+from app.exceptions import OperationError
+
+HISTORY_COLUMNS = ["operation", "operand1", "operand2", "result", "timestamp"]
+FORMATS = ("csv", "ndjson")
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def detect_format(path: Path, fmt: Optional[str] = None) -> str:
+    if fmt is None:
+        fmt = "ndjson" if Path(path).suffix.lower() in (".ndjson", ".jsonl") else "csv"
+    if fmt not in FORMATS:
+        raise OperationError(f"Unsupported history format: {fmt}")
+    return fmt
+
+
+def iter_chunks(items: Iterable[Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_records(path: Path, fmt: Optional[str] = None, encoding: str = "utf-8") -> Iterator[Dict[str, str]]:
+    # Yields history rows one at a time; nothing beyond the current line is held in memory.
+    fmt = detect_format(path, fmt)
+    with open(path, encoding=encoding, newline="") as handle:
+        if fmt == "csv":
+            for row in csv.DictReader(handle):
+                yield {column: row[column] for column in HISTORY_COLUMNS}
+        else:
+            for line in handle:
+                if line.strip():
+                    row = json.loads(line)
+                    yield {column: row[column] for column in HISTORY_COLUMNS}
+
+
+def missing_fields(row: Dict[str, Any]) -> List[str]:
+    # Columns a record has no value for. A CSV row cut short by a crash mid-append reads back
+    # with None in every column after the cut.
+    return [column for column in HISTORY_COLUMNS if row.get(column) is None]
+
+
+def write_records(
+    path: Path,
+    records: Iterable[Dict[str, Any]],
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> int:
+    # Writes rows chunk by chunk, so memory is bounded by chunk_size whatever the size of the input.
+    fmt = detect_format(path, fmt)
+    count = 0
+    with open(path, "w", encoding=encoding, newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=HISTORY_COLUMNS, lineterminator="\n")
+        if fmt == "csv":
+            writer.writeheader()
+        for chunk in iter_chunks(records, chunk_size):
+            if fmt == "csv":
+                writer.writerows(chunk)
+            else:
+                handle.writelines(json.dumps(row) + "\n" for row in chunk)
+            count += len(chunk)
+    return count
+
+
+def export_history(
+    calculator: Any,
+    path: Path,
+    fmt: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    records = (calc.to_dict() for calc in calculator.history)
+    return write_records(path, records, fmt, chunk_size, calculator.config.default_encoding)
+
+
+def import_history(
+    calculator: Any,
+    path: Path,
+    fmt: Optional[str] = None,
+    verify: bool = True,
+) -> int:
+    # Streams an archive into the calculator's history. Only the newest max_history_size rows are
+    # kept, and only those are turned into Calculation objects, so any archive size fits in memory.
+    # With verify=False saved results are trusted instead of recomputed.
+    kept: deque = deque(
+        (calc.to_dict() for calc in calculator.history),
+        maxlen=calculator.config.max_history_size,
+    )
+    count = 0
+    for row in iter_records(path, fmt, calculator.config.default_encoding):
+        count += 1
+        missing = missing_fields(row)
+        if missing:
+            raise OperationError(f"Incomplete record {count} in {path}: no {', '.join(missing)}")
+        kept.append(row)
+
+    build = partial(Calculation.from_dict if verify else Calculation.restore, backend=calculator.config.numeric_backend)
+    calculator.history = [calculator.intern_pool.build(row, build) for row in kept]
+    return count
+
+
+def convert_history(
+    source: Path,
+    destination: Path,
+    source_format: Optional[str] = None,
+    destination_format: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> int:
+    records = iter_records(source, source_format, encoding)
+    return write_records(destination, records, destination_format, chunk_size, encoding)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream calculator history in and out of CSV and NDJSON files.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Write the saved history to a file")
+    export_parser.add_argument("destination", type=Path)
+    export_parser.add_argument("--format", choices=FORMATS)
+
+    import_parser = commands.add_parser("import", help="Load a file into the saved history")
+    import_parser.add_argument("source", type=Path)
+    import_parser.add_argument("--format", choices=FORMATS)
+    import_parser.add_argument("--no-verify", action="store_true", help="Trust saved results instead of recomputing")
+
+    convert_parser = commands.add_parser("convert", help="Convert a history file between formats")
+    convert_parser.add_argument("source", type=Path)
+    convert_parser.add_argument("destination", type=Path)
+    convert_parser.add_argument("--from-format", choices=FORMATS)
+    convert_parser.add_argument("--to-format", choices=FORMATS)
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "convert":
+            count = convert_history(args.source, args.destination, args.from_format, args.to_format, args.chunk_size)
+            print(f"Converted {count} records to {args.destination}")
+            return 0
+
+        from app.calculator import Calculator
+
+        calc = Calculator()
+        if args.command == "export":
+            count = export_history(calc, args.destination, args.format, args.chunk_size)
+            print(f"Exported {count} records to {args.destination}")
+        else:
+            count = import_history(calc, args.source, args.format, verify=not args.no_verify)
+            calc.save_history()
+            print(f"Imported {count} records from {args.source} (kept {len(calc.history)})")
+        return 0
+    except (OSError, ValueError, KeyError, OperationError) as error:
+        print(f"History {args.command} failed: {error}")
+        return 1
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
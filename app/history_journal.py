@@ -0,0 +1,246 @@
+########################
+# History Persistence  #
+########################
+
+import contextlib
+import csv
+import io
+import logging
+import os
+import stat
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Set, Union
+
+from app.calculation import Calculation
+from app.calculator_config import CalculatorConfig
+from app.history_io import HISTORY_COLUMNS
+
+# The process umask, read once at import: os.umask can only be read by setting it, which is not
+# safe while other threads create files.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def read_rows(path: Path, encoding: str = "utf-8", repair: bool = True) -> List[Dict[str, str]]:
+    # Reads an append-only CSV of history rows. A torn final row left by a crash mid-append is
+    # cut off the file; everything before it is intact. With repair=False (readers that do not own
+    # the file, where the final row may still be being written) it is only skipped.
+    if not path.exists():
+        return []
+    with open(path, encoding=encoding, newline="") as handle:
+        text = handle.read()
+    if text and not text.endswith("\n"):
+        text = text[: text.rfind("\n") + 1]
+        if repair:
+            logging.warning(f"Ignoring incomplete history row in {path}")
+            os.truncate(path, len(text.encode(encoding)))
+    return [
+        {column: row[column] for column in HISTORY_COLUMNS}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def write_rows_atomically(path: Path, calculations: Sequence[Calculation], encoding: str = "utf-8") -> None:
+    # Write to a temporary file in the same directory and rename it over the target, so a
+    # half-written file never replaces a good one.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as handle:
+            # Rows are streamed from the calculations; no intermediate list or DataFrame is built.
+            writer = csv.DictWriter(handle, fieldnames=HISTORY_COLUMNS, lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(calc.to_dict() for calc in calculations)
+            handle.flush()
+            os.fsync(handle.fileno())
+        match_file_mode(temp_path, path)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+    # Make the rename itself durable.
+    fsync_path(path.parent)
+
+
+def match_file_mode(temp_path: Union[str, Path], path: Path) -> None:
+    # mkstemp creates files readable by their owner only. A temporary file about to be renamed over
+    # `path` gets the permissions of the file it replaces, or those open() would give a new file,
+    # so saving never locks other users or processes out of a shared history.
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(temp_path, mode)
+
+
+def fsync_path(path: Path) -> None:
+    # fsync works on any descriptor of the file, so a file written and closed earlier (or a
+    # directory, whose entries changed) can be flushed by path. Not supported on Windows directories.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except (FileNotFoundError, PermissionError, IsADirectoryError):
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def quarantine(path: Path) -> Path:
+    # Moves an unreadable history file or directory aside instead of letting the next save overwrite it.
+    target = path.with_name(f"{path.name}.corrupt-{datetime.now().strftime('%Y%m%d%H%M%S%f')}")
+    os.replace(path, target)
+    return target
+
+
+class DurabilityPolicy:
+    # Decides when appended history reaches the disk. Appends are written and closed at once, so a
+    # crash of the process loses nothing; fsync protects against an OS crash or power loss:
+    #   always   - fsync after every save; no completed save is lost.
+    #   batch    - fsync every fsync_every saves; at most fsync_every - 1 saves are lost.
+    #   interval - fsync on the first save at least fsync_interval_ms after the previous fsync;
+    #              saves since that fsync (at most that window, plus any idle tail) are lost.
+    # Snapshots are always written atomically and fsynced, whatever the policy.
+    def __init__(self, config: CalculatorConfig):
+        self.mode = config.durability
+        self.every = config.fsync_every
+        self.interval = config.fsync_interval_ms / 1000
+        self.syncs = 0
+        self._dirty: Set[Path] = set()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @property
+    def unsynced_saves(self) -> int:
+        return self._unsynced
+
+    def written(self, paths: Iterable[Path]) -> bool:
+        # Records a save that appended to paths; returns True if it was fsynced.
+        for path in paths:
+            # The directory too, in case the save created the file.
+            self._dirty.update((path, path.parent))
+        self._unsynced += 1
+        if self._due():
+            self.sync()
+            return True
+        return False
+
+    def sync(self) -> None:
+        for path in sorted(self._dirty):
+            fsync_path(path)
+        self._dirty.clear()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def _due(self) -> bool:
+        if self.mode == "batch":
+            return self._unsynced >= self.every
+        if self.mode == "interval":
+            return time.monotonic() - self._last_sync >= self.interval
+        return True
+
+
+def append_rows(path: Path, calculations: Sequence[Calculation], encoding: str = "utf-8") -> None:
+    write_header = not path.exists() or path.stat().st_size == 0
+    with open(path, "a", encoding=encoding, newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=HISTORY_COLUMNS, lineterminator="\n")
+        if write_header:
+            writer.writeheader()
+        writer.writerows(calc.to_dict() for calc in calculations)
+
+
+class HistoryJournal:
+    # Stores history as a compact snapshot (history_file) plus an append-only journal of the
+    # calculations made since that snapshot. Saves append to the journal; every checkpoint_every
+    # operations or checkpoint_seconds seconds the bounded history is written as a new snapshot
+    # and the journal is truncated, so load time stays proportional to max_history_size.
+    def __init__(self, config: CalculatorConfig):
+        self.config = config
+        self._journaled = 0
+        self._last_checkpoint = time.monotonic()
+        self.durability = DurabilityPolicy(config)
+
+    @property
+    def location(self) -> Path:
+        return self.config.history_file
+
+    @property
+    def journal_location(self) -> Path:
+        return self.config.history_journal_file
+
+    @property
+    def checkpoint_location(self) -> Path:
+        return self.config.history_file.with_name(self.config.history_file.name + ".checkpoint")
+
+    def exists(self) -> bool:
+        return any(
+            path.exists()
+            for path in (self.config.history_file, self.config.history_journal_file, self.checkpoint_location)
+        )
+
+    def checkpoint_due(self, pending: int) -> bool:
+        return (
+            self._journaled + pending >= self.config.checkpoint_every
+            or time.monotonic() - self._last_checkpoint >= self.config.checkpoint_seconds
+        )
+
+    def checkpoint(self, calculations: Sequence[Calculation]) -> None:
+        # The new snapshot replaces the old snapshot and the journal together. It is first written
+        # in full to checkpoint_location, then the journal is removed, then the snapshot is renamed
+        # into place. A crash at any point leaves either the old snapshot and journal (no
+        # checkpoint file yet) or a complete checkpoint file that read() finishes installing, so a
+        # journal is never applied on top of a snapshot that already contains it.
+        write_rows_atomically(self.checkpoint_location, calculations, self.config.default_encoding)
+        match_file_mode(self.checkpoint_location, self.config.history_file)
+        self._install_checkpoint()
+        self._journaled = 0
+        self._last_checkpoint = time.monotonic()
+
+    def _install_checkpoint(self) -> None:
+        self.config.history_journal_file.unlink(missing_ok=True)
+        fsync_path(self.config.history_dir)
+        os.replace(self.checkpoint_location, self.config.history_file)
+        fsync_path(self.config.history_dir)
+
+    def append(self, calculations: Sequence[Calculation]) -> None:
+        append_rows(self.config.history_journal_file, calculations, self.config.default_encoding)
+        self.durability.written([self.config.history_journal_file])
+        self._journaled += len(calculations)
+
+    def sync(self) -> None:
+        self.durability.sync()
+
+    def quarantine(self) -> List[Path]:
+        return [
+            quarantine(path)
+            for path in (self.config.history_file, self.config.history_journal_file)
+            if path.exists()
+        ]
+
+    def read(self) -> List[Dict[str, str]]:
+        # Returns the newest max_history_size rows: the snapshot followed by the journal written after it.
+        if self.checkpoint_location.exists():
+            logging.warning(f"Completing interrupted checkpoint: {self.checkpoint_location}")
+            self._install_checkpoint()
+        rows: List[Dict[str, str]] = []
+        if self.config.history_file.exists():
+            import pandas as pd
+
+            rows = pd.read_csv(
+                self.config.history_file, dtype=str, keep_default_na=False
+            ).to_dict("records")
+
+        journal = self._read_journal()
+        rows.extend(journal)
+        self._journaled = len(journal)
+        return rows[-self.config.max_history_size:]
+
+    def _read_journal(self) -> List[Dict[str, str]]:
+        return read_rows(self.config.history_journal_file, self.config.default_encoding)
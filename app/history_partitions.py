@@ -0,0 +1,154 @@
+########################
+# Partitioned History  #
+########################
+
+from datetime import datetime, timedelta
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.calculation import Calculation
+from app.calculator_config import CalculatorConfig
+from app.history_journal import (
+    DurabilityPolicy,
+    append_rows,
+    quarantine,
+    read_rows,
+    write_rows_atomically,
+)
+
+PARTITION_FORMATS = {"day": "%Y-%m-%d", "hour": "%Y-%m-%d-%H"}
+
+
+class PartitionedHistory:
+    # Stores history as one append-only CSV per day or hour under history_partition_dir, named
+    # <history file stem>-<period>.csv. Saves append to the partitions their calculations fall in;
+    # loading reads partitions newest first and stops once max_history_size rows are found, and
+    # retention deletes whole partitions older than history_retention_days. Undo, redo and clear
+    # only rewrite the partitions from the oldest calculation in the history onward.
+    # Drop-in replacement for HistoryJournal, selected with history_partition = "day" or "hour".
+    def __init__(self, config: CalculatorConfig):
+        self.config = config
+        self._format = PARTITION_FORMATS[config.history_partition]
+        self._prefix = f"{config.history_file.stem}-"
+        self.durability = DurabilityPolicy(config)
+
+    @property
+    def location(self) -> Path:
+        return self.config.history_partition_dir
+
+    @property
+    def journal_location(self) -> Path:
+        return self.config.history_partition_dir
+
+    def partition_key(self, timestamp: datetime) -> str:
+        return timestamp.strftime(self._format)
+
+    def partition_path(self, key: str) -> Path:
+        return self.config.history_partition_dir / f"{self._prefix}{key}.csv"
+
+    def partitions(self) -> List[Tuple[str, Path]]:
+        # (key, path) pairs, oldest first; keys sort chronologically.
+        directory = self.config.history_partition_dir
+        if not directory.exists():
+            return []
+        found = []
+        for path in directory.glob(f"{self._prefix}*.csv"):
+            key = path.stem[len(self._prefix):]
+            try:
+                datetime.strptime(key, self._format)
+            except ValueError:
+                continue
+            found.append((key, path))
+        return sorted(found)
+
+    def exists(self) -> bool:
+        return bool(self.partitions())
+
+    def checkpoint_due(self, pending: int) -> bool:
+        # Partitions are bounded by time, so appending never needs compacting.
+        return False
+
+    def checkpoint(self, calculations: Sequence[Calculation]) -> None:
+        # Makes the partitions end with exactly these calculations. Rows older than the first
+        # calculation are archive and stay untouched; an empty history removes every partition.
+        if not calculations:
+            for _, path in self.partitions():
+                path.unlink(missing_ok=True)
+            return
+
+        start = calculations[0].timestamp
+        first_key = self.partition_key(start)
+        groups = self._group(calculations)
+        keys = sorted({key for key, _ in self.partitions() if key >= first_key} | set(groups))
+
+        for key in keys:
+            path = self.partition_path(key)
+            kept = [
+                Calculation.restore(row)
+                for row in read_rows(path, self.config.default_encoding)
+                if datetime.fromisoformat(row["timestamp"]) < start
+            ]
+            rows = kept + groups.get(key, [])
+            if rows:
+                write_rows_atomically(path, rows, self.config.default_encoding)
+            else:
+                path.unlink(missing_ok=True)
+        self.prune()
+
+    def append(self, calculations: Sequence[Calculation]) -> None:
+        self.config.history_partition_dir.mkdir(parents=True, exist_ok=True)
+        rotated = False
+        written = []
+        for key, group in self._group(calculations).items():
+            path = self.partition_path(key)
+            rotated = rotated or not path.exists()
+            append_rows(path, group, self.config.default_encoding)
+            written.append(path)
+        self.durability.written(written)
+        if rotated:
+            self.prune()
+
+    def sync(self) -> None:
+        self.durability.sync()
+
+    def quarantine(self) -> List[Path]:
+        directory = self.config.history_partition_dir
+        return [quarantine(directory)] if directory.exists() else []
+
+    def read(self) -> List[Dict[str, str]]:
+        # Returns the newest max_history_size rows, reading only the partitions that hold them.
+        self.prune()
+        limit = self.config.max_history_size
+        chunks: List[List[Dict[str, str]]] = []
+        total = 0
+        for _, path in reversed(self.partitions()):
+            rows = read_rows(path, self.config.default_encoding)
+            chunks.append(rows)
+            total += len(rows)
+            if total >= limit:
+                break
+        rows = [row for chunk in reversed(chunks) for row in chunk]
+        return rows[-limit:]
+
+    def prune(self, now: Optional[datetime] = None) -> List[Path]:
+        # Deletes partitions that ended before the retention cut-off. No file is rewritten.
+        if not self.config.history_retention_days:
+            return []
+        cutoff = (now or datetime.now()) - timedelta(days=self.config.history_retention_days)
+        cutoff_key = self.partition_key(cutoff)
+        removed = []
+        for key, path in self.partitions():
+            if key >= cutoff_key:
+                break
+            path.unlink(missing_ok=True)
+            removed.append(path)
+        if removed:
+            logging.info(f"Removed {len(removed)} history partition(s) older than {cutoff_key}")
+        return removed
+
+    def _group(self, calculations: Sequence[Calculation]) -> Dict[str, List[Calculation]]:
+        groups: Dict[str, List[Calculation]] = {}
+        for calc in calculations:
+            groups.setdefault(self.partition_key(calc.timestamp), []).append(calc)
+        return groups
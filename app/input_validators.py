@@ -1,25 +1,162 @@
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from functools import lru_cache
+import math
+from pathlib import Path
+import re
+from typing import Any, Iterable, List, Optional, Tuple, Union
+from app.array_operands import ArrayOperand, load_array
 from app.calculator_config import CalculatorConfig
-from app.exceptions import ValidationError
+from app.exceptions import BulkValidationError, ValidationError
+
+ValidatedNumber = Union[Decimal, int, float]
+
+# Plain decimal literals, optionally signed and in exponent notation. Used to reject bad strings
+# in bulk before paying for Decimal construction and exception handling.
+NUMBER_PATTERN = re.compile(r"\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*")
+
+
+@lru_cache(maxsize=1024)
+def _parse_literal(text: str) -> Decimal:
+    # Hot literals ("0", "1", "100", ...) repeat constantly; Decimals are immutable, so sharing is safe.
+    return Decimal(text).normalize()
+
+
+@lru_cache(maxsize=16)
+def _float_limit(max_input_value: Decimal) -> float:
+    # Comparing a float against a Decimal is several times slower than float against float.
+    return float(max_input_value)
+
 
 @dataclass
 class InputValidator:
     """Validates and sanitizes calculator inputs."""
-    
+
     @staticmethod
-    def validate_number(value: Any, config: CalculatorConfig) -> Decimal:
-        # This method takes an input value and a CalculatorConfig instance, and attempts to convert the input into a Decimal number.
-        # It also checks if the number exceeds the maximum allowed input value defined in the configuration. 
-        # If the input is valid, it returns the normalized Decimal value; otherwise, it raises a ValidationError with an appropriate message.
+    def validate_number(value: Any, config: CalculatorConfig) -> ValidatedNumber:
+        # This method takes an input value and a CalculatorConfig instance, and converts it to the configured numeric backend.
+        # It also checks if the number exceeds the maximum allowed input value defined in the configuration.
+        # If the input is valid, it returns the converted value; otherwise, it raises a ValidationError with an appropriate message.
+        backend = getattr(config, "numeric_backend", "decimal")
+        if isinstance(value, str):
+            value = value.strip()
+
+        if backend == "float":
+            return InputValidator._validate_float(value, config)
+        if backend == "int":
+            integral = InputValidator._as_int(value)
+            if integral is not None:
+                InputValidator._check_bounds(integral, config)
+                return integral
 
         try:
-            if isinstance(value, str):
-                value = value.strip()
-            number = Decimal(str(value))
-            if abs(number) > config.max_input_value:
-                raise ValidationError(f"Value exceeds maximum allowed: {config.max_input_value}")
-            return number.normalize()
+            number = _parse_literal(value) if isinstance(value, str) else Decimal(str(value)).normalize()
+            InputValidator._check_bounds(number, config)
+            return number
         except InvalidOperation as e:
-            raise ValidationError(f"Invalid number format: {value}") from e
\ No newline at end of file
+            raise ValidationError(f"Invalid number format: {value}") from e
+
+    @staticmethod
+    def validate_many(values: Iterable[Any], config: CalculatorConfig) -> List[ValidatedNumber]:
+        # Bulk counterpart of validate_number for whole columns or sequences. NumPy arrays and pandas
+        # Series of numbers are screened with vectorized checks; other sequences are pre-screened with
+        # NUMBER_PATTERN. Every failure is collected and raised together as a BulkValidationError.
+        if hasattr(values, "to_numpy"):
+            values = values.to_numpy()
+        if hasattr(values, "dtype") and hasattr(values, "ravel") and values.dtype.kind in "iuf":
+            return InputValidator._validate_array(values.ravel(), config)
+
+        results: List[ValidatedNumber] = []
+        failures: List[Tuple[int, Any, str]] = []
+        for index, value in enumerate(values):
+            if isinstance(value, str) and not NUMBER_PATTERN.fullmatch(value):
+                failures.append((index, value, f"Invalid number format: {value}"))
+                continue
+            try:
+                results.append(InputValidator.validate_number(value, config))
+            except ValidationError as error:
+                failures.append((index, value, str(error)))
+        if failures:
+            raise BulkValidationError(failures)
+        return results
+
+    @staticmethod
+    def validate_array(value: Any, config: CalculatorConfig) -> Union[ArrayOperand, ValidatedNumber]:
+        # Operand of an array operation: a number (kept as a scalar), a path to a .npy or CSV file,
+        # an ArrayOperand, or anything NumPy can turn into an array. Arrays must be finite and
+        # within max_input_value, checked in one vectorized pass.
+        import numpy as np
+
+        if isinstance(value, (int, float, Decimal)) or (isinstance(value, str) and NUMBER_PATTERN.fullmatch(value)):
+            return InputValidator.validate_number(value, config)
+        if isinstance(value, (str, Path)):
+            operand = load_array(value)
+        elif isinstance(value, ArrayOperand):
+            operand = value
+        else:
+            try:
+                operand = ArrayOperand(value)
+            except (TypeError, ValueError) as e:
+                raise ValidationError(f"Invalid array: {e}") from e
+
+        data = operand.data
+        if data.size and not np.isfinite(data).all():
+            raise ValidationError("Array contains values that are not finite numbers")
+        if data.size and np.abs(data).max() > _float_limit(config.max_input_value):
+            raise ValidationError(f"Value exceeds maximum allowed: {config.max_input_value}")
+        return operand
+
+    @staticmethod
+    def _validate_array(array: Any, config: CalculatorConfig) -> List[ValidatedNumber]:
+        import numpy as np
+
+        invalid = np.abs(array) > _float_limit(config.max_input_value)
+        if array.dtype.kind == "f":
+            invalid |= ~np.isfinite(array)
+        bad = np.flatnonzero(invalid)
+        if bad.size:
+            raise BulkValidationError(
+                (
+                    int(index),
+                    array[index].item(),
+                    f"Value exceeds maximum allowed: {config.max_input_value}"
+                    if np.isfinite(array[index])
+                    else f"Invalid number format: {array[index]}",
+                )
+                for index in bad
+            )
+
+        backend = getattr(config, "numeric_backend", "decimal")
+        if backend == "float":
+            return array.astype(np.float64).tolist()
+        if backend == "int" and array.dtype.kind in "iu":
+            return array.tolist()
+        return [Decimal(str(value)).normalize() for value in array.tolist()]
+
+    @staticmethod
+    def _as_int(value: Any) -> Optional[int]:
+        # Integer fast path: plain ints pass through untouched and integral strings skip Decimal parsing.
+        if type(value) is int:
+            return value
+        if isinstance(value, str):
+            digits = value[1:] if value[:1] in "+-" else value
+            if digits.isdigit() and digits.isascii():
+                return int(value)
+        return None
+
+    @staticmethod
+    def _validate_float(value: Any, config: CalculatorConfig) -> float:
+        try:
+            number = float(value)
+        except (TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid number format: {value}") from e
+        if not math.isfinite(number):
+            raise ValidationError(f"Invalid number format: {value}")
+        if abs(number) > _float_limit(config.max_input_value):
+            raise ValidationError(f"Value exceeds maximum allowed: {config.max_input_value}")
+        return number
+
+    @staticmethod
+    def _check_bounds(number: ValidatedNumber, config: CalculatorConfig) -> None:
+        if abs(number) > config.max_input_value:
+            raise ValidationError(f"Value exceeds maximum allowed: {config.max_input_value}")
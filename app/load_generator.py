@@ -0,0 +1,319 @@
+########################
+# Load Generator       #
+########################
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+import json
+import math
+from pathlib import Path
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+if __package__ is None or __package__ == "":  # pragma: no cover
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app import calculator_repl
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_session import CalculatorSessionManager
+from app.exceptions import CalculatorError
+from app.operations import OperationFactory
+
+MODES = ("threads", "processes")
+PATHS = ("calculator", "repl")
+DEFAULT_MIX = "add=4,subtract=2,multiply=3,divide=1"
+DEFAULT_OPERANDS = "uniform:1:100"
+COMMAND_PROMPT = "Enter command: "
+
+# One workload step: operation name and both operands, as the REPL would read them.
+Step = Tuple[str, str, str]
+
+
+@dataclass
+class LoadSpec:
+    # What every session runs: `operations` steps drawn from `mix` (name -> weight) with operands
+    # from the `operands` distribution, through Calculator calls or REPL commands (`path`).
+    mix: Dict[str, float]
+    operands: str = DEFAULT_OPERANDS
+    operations: int = 1000
+    path: str = "calculator"
+    seed: int = 1
+
+
+@dataclass
+class SessionResult:
+    # Latencies in seconds; started/finished are wall-clock times so sessions run in separate
+    # processes can be compared.
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+
+
+@dataclass
+class LoadReport:
+    mode: str
+    path: str
+    sessions: int
+    latencies: List[float]
+    errors: int
+    elapsed: float
+    history_bytes: int
+    log_bytes: int
+
+    @property
+    def operations(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        # Nearest-rank percentile of the latencies, in milliseconds.
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)] * 1000
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "sessions": self.sessions,
+            "operations": self.operations,
+            "errors": self.errors,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_ops": round(self.throughput, 1),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "p99_ms": round(self.percentile(99), 3),
+            "history_bytes": self.history_bytes,
+            "log_bytes": self.log_bytes,
+        }
+
+    def lines(self) -> List[str]:
+        data = self.to_dict()
+        return [
+            f"{data['sessions']} {self.mode} session(s), {data['operations']} operations via {self.path}, {data['errors']} error(s)",
+            f"throughput {data['throughput_ops']} ops/s over {data['elapsed_s']} s",
+            f"latency p50 {data['p50_ms']} ms, p95 {data['p95_ms']} ms, p99 {data['p99_ms']} ms",
+            f"written {data['history_bytes']} bytes to history_dir, {data['log_bytes']} bytes to log_dir",
+        ]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    # "add=4,divide=1" -> {"add": 4.0, "divide": 1.0}; a name without a weight counts 1.
+    mix = {}
+    for entry in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = entry.partition("=")
+        try:
+            mix[name.strip().lower()] = float(weight or 1)
+        except ValueError:
+            raise ValueError(f"Invalid weight in operation mix: {entry}") from None
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise ValueError(f"Operation mix needs positive weights, got {text!r}")
+    return mix
+
+
+def check_mix(mix: Dict[str, float]) -> None:
+    # Every name must be a two-operand operation (built in or plugin) the factory can create.
+    for name in mix:
+        if name in OperationFactory.aggregate_names() + OperationFactory.array_names():
+            raise ValueError(f"Not a two-operand operation: {name}")
+        OperationFactory.create_operation(name)
+
+
+def operand_sampler(spec: str, rng: random.Random) -> Callable[[], str]:
+    # "uniform:LOW:HIGH" draws uniformly; "zipf:N:LOW:HIGH" draws from N values in that range with
+    # 1/rank weights, so a few operands dominate as in real traffic. Operands have two decimals.
+    kind, *args = spec.split(":")
+    try:
+        numbers = [float(arg) for arg in args]
+        if kind == "uniform" and len(numbers) == 2:
+            low, high = numbers
+            return lambda: f"{rng.uniform(low, high):.2f}"
+        if kind == "zipf" and len(numbers) == 3 and numbers[0] >= 1:
+            count, low, high = int(numbers[0]), numbers[1], numbers[2]
+            values = [f"{rng.uniform(low, high):.2f}" for _ in range(count)]
+            weights = [1 / rank for rank in range(1, count + 1)]
+            return lambda: rng.choices(values, weights)[0]
+    except ValueError:
+        pass
+    raise ValueError(f"Operand distribution must be uniform:LOW:HIGH or zipf:N:LOW:HIGH, got {spec!r}")
+
+
+def build_workload(spec: LoadSpec, session: int) -> List[Step]:
+    # Generated before the session starts, so drawing random numbers is not timed.
+    rng = random.Random(spec.seed + session)
+    operand = operand_sampler(spec.operands, rng)
+    names = rng.choices(list(spec.mix), list(spec.mix.values()), k=spec.operations)
+    return [(name, operand(), operand()) for name in names]
+
+
+def run_calculator_session(calc: Calculator, workload: Iterable[Step]) -> SessionResult:
+    result = SessionResult(started=time.time())
+    for name, a, b in workload:
+        started = time.perf_counter()
+        try:
+            calc.set_operation(OperationFactory.create_operation(name))
+            calc.perform_operation(a, b)
+        except CalculatorError:
+            result.errors += 1
+        result.latencies.append(time.perf_counter() - started)
+    result.finished = time.time()
+    return result
+
+
+class ScriptedConsole:
+    # Stands in for input() and print() in app.calculator_repl while sessions run. Each thread reads
+    # its own script; a command's latency runs from its prompt to the next command prompt.
+    def __init__(self):
+        self._local = threading.local()
+
+    def run(self, calc: Calculator, workload: Iterable[Step]) -> SessionResult:
+        state = self._local
+        state.lines = iter([line for step in workload for line in step] + ["exit"])
+        state.result = SessionResult()
+        state.command_started = None
+        state.result.started = time.time()
+        calculator_repl.calculator_repl(calc)
+        state.result.finished = time.time()
+        return state.result
+
+    def input(self, prompt: str = "") -> str:
+        state = self._local
+        line = next(state.lines)
+        if prompt == COMMAND_PROMPT:
+            now = time.perf_counter()
+            if state.command_started is not None:
+                state.result.latencies.append(now - state.command_started)
+            state.command_started = None if line == "exit" else now
+        return line
+
+    def print(self, *args, **kwargs) -> None:
+        if args and str(args[0]).startswith(("Operation failed", "Unexpected error")):
+            self._local.result.errors += 1
+
+    def install(self) -> None:
+        calculator_repl.input = self.input
+        calculator_repl.print = self.print
+
+    def uninstall(self) -> None:
+        for name in ("input", "print"):
+            vars(calculator_repl).pop(name, None)
+
+
+def run_session(calc: Calculator, workload: List[Step], path: str, console: Optional[ScriptedConsole] = None) -> SessionResult:
+    if path == "repl":
+        return console.run(calc, workload)
+    return run_calculator_session(calc, workload)
+
+
+def run_process_session(base_dir: Path, spec: LoadSpec, session: int) -> SessionResult:
+    # Runs in a worker process, with its own Calculator and base directory. The REPL path saves on
+    # its scripted "exit"; only direct Calculator sessions are saved here.
+    calc = Calculator(CalculatorConfig(base_dir=base_dir / f"session-{session}"))
+    workload = build_workload(spec, session)
+    console = ScriptedConsole()
+    console.install()
+    try:
+        return run_session(calc, workload, spec.path, console)
+    finally:
+        console.uninstall()
+        if spec.path == "calculator":
+            calc.save_history(sync=True)
+
+
+def run_load(spec: LoadSpec, sessions: int, mode: str, base_dir: Path) -> LoadReport:
+    # Threads share one history through CalculatorSession objects; processes each get a Calculator
+    # over base_dir/session-N. Bytes written are the growth of every history_dir and log_dir used.
+    if mode == "threads":
+        configs = [CalculatorConfig(base_dir=base_dir)]
+    else:
+        configs = [CalculatorConfig(base_dir=base_dir / f"session-{session}") for session in range(sessions)]
+    history_dirs = {config.history_dir for config in configs}
+    log_dirs = {config.log_dir for config in configs}
+    before = _bytes_in(history_dirs), _bytes_in(log_dirs)
+
+    if mode == "threads":
+        manager = CalculatorSessionManager(configs[0])
+        workloads = [build_workload(spec, session) for session in range(sessions)]
+        console = ScriptedConsole()
+        console.install()
+        try:
+            with ThreadPoolExecutor(sessions) as pool:
+                futures = [
+                    pool.submit(run_session, manager.create_session(), workload, spec.path, console)
+                    for workload in workloads
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            console.uninstall()
+        manager.save_history(sync=True)
+    else:
+        with ProcessPoolExecutor(sessions) as pool:
+            futures = [pool.submit(run_process_session, base_dir, spec, session) for session in range(sessions)]
+            results = [future.result() for future in futures]
+
+    return LoadReport(
+        mode=mode,
+        path=spec.path,
+        sessions=sessions,
+        latencies=[latency for result in results for latency in result.latencies],
+        errors=sum(result.errors for result in results),
+        elapsed=max(result.finished for result in results) - min(result.started for result in results),
+        history_bytes=_bytes_in(history_dirs) - before[0],
+        log_bytes=_bytes_in(log_dirs) - before[1],
+    )
+
+
+def _bytes_in(directories: Iterable[Path]) -> int:
+    return sum(path.stat().st_size for directory in directories for path in Path(directory).rglob("*") if path.is_file())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run concurrent calculator sessions and report latency and throughput.")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--operations", type=int, default=1000, help="Operations per session")
+    parser.add_argument("--mode", choices=MODES, default="threads")
+    parser.add_argument("--path", choices=PATHS, default="calculator", help="Call Calculator directly or drive REPL commands")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights, e.g. add=4,divide=1")
+    parser.add_argument("--operands", default=DEFAULT_OPERANDS, help="uniform:LOW:HIGH or zipf:N:LOW:HIGH")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--base-dir", type=Path, help="Directory for history and logs (default: a temporary one)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.sessions < 1 or args.operations < 1:
+            raise ValueError("--sessions and --operations must be positive")
+        spec = LoadSpec(parse_mix(args.mix), args.operands, args.operations, args.path, args.seed)
+        OperationFactory.discover_plugins(CalculatorConfig().operation_plugin_specs)
+        check_mix(spec.mix)
+        operand_sampler(spec.operands, random.Random())
+        if args.base_dir:
+            report = run_load(spec, args.sessions, args.mode, args.base_dir.resolve())
+        else:
+            with tempfile.TemporaryDirectory() as directory:
+                report = run_load(spec, args.sessions, args.mode, Path(directory))
+    except (OSError, ValueError, CalculatorError) as error:
+        print(f"Load run failed: {error}")
+        return 2
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        for line in report.lines():
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
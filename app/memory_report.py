@@ -0,0 +1,129 @@
+########################
+# Memory Report        #
+########################
+
+from dataclasses import asdict, dataclass
+import sys
+import tracemalloc
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.array_operands import ArrayOperand
+from app.calculation import Calculation
+from app.calculator_memento import CalculatorMemento, LazyMemento
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+@dataclass
+class MemoryReport:
+    # Estimated bytes held by a calculator, by category. Objects shared between categories (a
+    # Calculation in the history and in undo snapshots, an interned Decimal) are counted once, in
+    # the first category that reaches them: history, undo, redo, caches, observers.
+    history_bytes: int
+    undo_bytes: int
+    redo_bytes: int
+    cache_bytes: int
+    observer_bytes: int
+    history_entries: int
+    undo_entries: int
+    redo_entries: int
+    # Highest total_bytes of any report taken from this calculator so far.
+    peak_bytes: int = 0
+    # The process's peak resident set size (0 where the OS does not report it).
+    process_peak_rss: int = 0
+    # Exact allocation figures, only when tracemalloc is tracing (e.g. PYTHONTRACEMALLOC=1).
+    traced_bytes: Optional[int] = None
+    traced_peak_bytes: Optional[int] = None
+
+    @property
+    def total_bytes(self) -> int:
+        return self.history_bytes + self.undo_bytes + self.redo_bytes + self.cache_bytes + self.observer_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(asdict(self), total_bytes=self.total_bytes)
+
+    def lines(self) -> List[str]:
+        rows = [
+            ("history", self.history_bytes, f"{self.history_entries} calculations"),
+            ("undo", self.undo_bytes, f"{self.undo_entries} snapshots"),
+            ("redo", self.redo_bytes, f"{self.redo_entries} snapshots"),
+            ("caches", self.cache_bytes, ""),
+            ("observers", self.observer_bytes, ""),
+            ("total", self.total_bytes, f"peak {format_bytes(self.peak_bytes)}"),
+        ]
+        lines = [f"  {name:<10}{format_bytes(size):>12}  {note}".rstrip() for name, size, note in rows]
+        if self.process_peak_rss:
+            lines.append(f"  {'process':<10}{format_bytes(self.process_peak_rss):>12}  peak RSS")
+        if self.traced_bytes is not None:
+            lines.append(
+                f"  {'traced':<10}{format_bytes(self.traced_bytes):>12}  peak {format_bytes(self.traced_peak_bytes)}"
+            )
+        return lines
+
+
+def estimate_size(objects: Iterable[Any], seen: Set[int]) -> int:
+    # sys.getsizeof over the object graph reachable through containers, Calculations, array
+    # operands and loaded mementos. Ids in `seen` are skipped and every object visited is added,
+    # so a shared object is only counted once. Lazy mementos that were never loaded count as their
+    # own small size: the report never reads undo state from disk.
+    total = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, Calculation):
+            stack.append(vars(obj))
+        elif isinstance(obj, ArrayOperand):
+            stack.append(vars(obj))
+        elif isinstance(obj, LazyMemento):
+            if obj.loaded:
+                stack.append(obj._memento)
+        elif isinstance(obj, CalculatorMemento):
+            stack.append(obj.history)
+            stack.append(obj.timestamp)
+    return total
+
+
+def shallow_size(objects: Iterable[Any], seen: Set[int]) -> int:
+    # Objects and their attribute dicts only; for observers, which may reference the calculator itself.
+    total = 0
+    for obj in objects:
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj) + sys.getsizeof(getattr(obj, "__dict__", None))
+    return total
+
+
+def process_peak_rss() -> int:
+    if resource is None:  # pragma: no cover
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def traced_memory() -> Dict[str, Optional[int]]:
+    if not tracemalloc.is_tracing():
+        return {"traced_bytes": None, "traced_peak_bytes": None}
+    current, peak = tracemalloc.get_traced_memory()
+    return {"traced_bytes": current, "traced_peak_bytes": peak}
+
+
+def format_bytes(size: Optional[int]) -> str:
+    value = float(size or 0)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
@@ -4,9 +4,42 @@
 
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Dict
+from functools import lru_cache
+import importlib
+import math
+from typing import Any, Dict, List, Optional, Sequence, Union
+from app.array_operands import ArrayOperand, to_array
 from app.exceptions import ValidationError
 
+Number = Union[Decimal, int, float]
+
+# Entry point group installed packages use to publish operations, e.g. in pyproject.toml:
+#   [project.entry-points."calculator.operations"]
+#   modulus = "my_package.operations:Modulus"
+PLUGIN_GROUP = "calculator.operations"
+
+
+# Arithmetic shared by the strategies below and Calculation.calculate, so the result a strategy
+# returns is exactly the one recorded in history, whatever the numeric backend.
+def divide(a: Number, b: Number) -> Number:
+    if isinstance(a, int) and isinstance(b, int):
+        # Integer backend: keep exact quotients as ints, fall back to Decimal otherwise.
+        quotient, remainder = divmod(a, b)
+        return quotient if remainder == 0 else Decimal(a) / Decimal(b)
+    return a / b
+
+
+def power(a: Number, b: Number) -> Number:
+    # Integer bases are raised as Decimals (rounded to the Decimal context); Decimal and float
+    # bases stay in their own arithmetic.
+    return Decimal(a) ** b if isinstance(a, int) else a**b
+
+
+def root(a: Number, b: Number) -> Number:
+    # Always computed in float64; the float backend keeps the float, the others get a Decimal.
+    result = pow(float(a), 1 / float(b))
+    return result if isinstance(a, float) else Decimal(result)
+
 
 class Operation(ABC):
 
@@ -61,7 +94,7 @@ class Division(Operation):
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
  
         self.validate_operands(a, b)
-        return a / b
+        return divide(a, b)
 
 
 class Power(Operation):
@@ -76,7 +109,7 @@ class Power(Operation):
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
        
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), float(b)))
+        return power(a, b)
 
 
 class Root(Operation):
@@ -89,7 +122,183 @@ class Root(Operation):
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), 1 / float(b)))
+        return root(a, b)
+
+
+class AggregateOperation(Operation):
+    # N-ary operation over whole operand lists: `arity` vectors in, one number out.
+    # Float vectors (the float backend) run as NumPy or math.fsum kernels; Decimal and int vectors
+    # stay exact and go through the C-level builtins (sum, math.prod, min, max) in one pass.
+    # execute(a, b) is the two-operand special case.
+    arity = 1
+
+    def execute(self, a: Decimal, b: Decimal) -> Decimal:
+        vectors = [[a, b]] if self.arity == 1 else [[a], [b]]
+        return self.execute_vectors(vectors)
+
+    def execute_vectors(self, vectors: Sequence[Sequence[Number]]) -> Number:
+        self.validate_vectors(vectors)
+        return self.aggregate(*vectors)
+
+    def validate_vectors(self, vectors: Sequence[Sequence[Number]]) -> None:
+        if len(vectors) != self.arity:
+            raise ValidationError(f"{self} takes {self.arity} operand list(s), got {len(vectors)}")
+        if any(len(vector) == 0 for vector in vectors):
+            raise ValidationError(f"{self} needs at least one operand")
+
+    @abstractmethod
+    def aggregate(self, *vectors: Sequence[Number]) -> Number:
+
+        pass  # pragma: no cover
+
+    @staticmethod
+    def is_float(values: Sequence[Number]) -> bool:
+        return all(type(value) is float for value in values)
+
+    @staticmethod
+    def exact_mean(values: Sequence[Number]) -> Number:
+        total = sum(values)
+        if isinstance(total, int):
+            # Integer backend: keep exact means as ints, like Division.
+            quotient, remainder = divmod(total, len(values))
+            return quotient if remainder == 0 else Decimal(total) / len(values)
+        return total / len(values)
+
+
+class Sum(AggregateOperation):
+
+    def aggregate(self, values: Sequence[Number]) -> Number:
+        if self.is_float(values):
+            return math.fsum(values)
+        return sum(values)
+
+
+class Product(AggregateOperation):
+
+    def aggregate(self, values: Sequence[Number]) -> Number:
+        return math.prod(values)
+
+
+class Mean(AggregateOperation):
+
+    def aggregate(self, values: Sequence[Number]) -> Number:
+        if self.is_float(values):
+            return math.fsum(values) / len(values)
+        return self.exact_mean(values)
+
+
+class StandardDeviation(AggregateOperation):
+    # Population standard deviation.
+
+    def aggregate(self, values: Sequence[Number]) -> Number:
+        if self.is_float(values):
+            import numpy as np
+
+            return float(np.std(np.asarray(values, dtype=np.float64)))
+        decimals = [Decimal(value) for value in values]
+        mean = sum(decimals) / len(decimals)
+        return (sum((value - mean) ** 2 for value in decimals) / len(decimals)).sqrt()
+
+
+class Minimum(AggregateOperation):
+
+    def aggregate(self, values: Sequence[Number]) -> Number:
+        if self.is_float(values):
+            import numpy as np
+
+            return float(np.min(np.asarray(values, dtype=np.float64)))
+        return min(values)
+
+
+class Maximum(AggregateOperation):
+
+    def aggregate(self, values: Sequence[Number]) -> Number:
+        if self.is_float(values):
+            import numpy as np
+
+            return float(np.max(np.asarray(values, dtype=np.float64)))
+        return max(values)
+
+
+class DotProduct(AggregateOperation):
+    arity = 2
+
+    def validate_vectors(self, vectors: Sequence[Sequence[Number]]) -> None:
+        super().validate_vectors(vectors)
+        if len(vectors[0]) != len(vectors[1]):
+            raise ValidationError("Dot product needs operand lists of equal length")
+
+    def aggregate(self, left: Sequence[Number], right: Sequence[Number]) -> Number:
+        if self.is_float(left) and self.is_float(right):
+            import numpy as np
+
+            return float(np.dot(np.asarray(left, dtype=np.float64), np.asarray(right, dtype=np.float64)))
+        return sum(a * b for a, b in zip(left, right))
+
+
+class ArrayOperation(Operation):
+    # Elementwise and linear-algebra operations on NumPy arrays (ArrayOperand) and scalars.
+    # Operands are float64 whatever the numeric backend; the result is always an ArrayOperand.
+
+    def execute(self, a: Any, b: Any) -> ArrayOperand:
+        import numpy as np
+
+        x, y = to_array(a), to_array(b)
+        self.validate_operands(x, y)
+        try:
+            return ArrayOperand(self.compute(x, y))
+        except np.linalg.LinAlgError as error:
+            raise ValidationError(f"{self} failed: {error}") from error
+
+    @abstractmethod
+    def compute(self, x: Any, y: Any) -> Any:
+
+        pass  # pragma: no cover
+
+
+class VectorAddition(ArrayOperation):
+
+    def validate_operands(self, x: Any, y: Any) -> None:
+        if x.shape != y.shape:
+            raise ValidationError(f"Cannot add arrays of shapes {x.shape} and {y.shape}")
+
+    def compute(self, x: Any, y: Any) -> Any:
+        return x + y
+
+
+class VectorScale(ArrayOperation):
+
+    def validate_operands(self, x: Any, y: Any) -> None:
+        if y.ndim != 0:
+            raise ValidationError("The scale factor must be a single number")
+
+    def compute(self, x: Any, y: Any) -> Any:
+        return x * y
+
+
+class MatrixMultiply(ArrayOperation):
+
+    def validate_operands(self, x: Any, y: Any) -> None:
+        if x.ndim == 0 or y.ndim == 0 or x.shape[-1] != y.shape[0]:
+            raise ValidationError(f"Cannot multiply arrays of shapes {x.shape} and {y.shape}")
+
+    def compute(self, x: Any, y: Any) -> Any:
+        return x @ y
+
+
+class LinearSolve(ArrayOperation):
+    # Solves a @ result = b for a square matrix a.
+
+    def validate_operands(self, x: Any, y: Any) -> None:
+        if x.ndim != 2 or x.shape[0] != x.shape[1]:
+            raise ValidationError(f"Solve needs a square matrix, got shape {x.shape}")
+        if y.ndim == 0 or y.shape[0] != x.shape[0]:
+            raise ValidationError(f"Right-hand side of shape {y.shape} does not match a {x.shape} matrix")
+
+    def compute(self, x: Any, y: Any) -> Any:
+        import numpy as np
+
+        return np.linalg.solve(x, y)
 
 
 class OperationFactory:
@@ -104,6 +313,12 @@ class OperationFactory:
         'root': Root
     }
 
+    # Plugins known by name whose modules are imported on first use: name -> "module:Class".
+    _plugins: Dict[str, str] = {}
+
+    # One shared instance per operation class; operations hold no state.
+    _instances: Dict[type, Operation] = {}
+
     @classmethod
     def register_operation(cls, name: str, operation_class: type) -> None:
        
@@ -111,10 +326,97 @@ class OperationFactory:
             raise TypeError("Operation class must inherit from Operation")
         cls._operations[name.lower()] = operation_class
 
+    @classmethod
+    def register_plugin(cls, name: str, target: str) -> None:
+        # Registers an operation by "module:Class" without importing it.
+        if ":" not in target:
+            raise ValueError(f"Operation plugin target must look like module:Class, got {target}")
+        cls._plugins[name.lower()] = target
+
+    @classmethod
+    def discover_plugins(cls, specs: Optional[Dict[str, str]] = None) -> List[str]:
+        # Registers the operations published under PLUGIN_GROUP by installed packages plus the
+        # name -> "module:Class" specs given (config.operation_plugin_specs). Nothing is imported,
+        # and names already registered as operations are left alone.
+        found = dict(_entry_point_plugins())
+        found.update(specs or {})
+        for name, target in found.items():
+            if name.lower() not in cls._operations:
+                cls.register_plugin(name, target)
+        return sorted(found)
+
     @classmethod
     def create_operation(cls, operation_type: str) -> Operation:
         
-        operation_class = cls._operations.get(operation_type.lower())
+        name = operation_type.lower()
+        operation_class = cls._operations.get(name) or cls._load_plugin(name)
         if not operation_class:
             raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
\ No newline at end of file
+        return cls.instance(operation_class)
+
+    @classmethod
+    def instance(cls, operation_class: type) -> Operation:
+        operation = cls._instances.get(operation_class)
+        if operation is None:
+            operation = cls._instances[operation_class] = operation_class()
+        return operation
+
+    @classmethod
+    def class_for(cls, operation_name: str) -> Optional[type]:
+        # Registered class by the name recorded in history (str(operation), i.e. the class name).
+        for operation_class in cls._operations.values():
+            if operation_class.__name__ == operation_name:
+                return operation_class
+        for name, target in cls._plugins.items():
+            if target.rpartition(":")[2] == operation_name:
+                return cls._load_plugin(name)
+        return None
+
+    @classmethod
+    def plugin_names(cls) -> List[str]:
+        return list(cls._plugins)
+
+    @classmethod
+    def _load_plugin(cls, name: str) -> Optional[type]:
+        target = cls._plugins.get(name)
+        if target is None:
+            return None
+        module_name, _, class_name = target.partition(":")
+        try:
+            operation_class = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError) as error:
+            raise ValueError(f"Cannot load operation plugin {name} ({target}): {error}") from error
+        cls.register_operation(name, operation_class)
+        return operation_class
+
+    @classmethod
+    def aggregate_names(cls) -> List[str]:
+        return [name for name, operation_class in cls._operations.items() if issubclass(operation_class, AggregateOperation)]
+
+    @classmethod
+    def array_names(cls) -> List[str]:
+        return [name for name, operation_class in cls._operations.items() if issubclass(operation_class, ArrayOperation)]
+
+
+for _name, _operation_class in (
+    ("sum", Sum),
+    ("product", Product),
+    ("mean", Mean),
+    ("stddev", StandardDeviation),
+    ("min", Minimum),
+    ("max", Maximum),
+    ("dot", DotProduct),
+    ("vadd", VectorAddition),
+    ("vscale", VectorScale),
+    ("matmul", MatrixMultiply),
+    ("solve", LinearSolve),
+):
+    OperationFactory.register_operation(_name, _operation_class)
+
+
+@lru_cache(maxsize=1)
+def _entry_point_plugins() -> Dict[str, str]:
+    # Scanning installed package metadata is the slow part of discovery, so it happens once per process.
+    from importlib.metadata import entry_points
+
+    return {entry_point.name: entry_point.value for entry_point in entry_points(group=PLUGIN_GROUP)}
@@ -0,0 +1,172 @@
+########################
+# Result Cache         #
+########################
+
+from collections import OrderedDict
+from decimal import Decimal
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.calculation import Calculation
+from app.memory_report import estimate_size
+
+# Operations whose saved history results are exactly what Operation.execute returns, so history
+# can warm the cache.
+WARMABLE_OPERATIONS = frozenset({"Addition", "Subtraction", "Multiplication", "Division", "Power", "Root"})
+
+# Results kept in process in front of the database (at most max_entries); hits there cost a dict lookup.
+MEMORY_ENTRIES = 4096
+
+# New results are written to the database in batches of this size (and on flush()).
+WRITE_BATCH = 64
+
+_DECODERS = {"decimal": Decimal, "int": int, "float": float}
+
+Key = Tuple[str, str, str, str]
+
+
+class ResultCache:
+    # Persistent (operation, operand1, operand2) -> result cache in a SQLite file, shared by every
+    # process on the host. The database runs in WAL mode, so readers never block the writer, and
+    # waits up to `timeout` seconds for another process's write lock. Eviction is least recently
+    # used: every hit re-inserts its row (batched with the writes), which gives it the newest
+    # rowid, and rows outside the last max_entries rowids are deleted in bulk. Keys include the numeric
+    # backend, since each backend returns its own number type. Database errors are logged and
+    # treated as misses: the cache can make calculations faster, never make them fail.
+    def __init__(self, path: Path, max_entries: int, backend: str = "decimal", timeout: float = 5.0):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.memory_entries = min(MEMORY_ENTRIES, max_entries)
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[Key, Any]" = OrderedDict()
+        # Rows to insert or re-insert (hits) in the next batch: encoded key -> (kind, result).
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, kind TEXT NOT NULL, result TEXT NOT NULL)"
+            )
+
+    def key(self, operation: str, a: Any, b: Any) -> Key:
+        return (self.backend, operation, str(a), str(b))
+
+    def get(self, operation: str, a: Any, b: Any) -> Optional[Any]:
+        key = self.key(operation, a, b)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                result = self._memory[key]
+                self._queue(key, result)
+                return result
+            try:
+                row = self._connection.execute(
+                    "SELECT kind, result FROM results WHERE key = ?", (self._encode_key(key),)
+                ).fetchone()
+            except sqlite3.Error as error:
+                logging.warning(f"Result cache lookup failed: {error}")
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            result = _DECODERS[row[0]](row[1])
+            self._remember(key, result)
+            self._queue(key, result)
+            return result
+
+    def put(self, operation: str, a: Any, b: Any, result: Any) -> None:
+        kind = self._kind(result)
+        if kind is None:
+            return
+        key = self.key(operation, a, b)
+        with self._lock:
+            self._remember(key, result)
+            self._queue(key, result)
+
+    def warm(self, calculations: Iterable[Calculation]) -> int:
+        # Loads the results of a (loaded) history into the database in one transaction.
+        if self.backend != "decimal":
+            return 0
+        rows = {
+            self._encode_key(self.key(calc.operation, calc.operand1, calc.operand2)): ("decimal", str(calc.result))
+            for calc in calculations
+            if calc.operation in WARMABLE_OPERATIONS and isinstance(calc.result, Decimal)
+        }
+        with self._lock:
+            self._pending.update(rows)
+            self._write_pending()
+        return len(rows)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._write_pending()
+
+    def memory_bytes(self, seen: Optional[Set[int]] = None) -> int:
+        # Estimated bytes of the in-process entries and the rows waiting to be written, skipping
+        # (and adding to) `seen` as memory_report.estimate_size does.
+        with self._lock:
+            return estimate_size([self._memory, self._pending], set() if seen is None else seen)
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._connection.close()
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO results (key, kind, result) VALUES (?, ?, ?)",
+                    [(key, kind, result) for key, (kind, result) in self._pending.items()],
+                )
+                self._connection.execute(
+                    "DELETE FROM results WHERE rowid <= (SELECT MAX(rowid) FROM results) - ?",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as error:
+            logging.warning(f"Result cache write failed: {error}")
+        self._pending.clear()
+
+    def _queue(self, key: Key, result: Any) -> None:
+        kind = self._kind(result)
+        if kind is not None:
+            self._pending[self._encode_key(key)] = (kind, str(result))
+            if len(self._pending) >= WRITE_BATCH:
+                self._write_pending()
+
+    def _remember(self, key: Key, result: Any) -> None:
+        self._memory[key] = result
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _encode_key(key: Key) -> str:
+        return "\x1f".join(key)
+
+    @staticmethod
+    def _kind(result: Any) -> Optional[str]:
+        if isinstance(result, Decimal):
+            return "decimal"
+        if isinstance(result, bool):
+            return None
+        if isinstance(result, int):
+            return "int"
+        if isinstance(result, float):
+            return "float"
+        return None
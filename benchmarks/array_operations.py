@@ -0,0 +1,95 @@
+"""Compare NumPy array operations with loops over the scalar operations.
+
+Run from the project root:
+
+    python benchmarks/array_operations.py [--size N] [--repeat N]
+
+Vector addition and scaling use vectors of N**2 elements and matrix multiply
+uses N x N matrices. The loop baseline runs the scalar Decimal strategies
+(Addition, Multiplication) element by element, which is what an array operation
+would cost without array operands.
+"""
+
+import argparse
+from decimal import Decimal
+from pathlib import Path
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.array_operands import ArrayOperand  # noqa: E402
+from app.operations import Addition, MatrixMultiply, Multiplication, VectorAddition, VectorScale  # noqa: E402
+
+
+def loop_add(x: list, y: list) -> list:
+    add = Addition()
+    return [add.execute(a, b) for a, b in zip(x, y)]
+
+
+def loop_scale(x: list, factor: Decimal) -> list:
+    multiply = Multiplication()
+    return [multiply.execute(a, factor) for a in x]
+
+
+def loop_matmul(x: list, y: list) -> list:
+    add, multiply = Addition(), Multiplication()
+    columns = list(zip(*y))
+    result = []
+    for row in x:
+        result_row = []
+        for column in columns:
+            total = Decimal(0)
+            for a, b in zip(row, column):
+                total = add.execute(total, multiply.execute(a, b))
+            result_row.append(total)
+        result.append(result_row)
+    return result
+
+
+def best(function, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    matrix_a, matrix_b = rng.random((args.size, args.size)), rng.random((args.size, args.size))
+    vector_a, vector_b = matrix_a.ravel(), matrix_b.ravel()
+    decimal_a = [[Decimal(repr(value)) for value in row] for row in matrix_a.tolist()]
+    decimal_b = [[Decimal(repr(value)) for value in row] for row in matrix_b.tolist()]
+    flat_a = [value for row in decimal_a for value in row]
+    flat_b = [value for row in decimal_b for value in row]
+
+    cases = [
+        (
+            "vadd",
+            lambda: VectorAddition().execute(ArrayOperand(vector_a), ArrayOperand(vector_b)),
+            lambda: loop_add(flat_a, flat_b),
+        ),
+        (
+            "vscale",
+            lambda: VectorScale().execute(ArrayOperand(vector_a), Decimal("2.5")),
+            lambda: loop_scale(flat_a, Decimal("2.5")),
+        ),
+        (
+            "matmul",
+            lambda: MatrixMultiply().execute(ArrayOperand(matrix_a), ArrayOperand(matrix_b)),
+            lambda: loop_matmul(decimal_a, decimal_b),
+        ),
+    ]
+
+    print(f"size {args.size}: {'operation':<10}{'numpy ms':>12}{'loop ms':>12}{'speedup':>10}")
+    for name, vectorized, looped in cases:
+        fast, slow = best(vectorized, args.repeat), best(looped, args.repeat)
+        print(f"{'':<9}{name:<10}{fast:>12.3f}{slow:>12.1f}{slow / fast:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
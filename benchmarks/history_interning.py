@@ -0,0 +1,85 @@
+"""Measure the memory saved by interning history values and calculations.
+
+Run from the project root:
+
+    python benchmarks/history_interning.py [--history N] [--undo N]
+
+The workload is an order-entry style history: prices and quantities drawn from
+a small catalogue with a skewed (Zipf-like) distribution, so the same operands
+and (operation, a, b) triples repeat. It is saved with persisted undo, then
+reloaded in each history_interning mode with every undo snapshot loaded, and
+the memory held by the reloaded calculator is measured with tracemalloc.
+"""
+
+import argparse
+from pathlib import Path
+import random
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.calculator import Calculator  # noqa: E402
+from app.calculator_config import HISTORY_INTERNING_MODES, CalculatorConfig  # noqa: E402
+from app.operations import OperationFactory  # noqa: E402
+
+PRICES = ["0.99", "1.49", "2.50", "4.99", "9.99", "12.00", "19.99", "24.95", "49.00", "99.99"]
+QUANTITIES = [str(quantity) for quantity in range(1, 13)]
+OPERATIONS = [("multiply", 0.7), ("add", 0.2), ("divide", 0.1)]
+
+
+def build_history(base_dir: Path, size: int, undo_depth: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(PRICES) + 1)]
+    calc = Calculator(config=_config(base_dir, size, undo_depth, "off"))
+    names, operation_weights = zip(*OPERATIONS)
+    for _ in range(size):
+        calc.set_operation(OperationFactory.create_operation(rng.choices(names, operation_weights)[0]))
+        calc.perform_operation(rng.choices(PRICES, weights)[0], rng.choice(QUANTITIES))
+    calc.save_history()
+
+
+def measure(base_dir: Path, size: int, undo_depth: int, mode: str) -> tuple:
+    tracemalloc.start()
+    calc = Calculator(config=_config(base_dir, size, undo_depth, mode))
+    for memento in calc.undo_stack:
+        memento.history
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, calc.intern_pool.stats()
+
+
+def _config(base_dir: Path, size: int, undo_depth: int, mode: str) -> CalculatorConfig:
+    return CalculatorConfig(
+        base_dir=base_dir,
+        max_history_size=size,
+        max_undo_depth=undo_depth,
+        max_undo_bytes=1 << 40,
+        auto_save=False,
+        persist_undo=True,
+        history_interning=mode,
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=1000)
+    parser.add_argument("--undo", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        base_dir = Path(directory)
+        build_history(base_dir, args.history, args.undo)
+        print(f"{args.history} calculations, {args.undo} persisted undo snapshots loaded")
+        print(f"{'mode':<14}{'MiB':>10}{'saved':>9}{'values':>9}{'calcs':>9}")
+        baseline = None
+        for mode in HISTORY_INTERNING_MODES:
+            current, stats = measure(base_dir, args.history, args.undo, mode)
+            baseline = baseline or current
+            saved = 1 - current / baseline
+            print(f"{mode:<14}{current / 2**20:>10.2f}{saved:>8.0%}{stats['values']:>9}{stats['calculations']:>9}")
+
+
+if __name__ == "__main__":
+    main()
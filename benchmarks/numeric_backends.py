@@ -0,0 +1,58 @@
+"""Compare the decimal, int and float numeric backends.
+
+Run from the project root:
+
+    python benchmarks/numeric_backends.py [--iterations N]
+
+Each backend is timed on validating two operands and executing the operation,
+for integral and fractional inputs, with the operations the REPL exposes.
+"""
+
+import argparse
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.calculator_config import NUMERIC_BACKENDS, CalculatorConfig  # noqa: E402
+from app.input_validators import InputValidator  # noqa: E402
+from app.operations import OperationFactory  # noqa: E402
+
+OPERAND_SETS = {
+    "integral": [("12345", "678"), ("42", "7"), (100, 25)],
+    "fractional": [("12.5", "0.25"), ("3.14159", "2.71828"), ("0.1", "0.2")],
+}
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+
+def bench(backend: str, operands: list, iterations: int) -> float:
+    config = CalculatorConfig(numeric_backend=backend)
+    operations = [OperationFactory.create_operation(name) for name in OPERATIONS]
+    validate = InputValidator.validate_number
+
+    def run() -> None:
+        for a, b in operands:
+            x = validate(a, config)
+            y = validate(b, config)
+            for operation in operations:
+                operation.execute(x, y)
+
+    seconds = min(timeit.repeat(run, number=iterations, repeat=3))
+    calls = iterations * len(operands) * len(operations)
+    return seconds / calls * 1e9
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(f"{'inputs':<12}" + "".join(f"{backend:>12}" for backend in NUMERIC_BACKENDS) + "   (ns per operation)")
+    for label, operands in OPERAND_SETS.items():
+        timings = [bench(backend, operands, args.iterations) for backend in NUMERIC_BACKENDS]
+        print(f"{label:<12}" + "".join(f"{ns:>12.0f}" for ns in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ from types import SimpleNamespace
 import pytest
 
 from app.calculation import Calculation
+from app.calculator_config import CalculatorConfig
 
 
 if not hasattr(exceptions, "ConfiguationError"):
@@ -34,6 +35,19 @@ def calc_factory():
     return _build
 
 
+@pytest.fixture
+def config_factory(request, tmp_path: Path):
+    # CalculatorConfig under tmp_path with auto-save off. A test module sets the fields it cares
+    # about in a module-level CONFIG_DEFAULTS dict; keyword arguments override per test.
+    def _build(**overrides) -> CalculatorConfig:
+        params = {"base_dir": tmp_path, "auto_save": False}
+        params.update(getattr(request.module, "CONFIG_DEFAULTS", {}))
+        params.update(overrides)
+        return CalculatorConfig(**params)
+
+    return _build
+
+
 @pytest.fixture
 def raw_calc_payload() -> dict:
     return {
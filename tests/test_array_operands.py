@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app import array_operands
+from app.array_operands import ArrayOperand, array_digest, load_array, to_array
+from app.exceptions import ValidationError
+
+
+def test_small_arrays_are_saved_inline() -> None:
+    operand = ArrayOperand([[1, 2], [3, 4]])
+
+    assert str(operand) == "array:[[1.0, 2.0], [3.0, 4.0]]"
+    assert operand.inline is True
+    restored = ArrayOperand.parse(str(operand))
+    assert restored == operand
+    assert np.array_equal(restored.data, operand.data)
+
+
+def test_large_arrays_are_saved_as_digest_references() -> None:
+    operand = ArrayOperand(np.arange(100.0))
+
+    text = str(operand)
+    assert text == f"array:sha256={array_digest(operand.data)};shape=100"
+    assert len(text) < 40
+    reference = ArrayOperand.parse(text)
+    assert reference == operand
+    assert hash(reference) == hash(operand)
+    assert reference.shape == (100,)
+    with pytest.raises(ValidationError, match="not saved"):
+        reference.data
+
+
+def test_references_to_files_reload_and_check_the_digest(tmp_path: Path) -> None:
+    path = tmp_path / "m.npy"
+    np.save(path, np.eye(5))
+    text = str(load_array(path))
+    assert text.endswith(f";shape=5x5;source={path}")
+
+    reference = ArrayOperand.parse(text)
+    assert np.array_equal(reference.data, np.eye(5))
+
+    np.save(path, np.ones((5, 5)))
+    with pytest.raises(ValidationError, match="changed since it was recorded"):
+        ArrayOperand.parse(text).data
+
+
+def test_load_array_reads_csv_and_reports_errors(tmp_path: Path) -> None:
+    path = tmp_path / "v.csv"
+    path.write_text("1,2\n3,4\n", encoding="utf-8")
+
+    assert load_array(path).data.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    with pytest.raises(ValidationError, match="Cannot load array"):
+        load_array(tmp_path / "missing.npy")
+
+
+def test_to_array_and_equality(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(array_operands, "INLINE_ELEMENTS", 1)
+
+    assert to_array(2).ndim == 0
+    assert to_array(np.array([1, 2])).dtype == np.float64
+    assert to_array(ArrayOperand([1.0])).tolist() == [1.0]
+    assert ArrayOperand([1.0, 2.0]).inline is False
+    assert repr(ArrayOperand([1.0])) == "ArrayOperand(array:[1.0])"
+    assert (ArrayOperand([1.0]) == 1.0) is False
@@ -3,7 +3,7 @@ import datetime
 
 import pytest
 
-from app.calculation import Calculation
+from app.calculation import Calculation, Vector, parse_operand
 from app.exceptions import OperationError
 
 
@@ -142,3 +142,84 @@ def test_calculation_raise_invalid_root_fallback_branch() -> None:
 	with pytest.raises(OperationError, match="Invalid root operation"):
 		Calculation._raise_invalid_root(Decimal("4"), Decimal("-2"))
 
+
+
+@pytest.mark.parametrize(
+	"operation,a,b,expected",
+	[
+		("Addition", 2, 3, 5),
+		("Division", 9, 3, 3),
+		("Division", 1, 4, Decimal("0.25")),
+		("Power", 2, 10, Decimal("1024")),
+	],
+)
+def test_calculation_with_int_operands(operation: str, a: int, b: int, expected) -> None:
+	calc = Calculation(operation=operation, operand1=a, operand2=b)
+	assert calc.result == expected
+	assert calc.format_result() == str(expected)
+
+
+def test_calculation_with_float_operands() -> None:
+	calc = Calculation(operation="Multiplication", operand1=1.5, operand2=2.0)
+	assert calc.result == 3.0
+	assert calc.to_dict()["result"] == "3.0"
+
+
+def test_vector_round_trips_through_text() -> None:
+	vector = Vector([Decimal("1"), Decimal("2.5")])
+	assert str(vector) == "[1, 2.5]"
+	assert Vector.parse(str(vector)) == vector
+	assert Vector.parse(" [] ") == Vector()
+	assert parse_operand("[3]") == Vector([Decimal("3")])
+	assert parse_operand("3") == Decimal("3")
+
+
+@pytest.mark.parametrize(
+	"text, backend, expected",
+	[
+		("0.30000000000000004", "float", 0.30000000000000004),
+		("[1, 2.5]", "float", Vector([1.0, 2.5])),
+		("-12", "int", -12),
+		("2.5", "int", Decimal("2.5")),
+		("0.30000000000000004", "decimal", Decimal("0.30000000000000004")),
+	],
+)
+def test_parse_operand_reads_the_numeric_backend_type(text: str, backend: str, expected) -> None:
+	parsed = parse_operand(text, backend)
+	assert type(parsed) is type(expected)
+	assert repr(parsed) == repr(expected)
+
+
+def test_aggregate_calculation_round_trips_through_dict() -> None:
+	calc = Calculation(operation="DotProduct", operand1=Vector([Decimal("1"), Decimal("2")]), operand2=Vector([Decimal("3"), Decimal("4")]))
+	assert calc.result == Decimal("11")
+
+	data = calc.to_dict()
+	assert data["operand1"] == "[1, 2]"
+	assert Calculation.from_dict(data).result == Decimal("11")
+	assert Calculation.restore(data).operand2 == Vector([Decimal("3"), Decimal("4")])
+
+
+def test_calculation_runs_registered_binary_operations() -> None:
+	from app.operations import Operation, OperationFactory
+
+	class Hypotenuse(Operation):
+		def execute(self, a: Decimal, b: Decimal) -> Decimal:
+			return (a * a + b * b).sqrt()
+
+	OperationFactory.register_operation("hypot", Hypotenuse)
+	assert Calculation(operation="Hypotenuse", operand1=Decimal("3"), operand2=Decimal("4")).result == Decimal("5")
+
+
+def test_array_calculation_saves_a_digest_and_is_restored_without_recomputing() -> None:
+	from app.array_operands import ArrayOperand
+
+	big = ArrayOperand([float(value) for value in range(50)])
+	calc = Calculation(operation="VectorScale", operand1=big, operand2=Decimal("2"))
+	data = calc.to_dict()
+	assert data["result"].startswith("array:sha256=")
+
+	restored = Calculation.from_dict(data)
+	assert restored.result == calc.result
+	assert restored.operand1 == big
+	assert restored.operand2 == Decimal("2")
@@ -7,9 +7,11 @@ import pytest
 from app.calculation import Calculation
 from app.calculator import Calculator
 from app.calculator_config import CalculatorConfig
-from app.calculator_memento import CalculatorMemento
+from app.calculator_macros import Macro, MacroStep
+from app.calculator_memento import CalculatorMemento, write_memento_stacks
 from app.exceptions import OperationError, ValidationError
-from app.operations import Addition
+from app.history import LoggingObserver
+from app.operations import Addition, DotProduct, MatrixMultiply, Mean, OperationFactory, Power, Root, Sum, VectorScale
 
 
 class _Observer:
@@ -90,6 +92,64 @@ def test_set_operation_and_perform_operation_success(tmp_path: Path) -> None:
     assert len(calc.undo_stack) == 1
 
 
+@pytest.mark.parametrize(
+    "backend,expected_type",
+    [("decimal", Decimal), ("int", int), ("float", float)],
+)
+def test_perform_operation_uses_configured_numeric_backend(tmp_path: Path, backend: str, expected_type: type) -> None:
+    calc = Calculator(config=_config(tmp_path, numeric_backend=backend))
+    calc.set_operation(Addition())
+
+    result = calc.perform_operation("2", 3)
+
+    assert type(result) is expected_type
+    assert result == 5
+    assert calc.history[0].result == 5
+
+
+@pytest.mark.parametrize(
+    "backend,operation,expected",
+    [
+        ("decimal", Power(), Decimal("12157665459056928801")),
+        ("int", Power(), Decimal("12157665459056928801")),
+        ("float", Power(), 3.0**40),
+        ("float", Root(), 3.0 ** (1 / 40)),
+    ],
+)
+def test_power_and_root_results_match_history_in_every_backend(
+    tmp_path: Path, backend: str, operation, expected
+) -> None:
+    calc = Calculator(config=_config(tmp_path, numeric_backend=backend))
+    calc.set_operation(operation)
+
+    result = calc.perform_operation("3", "40")
+
+    assert result == expected
+    assert type(result) is type(expected)
+    assert calc.history[0].result == result
+    assert type(calc.history[0].result) is type(result)
+
+
+@pytest.mark.parametrize("backend, a, b, expected", [("float", "0.1", "0.2", 0.1 + 0.2), ("int", "7", "8", 15)])
+def test_reload_keeps_numeric_backend_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, backend: str, a: str, b: str, expected) -> None:
+    config = dict(numeric_backend=backend, max_history_size=10, persist_undo=True)
+    calc = Calculator(config=_config(tmp_path, **config))
+    calc.set_operation(Addition())
+    calc.perform_operation(a, b)
+    calc.perform_operation(a, b)
+    calc.save_history()
+    warnings = []
+    monkeypatch.setattr("app.calculation.logging.warning", lambda message, *args: warnings.append(message % args))
+
+    reloaded = Calculator(config=_config(tmp_path, **config))
+
+    assert [item.result for item in reloaded.history] == [expected, expected]
+    assert type(reloaded.history[0].result) is type(expected)
+    assert reloaded.undo() is True
+    assert type(reloaded.history[0].operand1) is type(expected)
+    assert warnings == []
+
+
 def test_perform_operation_requires_strategy(tmp_path: Path) -> None:
     calc = Calculator(config=_config(tmp_path))
     with pytest.raises(OperationError, match="No operation strategy set"):
@@ -152,6 +212,80 @@ def test_save_history_writes_empty_csv_with_headers(tmp_path: Path) -> None:
     assert list(df.columns) == ["operation", "operand1", "operand2", "result", "timestamp"]
 
 
+def test_save_history_appends_to_journal_between_checkpoints(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, checkpoint_every=3))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.save_history()
+    snapshot_mtime = calc.config.history_file.stat().st_mtime_ns
+
+    calc.perform_operation("2", "2")
+    calc.save_history()
+    calc.perform_operation("3", "3")
+    calc.save_history()
+
+    assert calc.config.history_file.stat().st_mtime_ns == snapshot_mtime
+    assert len(pd.read_csv(calc.config.history_journal_file)) == 2
+
+    calc.perform_operation("4", "4")
+    calc.save_history()
+
+    assert not calc.config.history_journal_file.exists()
+    assert pd.read_csv(calc.config.history_file)["result"].tolist() == [2, 4, 6, 8]
+
+
+def test_save_history_journals_first_calculation_after_empty_snapshot(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path))
+    calc.save_history()
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+
+    calc.save_history()
+
+    assert pd.read_csv(calc.config.history_file).empty
+    assert pd.read_csv(calc.config.history_journal_file)["result"].tolist() == [2]
+
+
+def test_save_history_after_undo_writes_full_snapshot(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.save_history()
+    calc.perform_operation("2", "2")
+    calc.save_history()
+
+    calc.undo()
+    calc.save_history()
+
+    reloaded = Calculator(config=_config(tmp_path, max_history_size=10))
+    assert [item.result for item in reloaded.history] == [Decimal("2")]
+
+
+def test_save_history_after_eviction_of_last_saved_writes_snapshot(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=1))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.save_history()
+    calc.perform_operation("2", "2")
+    calc.save_history()
+
+    assert not calc.config.history_journal_file.exists()
+    assert pd.read_csv(calc.config.history_file)["result"].tolist() == [4]
+
+
+def test_load_history_reads_snapshot_and_journal(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.save_history()
+    calc.perform_operation("2", "2")
+    calc.save_history()
+
+    reloaded = Calculator(config=_config(tmp_path, max_history_size=10))
+
+    assert [item.result for item in reloaded.history] == [Decimal("2"), Decimal("4")]
+
+
 def test_save_history_wraps_exceptions(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     calc = Calculator(config=_config(tmp_path))
     monkeypatch.setattr("pathlib.Path.mkdir", lambda *args, **kwargs: (_ for _ in ()).throw(OSError("denied")))
@@ -218,6 +352,56 @@ def test_get_history_dataframe_and_show_history_and_get_history(tmp_path: Path)
     assert copied[0] == calc.history[0]
 
 
+def test_history_view_tracks_calculator_mutations(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=5))
+    calc.set_operation(Addition())
+    view = calc.history_view()
+    calc.perform_operation("1", "1")
+
+    first = view[:1]
+    assert first[0] is calc.history[0]
+
+    for mutate in (lambda: calc.perform_operation("2", "2"), calc.undo, calc.redo, calc.clear_history):
+        snapshot = view[:]
+        mutate()
+        assert snapshot.stale
+        assert len(view) == len(calc.history)
+
+
+def test_undo_and_redo_transfer_lists_without_copying(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=5))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    live = calc.history
+    snapshot = calc.undo_stack[-1].history
+
+    calc.undo()
+
+    assert calc.history is snapshot
+    assert calc.redo_stack[-1].history is live
+
+
+def test_get_analytics_dataframe_is_cached_and_invalidated(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=5))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.perform_operation("2", "2")
+
+    frame = calc.get_analytics_dataframe()
+    assert calc.get_analytics_dataframe() is frame
+    assert frame["result"].tolist() == [2.0, 4.0]
+
+    calc.perform_operation("3", "3")
+    assert calc.get_analytics_dataframe()["result"].tolist() == [2.0, 4.0, 6.0]
+
+    calc.undo()
+    assert calc.get_analytics_dataframe()["result"].tolist() == [2.0, 4.0]
+    assert calc.get_analytics_dataframe(decimal=True)["result"].tolist() == [Decimal("2"), Decimal("4")]
+
+    calc.clear_history()
+    assert calc.get_analytics_dataframe().empty
+
+
 def test_clear_history_resets_all_stacks(tmp_path: Path) -> None:
     calc = Calculator(config=_config(tmp_path))
     calc.history = [Calculation(operation="Addition", operand1=Decimal("1"), operand2=Decimal("2"))]
@@ -251,6 +435,161 @@ def test_undo_and_redo_paths(tmp_path: Path) -> None:
     assert len(calc.history) == 2
 
 
+def test_undo_stack_respects_max_undo_depth(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_undo_depth=2))
+    calc.set_operation(Addition())
+    for value in ("1", "2", "3"):
+        calc.perform_operation(value, "1")
+
+    assert len(calc.undo_stack) == 2
+    assert calc.undo() is True
+    assert calc.undo() is True
+    assert calc.undo() is False
+
+
+def test_undo_memory_usage_reports_both_stacks(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_undo_depth=1))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.perform_operation("2", "2")
+    calc.undo()
+
+    usage = calc.undo_memory_usage()
+
+    assert usage["undo_entries"] == 0
+    assert usage["undo_bytes"] == 0
+    assert usage["undo_dropped_steps"] == 1
+    assert usage["redo_entries"] == 1
+    assert usage["redo_bytes"] == calc.redo_stack[0].memory_bytes()
+    assert usage["redo_merged_steps"] == 0
+
+
+def test_memory_report_counts_shared_calculations_once(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, result_cache_size=8))
+    calc.add_observer(LoggingObserver())
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.perform_operation("2", "2")
+    calc.undo()
+    calc.get_analytics_dataframe()
+
+    report = calc.memory_report()
+
+    assert (report.history_entries, report.undo_entries, report.redo_entries) == (1, 1, 1)
+    assert report.history_bytes > report.undo_bytes > 0
+    assert report.redo_bytes > 0
+    assert report.cache_bytes > calc._analytics_frames[False].memory_bytes() > 0
+    assert report.observer_bytes > 0
+    assert report.peak_bytes == report.total_bytes
+    calc.clear_history()
+    assert calc.memory_report().peak_bytes == report.total_bytes
+
+
+def test_memory_report_does_not_load_persisted_undo(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.perform_operation("2", "2")
+    calc.save_history()
+
+    restarted = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+    restarted.ensure_history_loaded()
+    before = restarted.memory_report().undo_bytes
+    restarted.undo_stack[-1].history
+
+    assert not restarted.undo_stack[0].loaded
+    assert restarted.memory_report().undo_bytes > before
+
+
+def test_memory_report_is_logged_every_n_calculations(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    events = []
+    monkeypatch.setattr("app.calculator.log_event", lambda event, **fields: events.append((event, fields)))
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, memory_report_every=2))
+    calc.set_operation(Addition())
+    for value in ("1", "2", "3", "4", "5"):
+        calc.perform_operation(value, "1")
+
+    reports = [fields for event, fields in events if event == "memory"]
+    assert [report["history_entries"] for report in reports] == [2, 4]
+    assert reports[-1]["peak_bytes"] >= reports[0]["total_bytes"]
+
+
+def test_crash_during_checkpoint_after_undo_keeps_undone_history(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, checkpoint_every=100))
+    calc.set_operation(Addition())
+    for value in ("1", "2", "3"):
+        calc.perform_operation(value, value)
+        calc.save_history()
+    calc.undo()
+
+    def crash(self, missing_ok=False):
+        raise OSError("crash")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Path, "unlink", crash)
+        with pytest.raises(OperationError):
+            calc.save_history()
+
+    reloaded = Calculator(config=_config(tmp_path, max_history_size=10))
+    assert [str(c.result) for c in reloaded.history] == ["2", "4"]
+
+
+def test_undo_state_persists_across_restarts(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.perform_operation("2", "2")
+    calc.perform_operation("3", "3")
+    calc.undo()
+    calc.save_history()
+
+    restarted = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+
+    assert [item.result for item in restarted.history] == [Decimal("2"), Decimal("4")]
+    assert len(restarted.undo_stack) == 2
+    assert len(restarted.redo_stack) == 1
+    assert not restarted.undo_stack[0].loaded
+
+    assert restarted.undo() is True
+    assert [item.result for item in restarted.history] == [Decimal("2")]
+    assert not restarted.undo_stack[0].loaded
+    assert restarted.redo() is True
+    assert restarted.redo() is True
+    assert [item.result for item in restarted.history] == [Decimal("2"), Decimal("4"), Decimal("6")]
+
+
+def test_undo_state_for_other_history_is_ignored(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.save_history()
+    write_memento_stacks(calc.config.undo_file, [CalculatorMemento([])], [], {"operation": "stale"})
+
+    restarted = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+
+    assert restarted.load_undo_state() is False
+    assert restarted.undo_stack == []
+
+
+@pytest.mark.parametrize("content", [b"not json\n", b"\xff\xfe\n", b"[1, 2]\n", b""])
+def test_unreadable_undo_state_keeps_the_history(tmp_path: Path, content: bytes, monkeypatch: pytest.MonkeyPatch) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.save_history()
+    calc.config.undo_file.write_bytes(content)
+    warnings = []
+    monkeypatch.setattr("app.calculator.logging.warning", warnings.append)
+
+    restarted = Calculator(config=_config(tmp_path, max_history_size=10, persist_undo=True))
+
+    assert [item.result for item in restarted.history] == [Decimal("2")]
+    assert restarted.undo_stack == []
+    assert calc.config.history_file.exists()
+    assert list(calc.config.history_dir.glob("*.corrupt*")) == []
+    assert any("Ignoring unreadable undo state" in message for message in warnings)
+
+
 def test_setup_logging_error_branch(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
     calc = object.__new__(Calculator)
     calc.config = _config(tmp_path)
@@ -262,3 +601,332 @@ def test_setup_logging_error_branch(monkeypatch: pytest.MonkeyPatch, tmp_path: P
 
     output = capsys.readouterr().out
     assert "Failed to set up logging" in output
+
+
+def _save_two(tmp_path: Path, **overrides) -> Calculator:
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, **overrides))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "1")
+    calc.perform_operation("2", "2")
+    calc.save_history()
+    return calc
+
+
+def test_lazy_history_load_defers_reading_until_history_is_used(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, history_load="lazy"))
+    assert calc.history_loaded is False
+
+    reads = []
+    original = calc.journal.read
+    monkeypatch.setattr(calc.journal, "read", lambda: reads.append(1) or original())
+    calc.set_operation(Addition())
+    assert calc.perform_operation("3", "3") == Decimal("6")
+    assert reads == []
+
+    assert [str(item.result) for item in calc.history] == ["2", "4", "6"]
+    assert calc.history_loaded is True
+    assert reads == [1]
+
+    assert calc.undo() is True
+    assert [str(item.result) for item in calc.history] == ["2", "4"]
+    assert calc.redo() is True
+    assert [str(item.result) for item in calc.history] == ["2", "4", "6"]
+
+
+def test_lazy_history_load_autosaves_without_loading_or_duplicating(tmp_path: Path) -> None:
+    from app.history import AutoSaveObserver
+
+    _save_two(tmp_path, checkpoint_every=100)
+    config = _config(tmp_path, max_history_size=5, history_load="lazy", auto_save=True, checkpoint_every=100)
+    calc = Calculator(config=config)
+    calc.add_observer(AutoSaveObserver(calc))
+    calc.set_operation(Addition())
+    calc.perform_operation("3", "3")
+
+    assert calc.history_loaded is False
+    assert pd.read_csv(config.history_journal_file)["result"].tolist() == [6]
+
+    assert [str(item.result) for item in calc.history] == ["2", "4", "6"]
+    calc.perform_operation("4", "4")
+    assert pd.read_csv(config.history_journal_file)["result"].tolist() == [6, 8]
+
+    reloaded = Calculator(config=_config(tmp_path, max_history_size=5))
+    assert [str(item.result) for item in reloaded.history] == ["2", "4", "6", "8"]
+
+
+def test_lazy_history_load_without_saved_history_checkpoints(tmp_path: Path) -> None:
+    config = _config(tmp_path, max_history_size=5, history_load="lazy")
+    calc = Calculator(config=config)
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "2")
+    calc.save_history()
+
+    assert calc.history_loaded is True
+    assert pd.read_csv(config.history_file)["result"].tolist() == [3]
+
+
+def test_background_history_load(tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, history_load="background"))
+
+    calc.ensure_history_loaded()
+
+    assert calc.history_loaded is True
+    assert [str(item.result) for item in calc.history] == ["2", "4"]
+    calc.ensure_history_loaded()
+    calc._run_history_load()
+
+
+def test_background_history_load_already_claimed_is_not_rerun(tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, history_load="lazy"))
+    calc._run_history_load()
+    future = calc._pending_load
+    calc._run_history_load()
+
+    assert future.done()
+    assert len(calc.history) == 2
+
+
+def test_lazy_history_load_failure_starts_empty(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, history_load="lazy"))
+    monkeypatch.setattr(calc.journal, "read", lambda: (_ for _ in ()).throw(OSError("unreadable")))
+
+    assert calc.history == []
+    assert calc.history_loaded is True
+
+
+def test_clear_history_cancels_pending_load(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, history_load="lazy"))
+    monkeypatch.setattr(calc.journal, "read", lambda: pytest.fail("history should not be read"))
+
+    calc.clear_history()
+
+    assert calc.history == []
+    assert calc.history_loaded is True
+
+
+def test_lazy_history_load_restores_persisted_undo_state(tmp_path: Path) -> None:
+    _save_two(tmp_path, persist_undo=True)
+    calc = Calculator(config=_config(tmp_path, max_history_size=5, history_load="lazy", persist_undo=True))
+
+    assert calc.undo() is True
+    assert [str(item.result) for item in calc.history] == ["2"]
+
+
+def test_unreadable_history_is_moved_aside_not_overwritten(tmp_path: Path) -> None:
+    config = _config(tmp_path)
+    config.history_dir.mkdir(parents=True, exist_ok=True)
+    config.history_file.write_text("operation,operand1\nAddition", encoding="utf-8")
+
+    calc = Calculator(config=config)
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "2")
+    calc.save_history()
+
+    kept = [path for path in config.history_dir.iterdir() if ".corrupt-" in path.name]
+    assert len(kept) == 1
+    assert kept[0].read_text(encoding="utf-8") == "operation,operand1\nAddition"
+    assert pd.read_csv(config.history_file)["result"].tolist() == [3]
+
+
+def test_unreadable_history_that_cannot_be_moved_is_logged(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    config = _config(tmp_path, max_history_size=5, history_load="lazy")
+    calc = Calculator(config=config)
+    monkeypatch.setattr(calc.journal, "read", lambda: (_ for _ in ()).throw(ValueError("garbled")))
+    monkeypatch.setattr(calc.journal, "quarantine", lambda: (_ for _ in ()).throw(OSError("read-only")))
+
+    assert calc.history == []
+    assert config.history_file.exists()
+
+
+def test_save_history_sync_forces_pending_fsync(tmp_path: Path) -> None:
+    calc = _save_two(tmp_path, durability="batch", fsync_every=100)
+    calc.perform_operation("3", "3")
+    calc.save_history()
+    assert calc.journal.durability.unsynced_saves == 1
+
+    calc.save_history(sync=True)
+
+    assert calc.journal.durability.unsynced_saves == 0
+
+
+def test_perform_aggregate_records_one_calculation(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path))
+    calc.set_operation(Mean())
+
+    assert calc.perform_aggregate(["1", "2", "3", "4"]) == Decimal("2.5")
+    calc.set_operation(DotProduct())
+    assert calc.perform_aggregate(["1", "2"], [3, 4]) == Decimal("11")
+
+    assert [str(item.operand1) for item in calc.history] == ["[1, 2, 3, 4]", "[1, 2]"]
+    assert len(calc.undo_stack) == 2
+    calc.undo()
+    assert len(calc.history) == 1
+
+    calc.save_history()
+    reloaded = Calculator(config=_config(tmp_path))
+    assert reloaded.history[0].result == Decimal("2.5")
+
+
+def test_perform_aggregate_uses_float_backend(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, numeric_backend="float"))
+    calc.set_operation(Sum())
+
+    assert calc.perform_aggregate(["0.1", "0.2", "0.3"]) == 0.6
+
+
+def test_perform_aggregate_errors(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path))
+    calc.set_operation(Addition())
+    with pytest.raises(OperationError, match="does not take operand lists"):
+        calc.perform_aggregate(["1"])
+
+    calc.set_operation(DotProduct())
+    with pytest.raises(OperationError, match="Input validation error: .*equal length"):
+        calc.perform_aggregate(["1", "2"], ["3"])
+    with pytest.raises(OperationError, match="Input validation error"):
+        calc.perform_aggregate(["1", "x"], ["3", "4"])
+
+    monkeypatch.setattr(calc, "_record", lambda calculation, started: (_ for _ in ()).throw(RuntimeError("disk")))
+    with pytest.raises(OperationError, match="Operation error: disk"):
+        calc.perform_aggregate(["1"], ["2"])
+    assert calc.history == []
+
+
+def test_perform_array_records_compact_history(tmp_path: Path) -> None:
+    import numpy as np
+
+    matrix = tmp_path / "m.npy"
+    np.save(matrix, np.eye(40))
+    calc = Calculator(config=_config(tmp_path))
+    calc.set_operation(MatrixMultiply())
+
+    result = calc.perform_array(str(matrix), np.arange(40))
+    assert result.data.tolist() == list(range(40))
+    calc.set_operation(VectorScale())
+    assert calc.perform_array([1, 2], "3").data.tolist() == [3.0, 6.0]
+    calc.save_history()
+
+    saved = pd.read_csv(calc.config.history_file)
+    assert saved["operand1"][0] == f"array:sha256={calc.history[0].operand1.digest};shape=40x40;source={matrix}"
+    assert saved["operand2"][1] == "3"
+    reloaded = Calculator(config=_config(tmp_path))
+    assert reloaded.history[0].result == result
+    assert reloaded.history[0].operand1.data.shape == (40, 40)
+
+
+def test_perform_array_errors(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path))
+    calc.set_operation(Addition())
+    with pytest.raises(OperationError, match="does not take array operands"):
+        calc.perform_array([1], [2])
+
+    calc.set_operation(MatrixMultiply())
+    with pytest.raises(OperationError, match="Input validation error: Cannot multiply"):
+        calc.perform_array([[1, 2]], [[1, 2]])
+
+    monkeypatch.setattr(calc, "_record", lambda calculation, started: (_ for _ in ()).throw(RuntimeError("disk")))
+    with pytest.raises(OperationError, match="Operation error: disk"):
+        calc.perform_array([1, 2], [3, 4])
+
+
+def test_calculator_registers_configured_plugins_without_importing_them(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(OperationFactory, "_plugins", {})
+    Calculator(config=_config(tmp_path, operation_plugins="gcd=not_imported_yet:Gcd"))
+
+    assert OperationFactory.plugin_names() == ["gcd"]
+    with pytest.raises(ValueError, match="Cannot load operation plugin gcd"):
+        OperationFactory.create_operation("gcd")
+
+
+@pytest.mark.parametrize("plugins", [{}, {"gcd": "not_importable_module:Gcd"}])
+def test_history_rows_of_unconfigured_plugins_keep_their_saved_results(plugins: dict, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10))
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "2")
+    calc.save_history()
+    rows = pd.read_csv(calc.config.history_file, dtype=str)
+    plugin_row = dict(rows.iloc[0], operation="Gcd", operand1="12", operand2="18", result="6")
+    pd.concat([rows, pd.DataFrame([plugin_row])]).to_csv(calc.config.history_file, index=False)
+    monkeypatch.setattr(OperationFactory, "_plugins", plugins)
+    warnings = []
+    monkeypatch.setattr("app.calculation.logging.warning", lambda message, *args: warnings.append(message % args))
+
+    reloaded = Calculator(config=_config(tmp_path, max_history_size=10))
+
+    assert [(item.operation, item.result) for item in reloaded.history] == [("Addition", Decimal("3")), ("Gcd", Decimal("6"))]
+    assert warnings == ["Operation Gcd is not available. Using saved result."]
+    assert list(calc.config.history_dir.glob("*.corrupt*")) == []
+
+
+def _scale_macro() -> Macro:
+    return Macro("scale", [MacroStep("add", "1"), MacroStep("multiply", "3")])
+
+
+def test_replay_macro_skips_history_by_default(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path))
+    seen = []
+    calc.add_observer(type("Spy", (), {"update": lambda self, calculation: seen.append(calculation)})())
+
+    assert calc.replay_macro(_scale_macro(), ["1", 2, "3.5"]) == [Decimal("6"), Decimal("9"), Decimal("13.5")]
+
+    assert calc.history == []
+    assert calc.undo_stack == []
+    assert seen == []
+
+
+def test_replay_macro_records_every_step_when_requested(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path, max_history_size=10))
+
+    assert calc.replay_macro(_scale_macro(), ["1", "2"], record=True) == [Decimal("6"), Decimal("9")]
+
+    assert [(item.operation, item.operand1, item.result) for item in calc.history] == [
+        ("Addition", Decimal("1"), Decimal("2")),
+        ("Multiplication", Decimal("2"), Decimal("6")),
+        ("Addition", Decimal("2"), Decimal("3")),
+        ("Multiplication", Decimal("3"), Decimal("9")),
+    ]
+    assert len(calc.undo_stack) == 4
+
+
+def test_replay_macro_errors_name_the_failing_input(tmp_path: Path) -> None:
+    calc = Calculator(config=_config(tmp_path))
+    shifted_root = Macro("shifted_root", [MacroStep("subtract", "2"), MacroStep("root", "2")])
+
+    with pytest.raises(OperationError, match=r"Macro shifted_root failed on input 2 \(1\)"):
+        calc.replay_macro(shifted_root, ["6", "1"])
+    with pytest.raises(OperationError, match="Input validation error"):
+        calc.replay_macro(shifted_root, ["6", "x"])
+    with pytest.raises(OperationError, match="Operation error: Unknown operation"):
+        calc.replay_macro(Macro("bad", [MacroStep("modulo", "2")]), ["1"])
+
+
+def test_reloaded_history_and_undo_snapshots_share_interned_calculations(tmp_path: Path) -> None:
+    config = _config(tmp_path, max_history_size=10, persist_undo=True, history_interning="calculations")
+    calc = Calculator(config=config)
+    calc.set_operation(Addition())
+    for _ in range(3):
+        calc.perform_operation("1.5", "1.5")
+    calc.save_history()
+
+    restarted = Calculator(config=config)
+
+    history = restarted.history
+    assert history[0].operand1 is history[1].operand2
+    assert history[0].result is history[1].result
+    assert restarted.undo_stack[-1].history[0] is history[0]
+    assert restarted.undo_stack[-1].history[1] is history[1]
+
+
+def test_loads_can_trust_audited_history(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _save_two(tmp_path)
+    monkeypatch.setattr(Calculation, "calculate", lambda self: pytest.fail("must not recompute"))
+
+    calc = Calculator(config=_config(tmp_path, verify_history=False))
+
+    assert len(calc.history) == 2
@@ -0,0 +1,64 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+import app.calculator
+from app.calculator import Calculator
+from app.calculator_cli import main
+from app.calculator_config import CalculatorConfig
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize(
+    "args, output",
+    [
+        (["add", "2", "3"], "5\n"),
+        (["DIVIDE", "1", "4"], "0.25\n"),
+        (["power", "2", "10"], "1024\n"),
+    ],
+)
+def test_one_shot_prints_result(args: list, output: str, capsys) -> None:
+    assert main(args) == 0
+    assert capsys.readouterr().out == output
+
+
+@pytest.mark.parametrize(
+    "args, status, message",
+    [
+        (["divide", "1", "0"], 1, "Operation failed: Division by zero is not allowed"),
+        (["add", "x", "1"], 1, "Operation failed: Invalid number format: x"),
+        (["nope", "1", "2"], 2, "Unknown operation: nope"),
+        (["sum", "1", "2"], 2, "sum does not take two numbers"),
+        (["add", "1"], 2, "Usage: python -m app.calculator_repl"),
+    ],
+)
+def test_one_shot_errors(args: list, status: int, message: str, capsys) -> None:
+    assert main(args) == status
+    assert message in capsys.readouterr().err
+
+
+def test_one_shot_saves_only_when_asked(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    monkeypatch.setattr(app.calculator, "Calculator", lambda: Calculator(config=config))
+
+    assert main(["multiply", "2", "3"]) == 0
+    assert not config.history_file.exists()
+
+    assert main(["multiply", "2", "3", "--save"]) == 0
+    assert capsys.readouterr().out == "6\n6\n"
+    assert len(Calculator(config=config).history) == 1
+
+
+def test_module_runs_one_shot_without_heavy_imports() -> None:
+    completed = subprocess.run(
+        [sys.executable, "-m", "app.calculator_repl", "subtract", "10", "4.5"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=False,
+    )
+    assert (completed.returncode, completed.stdout) == (0, "5.5\n")
+
+    probe = "import sys; from app.calculator_cli import main; main(['add', '1', '1']); print(sorted({'pandas', 'numpy', 'app.calculator'} & set(sys.modules)))"
+    completed = subprocess.run([sys.executable, "-c", probe], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert completed.stdout.splitlines() == ["2", "[]"]
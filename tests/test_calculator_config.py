@@ -20,6 +20,26 @@ def test_config_uses_defaults_when_not_provided(monkeypatch: pytest.MonkeyPatch,
     monkeypatch.delenv("CALCULATOR_PRECISION", raising=False)
     monkeypatch.delenv("CALCULATOR_MAX_INPUT_VALUE", raising=False)
     monkeypatch.delenv("CALCULATOR_DEFAULT_ENCODING", raising=False)
+    monkeypatch.delenv("CALCULATOR_NUMERIC_BACKEND", raising=False)
+    monkeypatch.delenv("CALCULATOR_MAX_UNDO_DEPTH", raising=False)
+    monkeypatch.delenv("CALCULATOR_MAX_UNDO_BYTES", raising=False)
+    monkeypatch.delenv("CALCULATOR_CHECKPOINT_EVERY", raising=False)
+    monkeypatch.delenv("CALCULATOR_CHECKPOINT_SECONDS", raising=False)
+    monkeypatch.delenv("CALCULATOR_PERSIST_UNDO", raising=False)
+    monkeypatch.delenv("CALCULATOR_HISTORY_PARTITION", raising=False)
+    monkeypatch.delenv("CALCULATOR_HISTORY_RETENTION_DAYS", raising=False)
+    for name in ("LEVEL", "MAX_BYTES", "BACKUP_COUNT", "ROTATE_SECONDS", "SAMPLE_RATE"):
+        monkeypatch.delenv(f"CALCULATOR_LOG_{name}", raising=False)
+    monkeypatch.delenv("CALCULATOR_EVENT_LOG", raising=False)
+    monkeypatch.delenv("CALCULATOR_OPERATION_PLUGINS", raising=False)
+    monkeypatch.delenv("CALCULATOR_HISTORY_INTERNING", raising=False)
+    monkeypatch.delenv("CALCULATOR_VERIFY_HISTORY", raising=False)
+    monkeypatch.delenv("CALCULATOR_MEMORY_REPORT_EVERY", raising=False)
+    monkeypatch.delenv("CALCULATOR_HISTORY_LOAD", raising=False)
+    monkeypatch.delenv("CALCULATOR_DURABILITY", raising=False)
+    monkeypatch.delenv("CALCULATOR_FSYNC_EVERY", raising=False)
+    monkeypatch.delenv("CALCULATOR_FSYNC_INTERVAL_MS", raising=False)
+    monkeypatch.delenv("CALCULATOR_RESULT_CACHE_SIZE", raising=False)
 
     config = CalculatorConfig()
 
@@ -29,6 +49,29 @@ def test_config_uses_defaults_when_not_provided(monkeypatch: pytest.MonkeyPatch,
     assert config.precision == 10
     assert config.max_input_value == Decimal("1E+999")
     assert config.default_encoding == "utf-8"
+    assert config.numeric_backend == "decimal"
+    assert config.max_undo_depth == 100
+    assert config.max_undo_bytes == 16 * 1024 * 1024
+    assert config.checkpoint_every == 100
+    assert config.checkpoint_seconds == 300
+    assert config.persist_undo is False
+    assert config.history_partition == "none"
+    assert config.history_retention_days == 0
+    assert config.log_level == "INFO"
+    assert config.log_max_bytes == 10 * 1024 * 1024
+    assert config.log_backup_count == 5
+    assert config.log_rotate_seconds == 0
+    assert config.log_sample_rate == 1
+    assert config.event_log is False
+    assert config.operation_plugin_specs == {}
+    assert config.history_interning == "values"
+    assert config.verify_history is True
+    assert config.memory_report_every == 0
+    assert config.history_load == "eager"
+    assert config.durability == "always"
+    assert config.fsync_every == 10
+    assert config.fsync_interval_ms == 1000
+    assert config.result_cache_size == 0
 
 
 def test_config_honors_explicit_values_over_environment(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -73,6 +116,12 @@ def test_config_path_properties_use_environment_overrides(monkeypatch: pytest.Mo
     assert config.history_dir == (tmp_path / "custom_history").resolve()
     assert config.history_file == (tmp_path / "custom_history" / "h.csv").resolve()
     assert config.log_file == (tmp_path / "custom_logs" / "c.log").resolve()
+    assert config.undo_file == (tmp_path / "custom_history" / "calculator_undo.jsonl").resolve()
+    assert config.history_journal_file == (tmp_path / "custom_history" / "h.csv.journal").resolve()
+    assert config.history_partition_dir == (tmp_path / "custom_history" / "partitions").resolve()
+    assert config.event_log_file == (tmp_path / "custom_logs" / "calculator_events.jsonl").resolve()
+    assert config.result_cache_file == (tmp_path / "custom_history" / "calculator_results.sqlite3").resolve()
+    assert config.macro_file == (tmp_path / "custom_history" / "calculator_macros.json").resolve()
 
 
 @pytest.mark.parametrize(
@@ -81,6 +130,28 @@ def test_config_path_properties_use_environment_overrides(monkeypatch: pytest.Mo
         ({"max_history_size": 0}, "max_history_size must be positive"),
         ({"precision": 0}, "precision must be positive"),
         ({"max_input_value": Decimal("0")}, "max_input_value must be positive"),
+        ({"numeric_backend": "complex"}, "numeric_backend must be one of"),
+        ({"max_undo_depth": 0}, "max_undo_depth must be positive"),
+        ({"max_undo_bytes": -1}, "max_undo_bytes must be positive"),
+        ({"checkpoint_every": 0}, "checkpoint_every must be positive"),
+        ({"checkpoint_seconds": 0}, "checkpoint_seconds must be positive"),
+        ({"history_partition": "week"}, "history_partition must be one of"),
+        ({"history_retention_days": -1}, "history_retention_days must not be negative"),
+        ({"history_load": "never"}, "history_load must be one of"),
+        ({"durability": "sometimes"}, "durability must be one of"),
+        ({"fsync_every": 0}, "fsync_every must be positive"),
+        ({"fsync_interval_ms": 0}, "fsync_interval_ms must be positive"),
+        ({"result_cache_size": -1}, "result_cache_size must not be negative"),
+        ({"log_level": "chatty"}, "log_level is not a logging level"),
+        ({"log_max_bytes": -1}, "log_max_bytes must not be negative"),
+        ({"log_backup_count": -1}, "log_backup_count must not be negative"),
+        ({"log_rotate_seconds": -1}, "log_rotate_seconds must not be negative"),
+        ({"log_backup_count": 0}, "log_backup_count must be at least 1 when log rotation is enabled"),
+        ({"log_backup_count": 0, "log_max_bytes": 0, "log_rotate_seconds": 60}, "log_backup_count must be at least 1"),
+        ({"log_sample_rate": 0}, "log_sample_rate must be positive"),
+        ({"memory_report_every": -1}, "memory_report_every must not be negative"),
+        ({"history_interning": "weak"}, "history_interning must be one of"),
+        ({"operation_plugins": "modulus=my_ops"}, "operation_plugins entries must look like name=module:Class"),
     ],
 )
 def test_config_validation_errors(kwargs: dict, expected: str, tmp_path: Path) -> None:
@@ -112,3 +183,23 @@ def test_config_validation_error_for_empty_default_encoding_from_env(
             max_input_value=Decimal("1"),
             default_encoding=None,
         )
+
+
+def test_config_numeric_backend_from_env_is_case_insensitive(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("CALCULATOR_BASE_DIR", str(tmp_path))
+    monkeypatch.setenv("CALCULATOR_NUMERIC_BACKEND", "FLOAT")
+    assert CalculatorConfig().numeric_backend == "float"
+
+
+def test_config_parses_operation_plugins(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("CALCULATOR_OPERATION_PLUGINS", " modulus = my_ops.maths:Modulus,, gcd=my_ops:Gcd ")
+
+    config = CalculatorConfig(base_dir=tmp_path)
+
+    assert config.operation_plugin_specs == {"modulus": "my_ops.maths:Modulus", "gcd": "my_ops:Gcd"}
+
+
+def test_config_allows_no_log_backups_without_rotation(tmp_path: Path) -> None:
+    config = CalculatorConfig(base_dir=tmp_path, log_backup_count=0, log_max_bytes=0, log_rotate_seconds=0)
+
+    assert config.log_backup_count == 0
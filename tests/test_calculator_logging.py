@@ -0,0 +1,197 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.calculator_logging import (
+    EVENT_LOGGER,
+    SAMPLE_CALCULATION,
+    RotatingLogHandler,
+    SamplingFilter,
+    configure_logging,
+    log_event,
+)
+from app.exceptions import OperationError
+from app.history import LoggingObserver
+from app.operations import Addition
+
+
+CONFIG_DEFAULTS = {"max_history_size": 10}
+
+
+def _record(message: str, sample: str = None) -> logging.LogRecord:
+    record = logging.LogRecord("root", logging.INFO, __file__, 1, message, None, None)
+    if sample is not None:
+        record.sample = sample
+    return record
+
+
+@pytest.fixture(autouse=True)
+def _restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    for handler in EVENT_LOGGER.handlers[:]:
+        EVENT_LOGGER.removeHandler(handler)
+        handler.close()
+    EVENT_LOGGER.setLevel(logging.CRITICAL + 1)
+    for handler in root.handlers:
+        if handler not in handlers:
+            handler.close()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_sampling_filter_keeps_one_in_n_and_counts_the_rest() -> None:
+    sampler = SamplingFilter(rate=3)
+
+    passed = [sampler.filter(_record(f"calc {i}", SAMPLE_CALCULATION)) for i in range(7)]
+
+    assert passed == [True, False, False, True, False, False, True]
+    assert sampler.stats() == {SAMPLE_CALCULATION: {"seen": 7, "suppressed": 4}}
+
+
+def test_sampling_filter_notes_suppressed_records_on_the_next_kept_one() -> None:
+    sampler = SamplingFilter(rate=2)
+    sampler.filter(_record("first", "save"))
+    sampler.filter(_record("second", "save"))
+    kept = _record("third", "save")
+
+    assert sampler.filter(kept) is True
+    assert kept.getMessage() == "third [1 similar suppressed]"
+
+
+def test_sampling_filter_passes_unsampled_records_and_rate_one() -> None:
+    assert SamplingFilter(rate=5).filter(_record("plain")) is True
+    sampler = SamplingFilter(rate=1)
+    assert all(sampler.filter(_record("hot", "save")) for _ in range(3))
+    assert sampler.stats() == {}
+
+
+def test_rotating_handler_rolls_over_by_size(tmp_path: Path) -> None:
+    log_file = tmp_path / "calc.log"
+    handler = RotatingLogHandler(str(log_file), max_bytes=100, backup_count=2, interval=0)
+    try:
+        for i in range(20):
+            handler.emit(_record(f"message number {i:04d} " + "x" * 20))
+    finally:
+        handler.close()
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == ["calc.log", "calc.log.1", "calc.log.2"]
+    assert all(path.stat().st_size <= 100 for path in tmp_path.iterdir())
+
+
+def test_rotating_handler_rolls_over_by_time(tmp_path: Path) -> None:
+    log_file = tmp_path / "calc.log"
+    handler = RotatingLogHandler(str(log_file), max_bytes=0, backup_count=1, interval=60)
+    try:
+        handler.emit(_record("before"))
+        assert not handler.shouldRollover(_record("soon"))
+        handler.rollover_at -= 61
+        handler.emit(_record("after"))
+    finally:
+        handler.close()
+
+    assert "before" in (tmp_path / "calc.log.1").read_text(encoding="utf-8")
+    assert "after" in log_file.read_text(encoding="utf-8")
+    assert handler.rollover_at > handler.interval
+
+
+def test_configure_logging_applies_level_and_sampling(config_factory) -> None:
+    config = config_factory(log_level="warning", log_sample_rate=2)
+    config.log_dir.mkdir(parents=True, exist_ok=True)
+
+    sampler = configure_logging(config)
+    logging.info("hidden by level")
+    logging.warning("hot %s", 1, extra={"sample": SAMPLE_CALCULATION})
+    logging.warning("hot %s", 2, extra={"sample": SAMPLE_CALCULATION})
+    logging.warning("hot %s", 3, extra={"sample": SAMPLE_CALCULATION})
+    logging.getLogger().handlers[0].flush()
+
+    text = config.log_file.read_text(encoding="utf-8")
+    assert "hidden by level" not in text
+    assert "hot 1" in text and "hot 2" not in text
+    assert "hot 3 [1 similar suppressed]" in text
+    assert sampler.suppressed[SAMPLE_CALCULATION] == 1
+
+
+def test_calculator_samples_hot_path_logs(config_factory) -> None:
+    calc = Calculator(config=config_factory(log_sample_rate=10))
+    calc.add_observer(LoggingObserver())
+    calc.set_operation(Addition())
+    for value in range(10):
+        calc.perform_operation(str(value), "1")
+
+    assert calc.log_sampler.stats()[SAMPLE_CALCULATION] == {"seen": 10, "suppressed": 9}
+    logging.getLogger().handlers[0].flush()
+    assert calc.config.log_file.read_text(encoding="utf-8").count("Calculation performed") == 1
+
+
+def _events(config: CalculatorConfig) -> list:
+    for handler in EVENT_LOGGER.handlers:
+        handler.flush()
+    lines = config.event_log_file.read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_event_log_records_calculations_errors_undo_redo_and_saves(config_factory) -> None:
+    calc = Calculator(config=config_factory(event_log=True))
+    calc.set_operation(Addition())
+    calc.perform_operation("2", "3")
+    with pytest.raises(OperationError):
+        calc.perform_operation("two", "3")
+    calc.save_history()
+    calc.save_history()
+    calc.undo()
+    calc.redo()
+
+    events = _events(calc.config)
+
+    assert [event["event"] for event in events] == ["calculation", "error", "save", "save", "undo", "redo"]
+    calculation, error, checkpoint, unchanged, undo, redo = events
+    assert calculation["calculation"] == calc.history[0].to_dict()
+    assert calculation["history_size"] == 1
+    assert error["level"] == "ERROR"
+    assert error["source"] == "perform_operation"
+    assert error["error_type"] == "ValidationError"
+    assert checkpoint["mode"] == "checkpoint" and checkpoint["rows"] == 1
+    assert checkpoint["path"] == str(calc.config.history_file)
+    assert unchanged["mode"] == "unchanged" and unchanged["rows"] == 0
+    assert undo["history_size"] == 0 and undo["redo_depth"] == 1
+    assert redo["history_size"] == 1 and redo["undo_depth"] == 1
+    assert all(event["duration_ms"] >= 0 for event in (calculation, error, checkpoint, undo, redo))
+    assert "Calculation performed" not in calc.config.event_log_file.read_text(encoding="utf-8")
+
+
+def test_event_log_is_off_by_default_and_serializes_nothing(config_factory) -> None:
+    calc = Calculator(config=config_factory())
+
+    class Exploding:
+        def to_dict(self):
+            raise AssertionError("serialized a dropped event")
+
+    log_event("calculation", calculation=Exploding())
+
+    assert EVENT_LOGGER.handlers == []
+    assert not calc.config.event_log_file.exists()
+
+
+def test_event_log_records_failed_saves_and_loads(config_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    calc = Calculator(config=config_factory(event_log=True))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk gone")
+
+    monkeypatch.setattr(calc.journal, "checkpoint", fail)
+    monkeypatch.setattr(calc.journal, "exists", fail)
+    with pytest.raises(OperationError):
+        calc.save_history()
+    with pytest.raises(OperationError):
+        calc.load_history()
+
+    errors = [(event["source"], event["message"]) for event in _events(calc.config)]
+    assert errors == [("save_history", "disk gone"), ("load_history", "disk gone")]
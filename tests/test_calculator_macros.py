@@ -0,0 +1,85 @@
+from decimal import Decimal
+import os
+from pathlib import Path
+import stat
+
+import pytest
+
+from app.calculator_config import CalculatorConfig
+from app.calculator_macros import Macro, MacroRecorder, MacroStep, MacroStore, read_inputs
+from app.exceptions import OperationError, ValidationError
+
+
+def _macro() -> Macro:
+    return Macro("scale", [MacroStep("add", "1"), MacroStep("multiply", "3"), MacroStep("root", "2")])
+
+
+def test_compiled_macro_chains_results(tmp_path: Path) -> None:
+    run = _macro().compile(CalculatorConfig(base_dir=tmp_path))
+
+    assert run(Decimal("2")) == Decimal("3")
+    assert run(Decimal("11")) == Decimal("6")
+    assert str(_macro()) == "add 1 -> multiply 3 -> root 2"
+
+
+def test_compile_validates_steps_once(tmp_path: Path) -> None:
+    config = CalculatorConfig(base_dir=tmp_path)
+
+    with pytest.raises(ValidationError, match="Invalid number format"):
+        Macro("bad", [MacroStep("add", "x")]).compile(config)
+    with pytest.raises(ValueError, match="Unknown operation"):
+        Macro("bad", [MacroStep("modulo", "2")]).compile(config)
+
+
+def test_recorder_feeds_results_forward() -> None:
+    recorder = MacroRecorder("double")
+
+    recorder.record("multiply", "2", Decimal("8"))
+
+    assert recorder.macro == Macro("double", [MacroStep("multiply", "2")])
+    assert recorder.last_result == Decimal("8")
+
+
+def test_store_saves_lists_and_deletes_macros(tmp_path: Path) -> None:
+    store = MacroStore(tmp_path / "macros" / "m.json")
+    assert store.load() == {}
+
+    store.save(_macro())
+    store.save(Macro("inc", [MacroStep("add", "1")]))
+
+    assert MacroStore(store.path).names() == ["inc", "scale"]
+    assert store.get("scale") == _macro()
+    assert store.delete("inc") is True
+    assert store.delete("inc") is False
+    assert store.names() == ["scale"]
+    assert [path.name for path in store.path.parent.iterdir()] == ["m.json"]
+    os.chmod(store.path, 0o640)
+    store.delete("scale")
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o640
+    store.save(_macro())
+    with pytest.raises(OperationError, match="Unknown macro: inc"):
+        store.get("inc")
+
+
+def test_store_reports_unreadable_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = MacroStore(tmp_path / "m.json")
+    store.path.write_text("{not json", encoding="utf-8")
+    with pytest.raises(OperationError, match="Failed to read macros"):
+        store.load()
+
+    store.path.write_text('{"x": {"name": "x"}}', encoding="utf-8")
+    with pytest.raises(OperationError, match="Invalid macro data"):
+        store.load()
+
+    store.path.unlink()
+    monkeypatch.setattr("app.calculator_macros.json.dump", lambda *args, **kwargs: (_ for _ in ()).throw(OSError("full")))
+    with pytest.raises(OSError, match="full"):
+        store.save(_macro())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_read_inputs_splits_on_commas_and_whitespace(tmp_path: Path) -> None:
+    path = tmp_path / "inputs.txt"
+    path.write_text("1, 2\n3\t4\n\n5,", encoding="utf-8")
+
+    assert read_inputs(path) == ["1", "2", "3", "4", "5"]
@@ -1,9 +1,21 @@
 import datetime
+import json
+import os
+import stat
+from decimal import Decimal
 
 import pytest
 
 from app.calculation import Calculation
-from app.calculator_memento import CalculatorMemento
+from app.calculator_memento import (
+	CalculatorMemento,
+	LazyMemento,
+	MementoStack,
+	read_memento_stacks,
+	write_memento_stacks,
+)
+from app.exceptions import OperationError
+from app.history_interning import InternPool
 
 
 def test_memento_from_dict_rehydrates_history(
@@ -13,8 +25,9 @@ def test_memento_from_dict_rehydrates_history(
 ) -> None:
 	captured_calls = []
 
-	def fake_from_dict(item: dict) -> Calculation:
+	def fake_from_dict(item: dict, backend: str) -> Calculation:
 		captured_calls.append(item)
+		assert backend == "decimal"
 		return calc_factory()
 
 	monkeypatch.setattr(Calculation, "from_dict", staticmethod(fake_from_dict), raising=False)
@@ -41,3 +54,248 @@ def test_memento_to_dict_serializes_history(calc_factory) -> None:
 	assert payload["history"][0]["operation"] == "Addition"
 	assert "timestamp" in payload
 
+
+
+def _mementos(count: int, size: int = 1) -> list:
+	return [CalculatorMemento([None] * size) for _ in range(count)]
+
+
+def test_memento_memory_bytes_grows_with_history_length() -> None:
+	assert CalculatorMemento([None] * 100).memory_bytes() > CalculatorMemento([]).memory_bytes()
+
+
+def test_memento_stack_without_limits_behaves_like_list() -> None:
+	items = _mementos(3)
+	stack = MementoStack(items)
+
+	assert stack == items
+	assert stack.memory_bytes() == sum(item.memory_bytes() for item in items)
+	assert stack.pop() is items[2]
+	assert stack.memory_bytes() == sum(item.memory_bytes() for item in items[:2])
+	stack.clear()
+	assert stack == []
+	assert stack.memory_bytes() == 0
+
+
+def test_memento_stack_keeps_sizes_in_step_with_every_list_mutation() -> None:
+	items = [CalculatorMemento([None] * (10 * size)) for size in range(6)]
+	stack = MementoStack(items[:3])
+
+	def check() -> None:
+		assert stack.memory_bytes() == sum(item.memory_bytes() for item in stack)
+
+	stack.insert(0, items[3])
+	check()
+	stack[1] = items[4]
+	check()
+	stack[1:3] = iter([items[5]])
+	check()
+	del stack[0]
+	check()
+	stack.remove(items[5])
+	check()
+	stack += [items[1], items[4]]
+	check()
+	stack.reverse()
+	check()
+	stack.sort(key=lambda item: len(item.history))
+	assert [len(item.history) for item in stack] == [10, 20, 40]
+	check()
+	stack *= 2
+	check()
+	stack *= 0
+	assert stack == [] and stack.memory_bytes() == 0
+
+
+def test_memento_stack_limits_apply_to_insert_and_assignment() -> None:
+	items = _mementos(4)
+	stack = MementoStack(items[:2], max_depth=2)
+
+	stack.insert(1, items[2])
+	assert stack == [items[2], items[1]]
+	stack[0:1] = items[:2]
+	assert len(stack) == 2 and stack.dropped_steps == 2
+
+
+def test_memento_stack_drops_oldest_beyond_max_depth() -> None:
+	items = _mementos(5)
+	stack = MementoStack(items, max_depth=3)
+
+	assert stack == items[2:]
+	assert stack.dropped_steps == 2
+
+
+def test_memento_stack_merges_older_steps_beyond_max_bytes() -> None:
+	items = _mementos(8)
+	budget = sum(item.memory_bytes() for item in items[:6])
+	stack = MementoStack(max_bytes=budget)
+	for item in items:
+		stack.append(item)
+
+	assert stack.memory_bytes() <= budget
+	assert stack[-1] is items[-1]
+	assert stack[0] is items[0]
+	assert stack.merged_steps > 0
+	assert stack.memory_bytes() == sum(item.memory_bytes() for item in stack)
+
+
+def test_memento_stack_drops_entries_larger_than_budget() -> None:
+	small, large = CalculatorMemento([]), CalculatorMemento([None] * 1000)
+	stack = MementoStack([small, small, small], max_bytes=large.memory_bytes() - 1)
+	stack.append(large)
+
+	assert stack == []
+	assert stack.merged_steps + stack.dropped_steps == 4
+
+
+def test_calculation_restore_skips_recomputation(monkeypatch: pytest.MonkeyPatch, raw_calc_payload: dict) -> None:
+	monkeypatch.setattr(Calculation, "calculate", lambda self: pytest.fail("must not recompute"))
+	memento = CalculatorMemento.from_dict(
+		{"history": [dict(raw_calc_payload, result="4")], "timestamp": "2026-01-01T12:00:00"},
+		verify=False,
+	)
+	assert memento.history[0].result == Decimal("4")
+
+
+def test_calculation_restore_rejects_invalid_payload(raw_calc_payload: dict) -> None:
+	with pytest.raises(OperationError, match="Invalid data for restoring"):
+		Calculation.restore(dict(raw_calc_payload, operand1="x"))
+
+
+def test_write_and_read_memento_stacks_round_trip(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	undo = [CalculatorMemento([]), CalculatorMemento([calc_factory()])]
+	redo = [CalculatorMemento([calc_factory(operand1="5")])]
+	tip = {"result": "3"}
+
+	write_memento_stacks(path, undo, redo, tip)
+	loaded_undo, loaded_redo = read_memento_stacks(path, tip)
+
+	assert all(isinstance(item, LazyMemento) and not item.loaded for item in loaded_undo + loaded_redo)
+	assert loaded_redo[0].history == redo[0].history
+	assert loaded_redo[0].loaded
+	assert not loaded_undo[1].loaded
+	assert loaded_undo[1].history == undo[1].history
+	assert loaded_undo[0].history == []
+	assert loaded_undo[0].timestamp == undo[0].timestamp
+	assert read_memento_stacks(path, {"result": "other"}) is None
+	assert read_memento_stacks(tmp_path / "missing.jsonl", tip) is None
+
+
+def test_saving_memento_stacks_appends_only_new_entries(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	kept = CalculatorMemento([calc_factory()])
+	write_memento_stacks(path, [kept], [], None)
+	(lazy,), _ = read_memento_stacks(path, None)
+	before = path.read_bytes()
+
+	write_memento_stacks(path, [kept, lazy, CalculatorMemento([])], [], None)
+
+	assert path.read_bytes().startswith(before)
+	assert path.stat().st_size - len(before) < 2 * len(before)
+	assert not lazy.loaded
+	assert lazy.history == [calc_factory()]
+	undo, _ = read_memento_stacks(path, None)
+	assert [item.history for item in undo] == [[calc_factory()], [calc_factory()], []]
+	assert [item.name for item in tmp_path.iterdir()] == ["undo.jsonl"]
+
+
+def test_memento_stacks_are_compacted_when_mostly_unreferenced(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	other = tmp_path / "other.jsonl"
+	mementos = [CalculatorMemento([calc_factory()] * 5) for _ in range(4)]
+	write_memento_stacks(path, mementos, [], None)
+	write_memento_stacks(other, [CalculatorMemento([calc_factory(operand1="5")])], [], None)
+	(foreign,), _ = read_memento_stacks(other, None)
+	full = path.stat().st_size
+	os.chmod(path, 0o640)
+
+	write_memento_stacks(path, [mementos[-1], foreign], [], None)
+
+	assert path.stat().st_size < full
+	assert stat.S_IMODE(path.stat().st_mode) == 0o640
+	assert not foreign.loaded and foreign.path == path
+	undo, _ = read_memento_stacks(path, None)
+	assert [item.history for item in undo] == [[calc_factory()] * 5, [calc_factory(operand1="5")]]
+
+
+def test_reading_memento_stacks_skips_an_interrupted_append(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	memento = CalculatorMemento([calc_factory()])
+	write_memento_stacks(path, [memento], [], None)
+	with open(path, "ab") as handle:
+		handle.write(b'{"history": []}\n{"undo": 2, "offsets": [0, ')
+
+	undo, _ = read_memento_stacks(path, None)
+	assert [item.history for item in undo] == [[calc_factory()]]
+
+	write_memento_stacks(path, [memento, CalculatorMemento([])], [], None)
+	assert path.read_bytes().endswith(b"\n")
+	assert [item.history for item in read_memento_stacks(path, None)[0]] == [[calc_factory()], []]
+
+
+def test_reading_memento_stacks_without_lengths(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	line = json.dumps(CalculatorMemento([calc_factory()]).to_dict()).encode("utf-8") + b"\n"
+	index = {"undo": 1, "redo": 1, "tip": None, "offsets": [0, len(line)], "end": 2 * len(line)}
+	path.write_bytes(line + line + json.dumps(index).encode("utf-8") + b"\n")
+
+	undo, redo = read_memento_stacks(path, None)
+
+	assert undo[0].history == redo[0].history == [calc_factory()]
+
+
+def test_reading_memento_stacks_rejects_a_file_without_an_index(tmp_path) -> None:
+	path = tmp_path / "undo.jsonl"
+	path.write_bytes(b"not json\n")
+
+	with pytest.raises(ValueError):
+		read_memento_stacks(path, None)
+
+
+def test_lazy_memento_memory_bytes_and_read_errors(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	write_memento_stacks(path, [CalculatorMemento([calc_factory()])], [], None)
+	(lazy,), _ = read_memento_stacks(path, None)
+	unloaded = lazy.memory_bytes()
+	stack = MementoStack([lazy])
+
+	assert lazy.history
+	assert lazy.memory_bytes() > unloaded
+	assert stack.memory_bytes() == unloaded
+	stack.pop()
+	assert stack.memory_bytes() == 0
+
+	path.unlink()
+	(other,) = [LazyMemento(path, 0, 10)]
+	with pytest.raises(OperationError, match="Failed to read undo state"):
+		other.history
+
+
+def test_write_memento_stacks_removes_temp_file_on_failure(tmp_path) -> None:
+	class Broken(CalculatorMemento):
+		def to_dict(self):
+			raise RuntimeError("cannot serialize")
+
+	with pytest.raises(RuntimeError):
+		write_memento_stacks(tmp_path / "undo.jsonl", [Broken([])], [], None)
+	assert list(tmp_path.iterdir()) == []
+
+
+def test_memento_stacks_round_trip_when_empty(tmp_path) -> None:
+	path = tmp_path / "undo.jsonl"
+	write_memento_stacks(path, [], [], None)
+	assert read_memento_stacks(path, None) == ([], [])
+
+
+def test_lazy_mementos_share_calculations_through_a_pool(tmp_path, calc_factory) -> None:
+	path = tmp_path / "undo.jsonl"
+	first, second = calc_factory(), calc_factory(operand1="5")
+	write_memento_stacks(path, [CalculatorMemento([first]), CalculatorMemento([first, second])], [], None)
+	pool = InternPool("calculations")
+
+	older, newer = read_memento_stacks(path, None, pool)[0]
+
+	assert older.history[0] is newer.history[0]
+	assert newer.history[1] == second
+	assert pool.hits >= 1
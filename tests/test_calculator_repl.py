@@ -3,7 +3,14 @@ from decimal import Decimal
 import pytest
 
 from app import calculator_repl
+from app.array_operands import ArrayOperand
+from app.calculation import Calculation
+from app.calculator_config import CalculatorConfig
+from app.calculator_macros import MacroStore
 from app.exceptions import OperationError, ValidationError
+from app.history_journal import HistoryJournal
+from app.memory_report import MemoryReport
+from app.operations import OperationFactory
 
 
 class FakeCalculator:
@@ -20,11 +27,14 @@ class FakeCalculator:
         self.raise_on_perform = None
         self.observers = []
         self.last_operation = None
+        self.performed = []
+        self.macros = None
+        self.replayed = []
 
     def add_observer(self, observer):
         self.observers.append(observer)
 
-    def save_history(self):
+    def save_history(self, sync=False):
         if self.raise_on_save:
             raise self.raise_on_save
         self.saved += 1
@@ -37,6 +47,9 @@ class FakeCalculator:
     def show_history(self):
         return self.history_lines
 
+    def history_view(self):
+        return self.history_lines
+
     def clear_history(self):
         self.cleared += 1
 
@@ -52,14 +65,56 @@ class FakeCalculator:
     def perform_operation(self, a, b):
         if self.raise_on_perform:
             raise self.raise_on_perform
+        self.performed.append((a, b))
         return self.perform_result
 
+    def replay_macro(self, macro, values, record=False):
+        self.replayed.append((macro.name, values, record))
+        return [Decimal(len(value)) for value in values]
+
+    def perform_array(self, a, b):
+        if self.raise_on_perform:
+            raise self.raise_on_perform
+        self.arrays = (a, b)
+        return ArrayOperand([[1.0, 2.0]])
+
+    def memory_report(self):
+        return MemoryReport(1024, 512, 0, 256, 64, history_entries=3, undo_entries=2, redo_entries=0, peak_bytes=2048)
+
+    def perform_aggregate(self, *vectors):
+        if self.raise_on_perform:
+            raise self.raise_on_perform
+        self.vectors = vectors
+        return self.perform_result
+
+
+class FakeFactory:
+    @staticmethod
+    def create_operation(name):
+        if name in OperationFactory.aggregate_names() + OperationFactory.array_names():
+            return OperationFactory.create_operation(name)
+        return f"op:{name}"
+
+    @staticmethod
+    def aggregate_names():
+        return OperationFactory.aggregate_names()
+
+    @staticmethod
+    def array_names():
+        return OperationFactory.array_names()
+
+    plugins = []
+
+    @staticmethod
+    def plugin_names():
+        return FakeFactory.plugins
+
 
 def _run_repl_with_inputs(monkeypatch: pytest.MonkeyPatch, commands: list[str], fake_calc: FakeCalculator, capsys):
     monkeypatch.setattr(calculator_repl, "Calculator", lambda: fake_calc)
     monkeypatch.setattr(calculator_repl, "LoggingObserver", lambda: object())
     monkeypatch.setattr(calculator_repl, "AutoSaveObserver", lambda calc: object())
-    monkeypatch.setattr(calculator_repl, "OperationFactory", type("F", (), {"create_operation": staticmethod(lambda name: f"op:{name}")}))
+    monkeypatch.setattr(calculator_repl, "OperationFactory", FakeFactory)
     responses = iter(commands)
     monkeypatch.setattr("builtins.input", lambda prompt="": next(responses))
 
@@ -137,6 +192,15 @@ def test_repl_clear_undo_redo_paths(monkeypatch: pytest.MonkeyPatch, capsys) ->
     assert "Nothing to redo." in output
 
 
+def test_repl_memory_prints_breakdown(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    output = _run_repl_with_inputs(monkeypatch, ["memory", "exit"], FakeCalculator(), capsys)
+
+    assert "Memory usage:" in output
+    assert "history        1.0 KiB  3 calculations" in output
+    assert "undo             512 B  2 snapshots" in output
+    assert "total          1.8 KiB  peak 2.0 KiB" in output
+
+
 def test_repl_save_and_load_success_and_failure(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
     fake_calc = FakeCalculator()
     fake_calc.raise_on_load = RuntimeError("read fail")
@@ -219,3 +283,201 @@ def test_repl_add_handles_operation_error_type(monkeypatch: pytest.MonkeyPatch,
     fake_calc.raise_on_perform = OperationError("cannot divide")
     output = _run_repl_with_inputs(monkeypatch, ["add", "2", "3", "exit"], fake_calc, capsys)
     assert "Operation failed: cannot divide" in output
+
+
+def test_repl_history_paging_options(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    fake_calc = FakeCalculator()
+    fake_calc.history_lines = [f"calc {index}" for index in range(1, 46)]
+    output = _run_repl_with_inputs(
+        monkeypatch,
+        ["history 10 --page 2", "history --tail 2", "history --page 3", "history 50 --page 2", "exit"],
+        fake_calc,
+        capsys,
+    )
+
+    assert "11. calc 11" in output
+    assert "20. calc 20" in output
+    assert "Page 2 of 5 (45 calculations)" in output
+    assert "44. calc 44\n45. calc 45" in output
+    assert "41. calc 41" in output and "Page 3 of 3 (45 calculations)" in output
+    assert "No calculations on page 2." in output
+
+
+def test_repl_history_writes_the_listing_in_one_buffered_write(monkeypatch: pytest.MonkeyPatch) -> None:
+    writes = []
+    monkeypatch.setattr(calculator_repl.sys.stdout, "write", writes.append)
+    fake_calc = FakeCalculator()
+    fake_calc.history_lines = [f"calc {index}" for index in range(1, 46)]
+
+    calculator_repl.show_history(fake_calc, [])
+    calculator_repl.show_history(fake_calc, ["10", "--page", "2"])
+
+    listings = [chunk for chunk in writes if chunk[:1].isdigit()]
+    assert [listing.count("\n") for listing in listings] == [45, 10]
+    assert listings[1].startswith("11. calc 11\n")
+
+
+@pytest.mark.parametrize(
+    "command,message",
+    [
+        ("history 0", "N must be a positive integer"),
+        ("history --page", "--page needs a value"),
+        ("history --tail x", "--tail must be a positive integer"),
+    ],
+)
+def test_repl_history_rejects_bad_arguments(monkeypatch: pytest.MonkeyPatch, capsys, command: str, message: str) -> None:
+    output = _run_repl_with_inputs(monkeypatch, [command, "exit"], FakeCalculator(), capsys)
+    assert message in output
+    assert "Usage: history" in output
+
+
+def test_repl_history_follow_tails_the_saved_history(monkeypatch: pytest.MonkeyPatch, capsys, tmp_path) -> None:
+    config = CalculatorConfig(base_dir=tmp_path)
+    journal = HistoryJournal(config)
+    calcs = [Calculation("Addition", Decimal(index), Decimal("1")) for index in range(4)]
+    journal.checkpoint(calcs[:1])
+    fake_calc = FakeCalculator()
+    fake_calc.config = config
+    fake_calc.history_lines = ["calc 1"]
+
+    def write_torn_row():
+        with open(config.history_journal_file, "a", encoding="utf-8") as handle:
+            handle.write("Addition,9,9")
+
+    def checkpoint():
+        # The follower must not cut off a row another writer is still appending.
+        assert config.history_journal_file.read_text(encoding="utf-8").endswith("Addition,9,9")
+        journal.checkpoint(calcs[:3])
+
+    polls = iter([lambda: journal.append(calcs[1:2]), write_torn_row, checkpoint, lambda: journal.append(calcs[3:])])
+
+    def fake_sleep(seconds):
+        step = next(polls, None)
+        if step is None:
+            raise KeyboardInterrupt
+        step()
+
+    monkeypatch.setattr(calculator_repl.time, "sleep", fake_sleep)
+    output = _run_repl_with_inputs(monkeypatch, ["history --tail 1 --follow", "exit"], fake_calc, capsys)
+
+    assert "1. calc 1" in output
+    assert "Following history" in output
+    assert output.count("Addition(") == 3
+    assert f"2. {calcs[1]}" in output
+    assert f"3. {calcs[2]}" in output
+    assert f"4. {calcs[3]}" in output
+    assert "Stopped following history." in output
+    assert "Goodbye!" in output
+
+
+def test_follow_history_rereads_a_file_replaced_while_listing(monkeypatch: pytest.MonkeyPatch, capsys, tmp_path) -> None:
+    config = CalculatorConfig(base_dir=tmp_path)
+    HistoryJournal(config).checkpoint([Calculation("Addition", Decimal("1"), Decimal("1"))])
+    missing = tmp_path / "gone.csv"
+    sources = iter([[missing], [config.history_file]])
+    monkeypatch.setattr(calculator_repl, "default_sources", lambda config: next(sources))
+    monkeypatch.setattr(calculator_repl.time, "sleep", lambda seconds: None)
+
+    with pytest.raises(StopIteration):
+        calculator_repl.follow_history(config, 1)
+
+    assert "Addition(" not in capsys.readouterr().out
+
+
+def test_repl_aggregate_reads_operand_lists(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    fake_calc = FakeCalculator()
+    fake_calc.perform_result = Decimal("6.0")
+    output = _run_repl_with_inputs(monkeypatch, ["sum", "1, 2 3", "dot", "1 2", "3,4", "exit"], fake_calc, capsys)
+
+    assert output.count("Result: 6") == 2
+    assert fake_calc.vectors == (["1", "2"], ["3", "4"])
+    assert fake_calc.last_operation.arity == 2
+
+
+def test_repl_aggregate_cancel_and_errors(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    fake_calc = FakeCalculator()
+    output = _run_repl_with_inputs(monkeypatch, ["mean", "cancel", "help", "exit"], fake_calc, capsys)
+    assert "Operation cancelled" in output
+    assert "sum, product, mean, stddev, min, max, dot - Aggregate a list of operands" in output
+
+    fake_calc.raise_on_perform = ValidationError("Invalid number format: x")
+    output = _run_repl_with_inputs(monkeypatch, ["max", "x", "exit"], fake_calc, capsys)
+    assert "Operation failed: Invalid number format: x" in output
+
+
+def test_repl_array_operation_flow(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    fake_calc = FakeCalculator()
+    output = _run_repl_with_inputs(monkeypatch, ["vscale", "m.npy", "2", "matmul", "cancel", "solve", "a.csv", "cancel", "exit"], fake_calc, capsys)
+
+    assert "Result:\n[[1. 2.]]" in output
+    assert fake_calc.arrays == ("m.npy", "2")
+    assert output.count("Operation cancelled.") == 2
+
+    fake_calc.raise_on_perform = OperationError("Cannot multiply arrays")
+    output = _run_repl_with_inputs(monkeypatch, ["matmul", "a.npy", "b.npy", "exit"], fake_calc, capsys)
+    assert "Operation failed: Cannot multiply arrays" in output
+
+
+def test_repl_runs_plugin_operations(monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    monkeypatch.setattr(FakeFactory, "plugins", ["modulus"])
+    fake_calc = FakeCalculator()
+    output = _run_repl_with_inputs(monkeypatch, ["help", "modulus", "7", "4", "exit"], fake_calc, capsys)
+
+    assert "modulus - Plugin operations" in output
+    assert fake_calc.last_operation == "op:modulus"
+    assert "Result: 5" in output
+
+
+def test_repl_records_and_replays_macros(monkeypatch: pytest.MonkeyPatch, capsys, tmp_path) -> None:
+    fake_calc = FakeCalculator()
+    fake_calc.macros = MacroStore(tmp_path / "macros.json")
+    inputs = tmp_path / "Inputs.txt"
+    inputs.write_text("10\n200\n", encoding="utf-8")
+    commands = [
+        "macro record IncScale",
+        "add", "2", "3",
+        "multiply", "4",
+        "macro end",
+        "macro list",
+        f"macro run IncScale 1 {inputs} --record",
+        "exit",
+    ]
+
+    output = _run_repl_with_inputs(monkeypatch, commands, fake_calc, capsys)
+
+    assert fake_calc.performed == [("2", "3"), (Decimal("5"), "4")]
+    assert "Operand 1: 5" in output
+    assert "Macro IncScale saved: add 3 -> multiply 4" in output
+    assert "  IncScale: add 3 -> multiply 4" in output
+    assert fake_calc.replayed == [("IncScale", ["1", "10", "200"], True)]
+    assert "1 -> 1\n10 -> 2\n200 -> 3\n" in output
+
+
+def test_repl_macro_command_edge_cases(monkeypatch: pytest.MonkeyPatch, capsys, tmp_path) -> None:
+    fake_calc = FakeCalculator()
+    fake_calc.macros = MacroStore(tmp_path / "macros.json")
+    commands = [
+        "macro list",
+        "macro end",
+        "macro record empty",
+        "macro end",
+        "macro run missing 1",
+        "macro delete missing",
+        "macro",
+        "help",
+        "exit",
+    ]
+
+    output = _run_repl_with_inputs(monkeypatch, commands, fake_calc, capsys)
+
+    assert "No saved macros." in output
+    assert "No macro is being recorded." in output
+    assert "Macro has no steps; nothing saved." in output
+    assert "Macro failed: Unknown macro: missing" in output
+    assert "Unknown macro: missing" in output
+    assert calculator_repl.MACRO_USAGE in output
+    assert "macro run NAME VALUE_OR_FILE... [--record] - Replay a macro over many inputs" in output
+
+    fake_calc.macros.save(calculator_repl.MacroRecorder("inc").macro)
+    output = _run_repl_with_inputs(monkeypatch, ["macro delete inc", "exit"], fake_calc, capsys)
+    assert "Macro inc deleted." in output
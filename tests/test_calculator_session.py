@@ -0,0 +1,160 @@
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from app.calculator import Calculator
+from app.calculator_repl import calculator_repl
+from app.calculator_session import CalculatorSession, CalculatorSessionManager
+from app.history import AutoSaveObserver
+from app.operations import Addition, Multiplication
+
+
+CONFIG_DEFAULTS = {
+    "max_history_size": 5,
+    "precision": 10,
+    "max_input_value": Decimal("100000"),
+    "default_encoding": "utf-8",
+}
+
+
+def test_create_session_does_no_setup_or_disk_reads(config_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    manager = CalculatorSessionManager(config_factory())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sessions must not touch logging or disk")
+
+    monkeypatch.setattr(Calculator, "_setup_logging", fail)
+    monkeypatch.setattr(Calculator, "load_history", fail)
+
+    session = manager.create_session()
+
+    assert isinstance(session, CalculatorSession)
+    assert session.session_id == "session-1"
+    assert session.config is manager.config
+    assert session.history == []
+    assert len(manager) == 1
+
+
+def test_sessions_have_independent_history_and_shared_store(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory())
+    first = manager.create_session("a")
+    second = manager.create_session("b")
+
+    first.set_operation(Addition())
+    second.set_operation(Multiplication())
+    first.perform_operation("1", "2")
+    second.perform_operation("3", "4")
+
+    assert [calc.result for calc in first.history] == [Decimal("3")]
+    assert [calc.result for calc in second.history] == [Decimal("12")]
+    assert [calc.result for calc in manager.store.snapshot()] == [Decimal("3"), Decimal("12")]
+    assert len(first.undo_stack) == 1
+    assert len(second.undo_stack) == 1
+
+
+def test_undo_and_redo_are_reflected_in_store(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory())
+    first = manager.create_session()
+    second = manager.create_session()
+    first.set_operation(Addition())
+    second.set_operation(Addition())
+    first.perform_operation("1", "1")
+    second.perform_operation("2", "2")
+
+    assert first.undo() is True
+    assert [calc.result for calc in manager.store.snapshot()] == [Decimal("4")]
+
+    assert first.redo() is True
+    assert [calc.result for calc in manager.store.snapshot()] == [Decimal("4"), Decimal("2")]
+
+    assert first.undo() is True
+    assert first.undo() is False
+    assert first.redo() is True
+    assert second.redo() is False
+
+
+def test_store_is_bounded_and_idempotent(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory(max_history_size=2))
+    session = manager.create_session()
+    session.set_operation(Addition())
+    for value in ("1", "2", "3"):
+        session.perform_operation(value, "0")
+
+    manager.store.restore(session.history)
+
+    assert len(manager.store) == 2
+    assert [calc.result for calc in manager.store.snapshot()] == [Decimal("2"), Decimal("3")]
+
+
+def test_store_update_rejects_none(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory())
+    with pytest.raises(AttributeError, match="Calculation cannot be None"):
+        manager.store.update(None)
+
+
+def test_session_save_and_load_use_shared_store(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory(auto_save=True))
+    writer = manager.create_session()
+    writer.add_observer(AutoSaveObserver(writer))
+    writer.set_operation(Addition())
+    writer.perform_operation("5", "5")
+
+    frame = pd.read_csv(manager.config.history_file)
+    assert frame["result"].tolist() == [10]
+
+    reader = manager.create_session()
+    reader.load_history()
+    assert [calc.result for calc in reader.history] == [Decimal("10")]
+
+    reopened = CalculatorSessionManager(config_factory())
+    assert len(reopened.store) == 1
+    reopened.load_history()
+    assert len(reopened.store) == 1
+
+
+def test_session_repl_records_and_runs_macros(config_factory, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    manager = CalculatorSessionManager(config_factory())
+    session = manager.create_session()
+    commands = iter(["macro record Inc", "add", "2", "3", "macro end", "macro run Inc 10", "exit"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(commands))
+
+    calculator_repl(session)
+
+    output = capsys.readouterr().out
+    assert "Macro Inc saved: add 3" in output
+    assert "10 -> 13" in output
+    assert "Inc" in manager.store.calculator.macros.load()
+    assert [calc.result for calc in manager.store.snapshot()] == [Decimal("5")]
+
+
+def test_clear_history_only_drops_session_entries(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory())
+    first = manager.create_session()
+    second = manager.create_session()
+    first.set_operation(Addition())
+    second.set_operation(Addition())
+    first.perform_operation("1", "1")
+    second.perform_operation("2", "2")
+
+    first.clear_history()
+    manager.save_history()
+
+    assert first.history == []
+    assert [calc.result for calc in manager.store.snapshot()] == [Decimal("4")]
+
+
+def test_session_lookup_duplicate_and_close(config_factory) -> None:
+    manager = CalculatorSessionManager(config_factory())
+    session = manager.create_session("alpha")
+
+    assert manager.get_session("alpha") is session
+    assert manager.session_ids() == ["alpha"]
+    with pytest.raises(ValueError, match="Session already exists"):
+        manager.create_session("alpha")
+
+    manager.close_session("alpha")
+    manager.close_session("alpha")
+    with pytest.raises(KeyError, match="Unknown session"):
+        manager.get_session("alpha")
+    assert len(manager) == 0
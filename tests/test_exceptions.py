@@ -1,6 +1,7 @@
 import pytest
 
 from app.exceptions import (
+	BulkValidationError,
 	CalculatorError,
 	ConfigurationError,
 	OperationError,
@@ -12,6 +13,13 @@ def test_validation_error_inheritance() -> None:
 	assert issubclass(ValidationError, CalculatorError)
 
 
+def test_bulk_validation_error_collects_failures() -> None:
+	error = BulkValidationError([(0, "x", "bad"), (3, "y", "worse")])
+	assert issubclass(BulkValidationError, ValidationError)
+	assert error.failures == [(0, "x", "bad"), (3, "y", "worse")]
+	assert str(error) == "2 invalid value(s): row 0: bad; row 3: worse"
+
+
 def test_operation_error_inheritance() -> None:
 	assert issubclass(OperationError, CalculatorError)
 
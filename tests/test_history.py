@@ -1,6 +1,8 @@
+from types import SimpleNamespace
+
 import pytest
 
-from app.history import AutoSaveObserver, LoggingObserver
+from app.history import AutoSaveObserver, HistoryView, LoggingObserver
 
 
 def test_logging_observer_logs_calculation(
@@ -61,3 +63,52 @@ def test_autosave_observer_none_calculation_raises(fake_calculator_factory) -> N
 	with pytest.raises(AttributeError, match="cannot be None"):
 		observer.update(None)
 
+
+
+def _view_calculator(*values: int) -> SimpleNamespace:
+	calculator = SimpleNamespace(history=[], history_version=0)
+	calculator.history = [SimpleNamespace(value=value) for value in values]
+	return calculator
+
+
+def test_history_view_reads_live_history_without_copying() -> None:
+	calculator = _view_calculator(1, 2, 3)
+	view = HistoryView(calculator)
+
+	assert len(view) == 3
+	assert view[0] is calculator.history[0]
+	assert view[-1].value == 3
+	assert [item.value for item in view] == [1, 2, 3]
+
+	calculator.history.append(SimpleNamespace(value=4))
+	calculator.history_version += 1
+	assert len(view) == 4
+	assert not view.stale
+
+
+def test_history_view_slices_are_lazy_and_versioned() -> None:
+	calculator = _view_calculator(1, 2, 3, 4, 5)
+	view = HistoryView(calculator)
+
+	tail = view[-2:]
+	assert isinstance(tail, HistoryView)
+	assert [item.value for item in tail] == [4, 5]
+	assert [item.value for item in view[::2][1:]] == [3, 5]
+	assert "len=2" in repr(tail)
+
+	calculator.history_version += 1
+	assert tail.stale
+	with pytest.raises(RuntimeError, match="stale"):
+		len(tail)
+	with pytest.raises(RuntimeError, match="stale"):
+		tail[0]
+
+
+def test_history_view_iterator_detects_changes() -> None:
+	calculator = _view_calculator(1, 2)
+	iterator = iter(HistoryView(calculator))
+
+	assert next(iterator).value == 1
+	calculator.history_version += 1
+	with pytest.raises(RuntimeError, match="changed during iteration"):
+		next(iterator)
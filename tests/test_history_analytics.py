@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from app.calculation import Calculation, Vector
+from app.history_analytics import AnalyticsFrame
+
+
+def _calc(operation: str, a: str, b: str) -> Calculation:
+    return Calculation(operation=operation, operand1=Decimal(a), operand2=Decimal(b))
+
+
+def test_analytics_frame_has_typed_columns() -> None:
+    frame = AnalyticsFrame().refresh([_calc("Addition", "1.5", "2"), _calc("Division", "1", "4")])
+
+    assert list(frame.columns) == ["operation", "operand1", "operand2", "result", "timestamp"]
+    assert isinstance(frame["operation"].dtype, pd.CategoricalDtype)
+    assert frame["result"].dtype == "float64"
+    assert pd.api.types.is_datetime64_any_dtype(frame["timestamp"])
+    assert frame["result"].tolist() == [3.5, 0.25]
+
+
+def test_analytics_frame_decimal_columns_keep_exact_values() -> None:
+    frame = AnalyticsFrame(decimal=True).refresh([_calc("Division", "1", "3"), Calculation("Addition", 1, 2)])
+
+    assert frame["result"].dtype == object
+    assert frame["result"][0] == Decimal(1) / Decimal(3)
+    assert frame["result"][1] == Decimal("3")
+
+
+def test_analytics_frame_appends_only_new_rows(monkeypatch) -> None:
+    history = [_calc("Addition", "1", "1")]
+    analytics = AnalyticsFrame()
+    analytics.refresh(history)
+
+    built = []
+    original_build = AnalyticsFrame._build
+    monkeypatch.setattr(AnalyticsFrame, "_build", lambda self, calcs: built.append(len(calcs)) or original_build(self, calcs))
+
+    history.append(_calc("Power", "2", "3"))
+    frame = analytics.refresh(history)
+
+    assert built == [1]
+    assert frame["operation"].tolist() == ["Addition", "Power"]
+    assert list(frame["operation"].cat.categories) == ["Addition", "Power"]
+    assert list(frame.index) == [0, 1]
+
+    assert analytics.refresh(history) is frame
+    assert built == [1]
+
+
+def test_analytics_frame_drops_evicted_rows() -> None:
+    history = [_calc("Addition", "1", "1"), _calc("Addition", "2", "2")]
+    analytics = AnalyticsFrame()
+    analytics.refresh(history)
+
+    history.pop(0)
+    history.append(_calc("Subtraction", "9", "4"))
+    frame = analytics.refresh(history)
+
+    assert frame["result"].tolist() == [4.0, 5.0]
+
+
+def test_analytics_frame_rebuilds_when_history_is_replaced() -> None:
+    analytics = AnalyticsFrame()
+    analytics.refresh([_calc("Addition", "1", "1")])
+
+    assert analytics.refresh([]).empty
+    assert analytics.refresh([_calc("Addition", "3", "3")])["result"].tolist() == [6.0]
+    assert analytics.refresh([_calc("Addition", "4", "4")])["result"].tolist() == [8.0]
+
+
+def test_analytics_frame_leaves_operand_lists_out_of_numeric_columns() -> None:
+    calcs = [Calculation("Sum", Vector([Decimal("1"), Decimal("2")]), Vector()), _calc("Addition", "1", "2")]
+
+    frame = AnalyticsFrame().refresh(calcs)
+    assert frame["operand1"].isna().tolist() == [True, False]
+    assert frame["result"].tolist() == [3.0, 3.0]
+
+    exact = AnalyticsFrame(decimal=True).refresh(calcs)
+    assert exact["operand2"].tolist() == [None, Decimal("2")]
+
+
+def test_analytics_frame_memory_bytes() -> None:
+    analytics = AnalyticsFrame()
+    assert analytics.memory_bytes() == 0
+
+    analytics.refresh([_calc("Addition", "1", "1"), _calc("Addition", "2", "2")])
+
+    assert analytics.memory_bytes() >= 2 * 3 * 8
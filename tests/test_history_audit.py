@@ -0,0 +1,133 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.history_audit import audit_chunk, audit_history, default_sources, main
+from app.history_io import write_records
+from app.operations import Addition
+
+ROWS = [
+    {"operation": "Addition", "operand1": "1", "operand2": "2", "result": "3", "timestamp": "2026-01-01T10:00:00"},
+    {"operation": "Multiplication", "operand1": "2", "operand2": "3", "result": "7", "timestamp": "2026-01-01T10:01:00"},
+    {"operation": "VectorScale", "operand1": "array:[1.0]", "operand2": "2", "result": "array:[2.0]", "timestamp": "2026-01-01T10:02:00"},
+    {"operation": "Modulo", "operand1": "5", "operand2": "2", "result": "1", "timestamp": "2026-01-01T10:03:00"},
+    {"operation": "Division", "operand1": "1", "operand2": "0", "result": "0", "timestamp": "2026-01-01T10:04:00"},
+]
+
+
+def _write(path: Path, rows: list = ROWS) -> Path:
+    write_records(path, rows)
+    return path
+
+
+def test_audit_chunk_reports_mismatches_with_row_numbers() -> None:
+    checked, skipped, mismatches = audit_chunk("h.csv", list(enumerate(ROWS, start=1)))
+
+    assert (checked, skipped) == (4, 1)
+    assert [mismatch.row for mismatch in mismatches] == [2, 4, 5]
+    assert str(mismatches[0]) == "h.csv row 2: Multiplication(2, 3) saved 7, computed 6"
+    assert str(mismatches[1]) == "h.csv row 4: Modulo(5, 2): Unsupported operation: Modulo"
+    assert "Invalid operation" in mismatches[2].error
+
+
+def test_audit_recomputes_in_the_numeric_backend() -> None:
+    row = {"operation": "Addition", "operand1": "0.1", "operand2": "0.2", "result": "0.30000000000000004", "timestamp": "2026-01-01T10:00:00"}
+
+    assert audit_chunk("h.csv", [(1, row)], "float")[2] == []
+    assert len(audit_chunk("h.csv", [(1, row)])[2]) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_audit_history_streams_files_in_chunks(tmp_path: Path, workers: int) -> None:
+    csv_path = _write(tmp_path / "h.csv")
+    ndjson_path = _write(tmp_path / "h.ndjson", ROWS[:2])
+
+    report = audit_history([csv_path, ndjson_path], workers=workers, chunk_size=1)
+
+    assert report.rows == 7
+    assert report.skipped == 1
+    assert [(Path(mismatch.source).name, mismatch.row) for mismatch in report.mismatches] == [
+        ("h.csv", 2),
+        ("h.csv", 4),
+        ("h.csv", 5),
+        ("h.ndjson", 2),
+    ]
+    assert report.ok is False
+    assert report.summary() == "Audited 7 row(s) in 2 file(s): 4 mismatch(es), 1 skipped"
+
+
+def test_main_exit_status_and_reports(tmp_path: Path, capsys) -> None:
+    good = _write(tmp_path / "good.csv", ROWS[:1])
+    bad = _write(tmp_path / "bad.csv", ROWS[:2])
+
+    assert main([str(good), "--workers", "1"]) == 0
+    assert "Audited 1 row(s) in 1 file(s): 0 mismatch(es), 0 skipped" in capsys.readouterr().out
+
+    assert main([str(bad), "--workers", "1"]) == 1
+    assert "bad.csv row 2: Multiplication(2, 3) saved 7, computed 6" in capsys.readouterr().out
+
+    assert main([str(bad), "--workers", "1", "--json"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["mismatches"][0]["row"] == 2
+
+    assert main([str(tmp_path / "missing.csv")]) == 2
+    assert "History audit failed" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_audit_reports_torn_rows(tmp_path: Path, workers: int) -> None:
+    path = _write(tmp_path / "h.csv", ROWS[:1])
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write("Addition,4,5")
+
+    report = audit_history([path], workers=workers)
+
+    assert report.rows == 2
+    assert [(mismatch.row, mismatch.error) for mismatch in report.mismatches] == [
+        (2, "Incomplete row: no result, timestamp")
+    ]
+    assert (report.mismatches[0].operand2, report.mismatches[0].saved) == ("5", "")
+
+
+def test_main_reports_unexpected_failures(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    def broken(*args, **kwargs):
+        raise RuntimeError("worker crashed")
+
+    monkeypatch.setattr("app.history_audit.audit_history", broken)
+
+    assert main([str(_write(tmp_path / "h.csv"))]) == 2
+    assert "History audit failed: worker crashed" in capsys.readouterr().out
+
+
+def test_default_sources_follow_the_configured_store(tmp_path: Path) -> None:
+    config = CalculatorConfig(base_dir=tmp_path, auto_save=False)
+    assert default_sources(config) == []
+    calc = Calculator(config=config)
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "2")
+    calc.save_history()
+    assert default_sources(config) == [config.history_file]
+
+    partitioned = CalculatorConfig(base_dir=tmp_path / "p", auto_save=False, history_partition="day")
+    calc = Calculator(config=partitioned)
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "2")
+    calc.save_history()
+    (source,) = default_sources(partitioned)
+    assert source.parent == partitioned.history_partition_dir
+    assert audit_history([source], workers=1).ok
+
+
+def test_main_defaults_to_the_configured_history(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys) -> None:
+    monkeypatch.setenv("CALCULATOR_BASE_DIR", str(tmp_path))
+    monkeypatch.delenv("CALCULATOR_HISTORY_DIR", raising=False)
+    monkeypatch.delenv("CALCULATOR_HISTORY_FILE", raising=False)
+    tampered = CalculatorConfig()
+    tampered.history_dir.mkdir(parents=True)
+    _write(tampered.history_file, ROWS[:2])
+
+    assert main(["--workers", "1"]) == 1
+    assert f"{tampered.history_file} row 2" in capsys.readouterr().out
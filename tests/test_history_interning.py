@@ -0,0 +1,90 @@
+from decimal import Decimal
+import gc
+
+import pytest
+
+from app.calculation import Calculation, Vector
+from app.history_interning import InternPool
+
+
+def _row(a: str, b: str, timestamp: str = "2026-01-01T10:00:00") -> dict:
+    return {"operation": "Addition", "operand1": a, "operand2": b, "result": str(Decimal(a) + Decimal(b)), "timestamp": timestamp}
+
+
+def test_values_mode_shares_equal_values() -> None:
+    pool = InternPool()
+    # Operation names built at runtime are distinct objects, as names parsed from a file are.
+    rows = [
+        dict(_row("1.5", "2", timestamp), operation="".join(["Add", "ition"]))
+        for timestamp in ("2026-01-01T10:00:00", "2026-01-02T10:00:00")
+    ]
+    assert rows[0]["operation"] is not rows[1]["operation"]
+    first = pool.calculation(Calculation.from_dict(rows[0]))
+    second = pool.calculation(Calculation.from_dict(rows[1]))
+
+    assert first is not second
+    assert first.operand1 is second.operand1
+    assert first.result is second.result
+    assert second.operation is first.operation
+    assert pool.stats() == {"values": 3, "calculations": 0, "hits": 3, "misses": 3}
+
+
+def test_values_that_print_differently_are_kept_apart() -> None:
+    pool = InternPool()
+
+    assert str(pool.value(Decimal("1.0"))) == "1.0"
+    assert str(pool.value(Decimal("1"))) == "1"
+    assert type(pool.value(1)) is int
+    assert type(pool.value(1.0)) is float
+    vector = Vector([Decimal("1")])
+    assert pool.value(vector) is vector
+
+
+def test_memory_bytes_skips_values_counted_elsewhere() -> None:
+    pool = InternPool()
+    value = pool.value(Decimal("12345.678"))
+    seen: set = set()
+
+    assert pool.memory_bytes() > pool.memory_bytes({id(value)})
+    assert pool.memory_bytes(seen) > 0
+    assert id(value) in seen
+
+
+def test_value_table_is_bounded() -> None:
+    pool = InternPool(max_values=2)
+    for value in range(5):
+        pool.value(Decimal(value))
+
+    assert pool.stats()["values"] == 1
+
+
+def test_calculations_mode_shares_identical_rows() -> None:
+    pool = InternPool("calculations")
+    built = []
+
+    def build(row: dict) -> Calculation:
+        built.append(row)
+        return Calculation.restore(row)
+
+    first = pool.build(_row("1", "2"), build)
+    assert pool.build(_row("1", "2"), build) is first
+    later = pool.build(_row("1", "2", "2026-01-02T10:00:00"), build)
+    assert later is not first
+    assert later.operand1 is first.operand1
+    assert len(built) == 2
+    assert pool.stats()["calculations"] == 2
+
+    del first, later
+    gc.collect()
+    assert pool.stats()["calculations"] == 0
+
+
+@pytest.mark.parametrize("mode", ["off", "values"])
+def test_other_modes_build_every_row(mode: str) -> None:
+    pool = InternPool(mode)
+
+    first = pool.build(_row("1", "2"), Calculation.restore)
+    second = pool.build(_row("1", "2"), Calculation.restore)
+
+    assert first is not second
+    assert (first.operand1 is second.operand1) == (mode == "values")
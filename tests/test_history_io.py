@@ -0,0 +1,134 @@
+from decimal import Decimal
+import json
+from pathlib import Path
+
+import pytest
+
+from app import history_io
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.exceptions import OperationError
+from app.history_io import (
+    convert_history,
+    detect_format,
+    export_history,
+    import_history,
+    iter_chunks,
+    iter_records,
+    write_records,
+)
+
+
+CONFIG_DEFAULTS = {"max_history_size": 3}
+
+
+def _rows(count: int):
+    for index in range(count):
+        yield Calculation(operation="Addition", operand1=Decimal(index), operand2=Decimal("1")).to_dict()
+
+
+@pytest.mark.parametrize(
+    "name,fmt,expected",
+    [("a.csv", None, "csv"), ("a.ndjson", None, "ndjson"), ("a.JSONL", None, "ndjson"), ("a.txt", "ndjson", "ndjson")],
+)
+def test_detect_format(name: str, fmt, expected: str) -> None:
+    assert detect_format(Path(name), fmt) == expected
+
+
+def test_detect_format_rejects_unknown() -> None:
+    with pytest.raises(OperationError, match="Unsupported history format"):
+        detect_format(Path("a.csv"), "xml")
+
+
+def test_iter_chunks_splits_without_materializing() -> None:
+    assert list(iter_chunks(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_chunks([], 2)) == []
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".ndjson"])
+def test_write_and_iter_records_round_trip(tmp_path: Path, suffix: str) -> None:
+    path = tmp_path / f"history{suffix}"
+
+    assert write_records(path, _rows(5), chunk_size=2) == 5
+
+    records = list(iter_records(path))
+    assert [row["operand1"] for row in records] == ["0", "1", "2", "3", "4"]
+    assert records[0] == next(_rows(1)) | {"timestamp": records[0]["timestamp"]}
+
+
+def test_iter_records_skips_blank_ndjson_lines(tmp_path: Path) -> None:
+    path = tmp_path / "history.ndjson"
+    row = next(_rows(1))
+    path.write_text(json.dumps(row) + "\n\n", encoding="utf-8")
+    assert list(iter_records(path)) == [row]
+
+
+def test_convert_history_between_formats(tmp_path: Path) -> None:
+    source = tmp_path / "history.csv"
+    write_records(source, _rows(4))
+
+    assert convert_history(source, tmp_path / "history.ndjson", chunk_size=3) == 4
+    assert len(list(iter_records(tmp_path / "history.ndjson"))) == 4
+
+
+def test_export_history_writes_calculator_history(config_factory, tmp_path: Path) -> None:
+    calc = Calculator(config=config_factory())
+    calc.history = [Calculation(operation="Addition", operand1=Decimal("1"), operand2=Decimal("2"))]
+
+    assert export_history(calc, tmp_path / "out.ndjson") == 1
+    assert [row["result"] for row in iter_records(tmp_path / "out.ndjson")] == ["3"]
+
+
+def test_import_history_keeps_newest_rows(config_factory, tmp_path: Path) -> None:
+    source = tmp_path / "archive.csv"
+    write_records(source, _rows(10))
+    calc = Calculator(config=config_factory())
+
+    assert import_history(calc, source) == 10
+    assert [item.operand1 for item in calc.history] == [Decimal("7"), Decimal("8"), Decimal("9")]
+
+
+def test_import_history_without_verification_trusts_results(config_factory, tmp_path: Path) -> None:
+    source = tmp_path / "archive.ndjson"
+    row = next(_rows(1)) | {"result": "42"}
+    write_records(source, [row])
+    calc = Calculator(config=config_factory())
+
+    import_history(calc, source, verify=False)
+
+    assert calc.history[0].result == Decimal("42")
+
+
+def test_import_history_rejects_torn_records(config_factory, tmp_path: Path) -> None:
+    source = tmp_path / "archive.csv"
+    write_records(source, _rows(2))
+    with open(source, "a", encoding="utf-8") as handle:
+        handle.write("Addition,4")
+    calc = Calculator(config=config_factory())
+
+    with pytest.raises(OperationError, match="Incomplete record 3 in .*archive.csv: no operand2, result, timestamp"):
+        import_history(calc, source)
+    assert calc.history == []
+
+
+def test_cli_convert_export_and_import(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, capsys) -> None:
+    monkeypatch.setenv("CALCULATOR_HISTORY_DIR", str(tmp_path / "history"))
+    monkeypatch.setenv("CALCULATOR_LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("CALCULATOR_MAX_HISTORY_SIZE", "3")
+    source = tmp_path / "archive.csv"
+    write_records(source, _rows(5))
+
+    assert history_io.main(["convert", str(source), str(tmp_path / "archive.ndjson")]) == 0
+    assert history_io.main(["import", str(tmp_path / "archive.ndjson"), "--no-verify"]) == 0
+    assert history_io.main(["--chunk-size", "2", "export", str(tmp_path / "out.csv")]) == 0
+
+    output = capsys.readouterr().out
+    assert "Converted 5 records" in output
+    assert "Imported 5 records" in output
+    assert "Exported 3 records" in output
+    assert [row["operand1"] for row in iter_records(tmp_path / "out.csv")] == ["2", "3", "4"]
+
+
+def test_cli_reports_failures(tmp_path: Path, capsys) -> None:
+    assert history_io.main(["convert", str(tmp_path / "missing.csv"), str(tmp_path / "out.csv")]) == 1
+    assert "History convert failed" in capsys.readouterr().out
@@ -0,0 +1,225 @@
+from decimal import Decimal
+import os
+from pathlib import Path
+import stat
+
+import pandas as pd
+import pytest
+
+from app.calculation import Calculation
+from app.history_journal import HISTORY_COLUMNS, HistoryJournal
+
+
+CONFIG_DEFAULTS = {"max_history_size": 5, "checkpoint_every": 3, "checkpoint_seconds": 3600}
+
+
+@pytest.fixture(autouse=True)
+def history_dir(config_factory) -> None:
+    # HistoryJournal writes into the directory Calculator creates at startup.
+    config_factory().history_dir.mkdir(parents=True)
+
+
+def _default_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def _calcs(*values: int) -> list:
+    return [Calculation(operation="Addition", operand1=Decimal(value), operand2=Decimal("0")) for value in values]
+
+
+def test_checkpoint_writes_snapshot_and_truncates_journal(config_factory) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+    journal.append(_calcs(1))
+    assert config.history_journal_file.exists()
+
+    journal.checkpoint(_calcs(1, 2))
+
+    assert not config.history_journal_file.exists()
+    frame = pd.read_csv(config.history_file)
+    assert list(frame.columns) == HISTORY_COLUMNS
+    assert frame["result"].tolist() == [1, 2]
+    assert [path.name for path in config.history_dir.iterdir()] == [config.history_file.name]
+
+
+def test_read_returns_snapshot_followed_by_journal(config_factory) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+    journal.checkpoint(_calcs(1, 2))
+    journal.append(_calcs(3))
+    journal.append(_calcs(4))
+
+    rows = HistoryJournal(config).read()
+
+    assert [row["result"] for row in rows] == ["1", "2", "3", "4"]
+
+
+def test_read_keeps_only_newest_max_history_size_rows(config_factory) -> None:
+    config = config_factory(max_history_size=2)
+    journal = HistoryJournal(config)
+    journal.checkpoint(_calcs(1, 2))
+    journal.append(_calcs(3))
+
+    assert [row["result"] for row in journal.read()] == ["2", "3"]
+
+
+@pytest.mark.parametrize("crash_before", ["unlink", "replace"])
+def test_read_completes_interrupted_checkpoint(config_factory, monkeypatch: pytest.MonkeyPatch, crash_before: str) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+    journal.checkpoint(_calcs(1, 2))
+    journal.append(_calcs(3))
+
+    def crash(*args, **kwargs):
+        raise OSError("crash")
+
+    real_replace = os.replace
+    with monkeypatch.context() as patch:
+        if crash_before == "unlink":
+            patch.setattr(Path, "unlink", crash)
+        else:
+            patch.setattr(os, "replace", lambda src, dst: crash() if Path(src) == journal.checkpoint_location else real_replace(src, dst))
+        # A checkpoint after an undo of 3: the new snapshot does not end with the journal's last row.
+        with pytest.raises(OSError, match="crash"):
+            journal.checkpoint(_calcs(1, 2))
+
+    rows = HistoryJournal(config).read()
+
+    assert [row["result"] for row in rows] == ["1", "2"]
+    assert sorted(path.name for path in config.history_dir.iterdir()) == [config.history_file.name]
+
+
+def test_read_ignores_and_truncates_torn_journal_row(config_factory) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+    journal.append(_calcs(1))
+    with open(config.history_journal_file, "a", encoding="utf-8") as handle:
+        handle.write("Addition,2,0,2,2026-01-")
+
+    assert [row["result"] for row in journal.read()] == ["1"]
+
+    journal.append(_calcs(3))
+    assert [row["result"] for row in journal.read()] == ["1", "3"]
+
+
+def test_checkpoint_due_by_count_and_time(config_factory) -> None:
+    config = config_factory(checkpoint_every=2, checkpoint_seconds=60)
+    journal = HistoryJournal(config)
+
+    assert journal.checkpoint_due(1) is False
+    journal.append(_calcs(1))
+    assert journal.checkpoint_due(1) is True
+
+    journal.checkpoint([])
+    journal._last_checkpoint -= 61
+    assert journal.checkpoint_due(0) is True
+
+
+def test_failed_checkpoint_keeps_previous_snapshot(config_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+    journal.checkpoint(_calcs(1))
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    with pytest.raises(OSError, match="disk full"):
+        journal.checkpoint(_calcs(1, 2))
+
+    assert pd.read_csv(config.history_file)["result"].tolist() == [1]
+    assert [path.name for path in config.history_dir.iterdir()] == [config.history_file.name]
+
+
+def _count_fsyncs(monkeypatch: pytest.MonkeyPatch) -> list:
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    return synced
+
+
+def test_always_durability_fsyncs_every_append(config_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    journal = HistoryJournal(config_factory(durability="always"))
+    synced = _count_fsyncs(monkeypatch)
+
+    journal.append(_calcs(1))
+    journal.append(_calcs(2))
+
+    assert journal.durability.syncs == 2
+    assert journal.durability.unsynced_saves == 0
+    # The journal file and its directory each time.
+    assert len(synced) == 4
+
+
+def test_batch_durability_fsyncs_every_n_saves(config_factory) -> None:
+    journal = HistoryJournal(config_factory(durability="batch", fsync_every=3))
+
+    journal.append(_calcs(1))
+    journal.append(_calcs(2))
+    assert journal.durability.syncs == 0
+    assert journal.durability.unsynced_saves == 2
+
+    journal.append(_calcs(3))
+    assert journal.durability.syncs == 1
+    assert journal.durability.unsynced_saves == 0
+
+
+def test_interval_durability_fsyncs_after_the_interval(config_factory) -> None:
+    journal = HistoryJournal(config_factory(durability="interval", fsync_interval_ms=60_000))
+
+    journal.append(_calcs(1))
+    assert journal.durability.syncs == 0
+    journal.durability._last_sync -= 61
+    journal.append(_calcs(2))
+    assert journal.durability.syncs == 1
+
+    journal.append(_calcs(3))
+    journal.sync()
+    assert journal.durability.syncs == 2
+    assert journal.durability.unsynced_saves == 0
+
+
+def test_fsync_path_ignores_missing_files_and_unsupported_fsync(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from app.history_journal import fsync_path
+
+    fsync_path(tmp_path / "missing.csv")
+
+    def unsupported(fd):
+        raise OSError("not supported")
+
+    monkeypatch.setattr(os, "fsync", unsupported)
+    fsync_path(tmp_path)
+
+
+def test_quarantine_moves_snapshot_and_journal_aside(config_factory) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+    journal.checkpoint(_calcs(1))
+    journal.append(_calcs(2))
+
+    moved = journal.quarantine()
+
+    assert not journal.exists()
+    assert [path.name.split(".corrupt-")[0] for path in moved] == [
+        config.history_file.name,
+        config.history_journal_file.name,
+    ]
+    assert pd.read_csv(moved[0])["result"].tolist() == [1]
+
+
+def test_checkpoint_keeps_the_history_file_mode(config_factory) -> None:
+    config = config_factory()
+    journal = HistoryJournal(config)
+
+    journal.checkpoint(_calcs(1))
+    assert _mode(config.history_file) == _default_mode()
+
+    os.chmod(config.history_file, 0o640)
+    journal.checkpoint(_calcs(1, 2))
+    assert _mode(config.history_file) == 0o640
@@ -0,0 +1,185 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pandas as pd
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+from app.history_partitions import PartitionedHistory
+from app.operations import Addition
+
+
+CONFIG_DEFAULTS = {"max_history_size": 5, "history_partition": "day"}
+
+
+def _calc(value: int, timestamp: str) -> Calculation:
+    calc = Calculation(operation="Addition", operand1=Decimal(value), operand2=Decimal("0"))
+    calc.timestamp = datetime.fromisoformat(timestamp)
+    return calc
+
+
+def _names(config: CalculatorConfig) -> list:
+    return sorted(path.name for path in config.history_partition_dir.iterdir())
+
+
+def test_append_writes_one_file_per_day(config_factory) -> None:
+    config = config_factory()
+    store = PartitionedHistory(config)
+
+    store.append([_calc(1, "2026-01-01T10:00:00"), _calc(2, "2026-01-02T09:00:00")])
+    store.append([_calc(3, "2026-01-02T11:00:00")])
+
+    assert _names(config) == ["calculator_history-2026-01-01.csv", "calculator_history-2026-01-02.csv"]
+    day_two = pd.read_csv(store.partition_path("2026-01-02"))
+    assert day_two["result"].tolist() == [2, 3]
+    assert [row["result"] for row in store.read()] == ["1", "2", "3"]
+
+
+def test_hour_partitions_use_hour_keys(config_factory) -> None:
+    config = config_factory(history_partition="hour")
+    store = PartitionedHistory(config)
+
+    store.append([_calc(1, "2026-01-01T10:15:00"), _calc(2, "2026-01-01T11:15:00")])
+
+    assert _names(config) == ["calculator_history-2026-01-01-10.csv", "calculator_history-2026-01-01-11.csv"]
+
+
+def test_read_opens_only_the_newest_partitions_needed(config_factory) -> None:
+    config = config_factory(max_history_size=2)
+    store = PartitionedHistory(config)
+    store.append([_calc(1, "2026-01-01T10:00:00")])
+    store.append([_calc(2, "2026-01-02T10:00:00"), _calc(3, "2026-01-02T11:00:00")])
+    # An unreadable old partition proves it is never opened.
+    store.partition_path("2026-01-01").write_bytes(b"\xff\xfe not csv")
+
+    assert [row["result"] for row in store.read()] == ["2", "3"]
+
+
+def test_partitions_ignores_unrelated_files(config_factory) -> None:
+    config = config_factory()
+    store = PartitionedHistory(config)
+    assert store.partitions() == []
+    assert store.exists() is False
+
+    store.append([_calc(1, "2026-01-01T10:00:00")])
+    (config.history_partition_dir / "calculator_history-notes.csv").write_text("x\n", encoding="utf-8")
+
+    assert [key for key, _ in store.partitions()] == ["2026-01-01"]
+    assert store.exists() is True
+    assert store.checkpoint_due(1000) is False
+
+
+def test_prune_deletes_partitions_past_retention(config_factory) -> None:
+    config = config_factory(history_retention_days=2)
+    store = PartitionedHistory(config)
+    for day in ("01", "02", "03", "04"):
+        path = store.partition_path(f"2026-01-{day}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+    before = {path: path.stat().st_ino for _, path in store.partitions()}
+
+    removed = store.prune(now=datetime(2026, 1, 4, 12, 0))
+
+    assert [path.name for path in removed] == ["calculator_history-2026-01-01.csv"]
+    assert _names(config) == [
+        "calculator_history-2026-01-02.csv",
+        "calculator_history-2026-01-03.csv",
+        "calculator_history-2026-01-04.csv",
+    ]
+    # Surviving partitions are the same files, not rewritten copies.
+    assert all(path.stat().st_ino == before[path] for _, path in store.partitions())
+
+
+def test_prune_is_disabled_without_retention(config_factory) -> None:
+    store = PartitionedHistory(config_factory())
+    store.append([_calc(1, "2000-01-01T10:00:00")])
+
+    assert store.prune() == []
+    assert store.exists() is True
+
+
+def test_append_to_new_partition_applies_retention(config_factory) -> None:
+    store = PartitionedHistory(config_factory(history_retention_days=1))
+    store.append([_calc(1, "2000-01-01T10:00:00")])
+
+    store.append([_calc(2, datetime.now().isoformat())])
+
+    assert [row["result"] for row in store.read()] == ["2"]
+
+
+def test_checkpoint_rewrites_only_partitions_from_first_calculation(config_factory) -> None:
+    config = config_factory()
+    store = PartitionedHistory(config)
+    archive = _calc(1, "2026-01-01T10:00:00")
+    calcs = [_calc(2, "2026-01-02T10:00:00"), _calc(3, "2026-01-02T11:00:00"), _calc(4, "2026-01-03T10:00:00")]
+    store.append([archive, *calcs])
+    archive_inode = store.partition_path("2026-01-01").stat().st_ino
+
+    # Undo of the last two calculations.
+    store.checkpoint(calcs[:1])
+
+    assert _names(config) == ["calculator_history-2026-01-01.csv", "calculator_history-2026-01-02.csv"]
+    assert store.partition_path("2026-01-01").stat().st_ino == archive_inode
+    assert [row["result"] for row in store.read()] == ["1", "2"]
+
+
+def test_checkpoint_keeps_older_rows_of_first_partition(config_factory) -> None:
+    store = PartitionedHistory(config_factory())
+    store.append([_calc(1, "2026-01-01T09:00:00"), _calc(2, "2026-01-01T10:00:00")])
+
+    store.checkpoint([_calc(5, "2026-01-01T10:00:00"), _calc(6, "2026-01-01T11:00:00")])
+
+    assert [row["result"] for row in store.read()] == ["1", "5", "6"]
+
+
+def test_checkpoint_of_empty_history_removes_partitions(config_factory) -> None:
+    config = config_factory()
+    store = PartitionedHistory(config)
+    store.append([_calc(1, "2026-01-01T10:00:00")])
+
+    store.checkpoint([])
+
+    assert store.exists() is False
+    assert store.read() == []
+
+
+def test_calculator_persists_to_partitions(config_factory) -> None:
+    config = config_factory()
+    calc = Calculator(config=config)
+    assert isinstance(calc.journal, PartitionedHistory)
+
+    calc.set_operation(Addition())
+    calc.perform_operation("1", "2")
+    calc.save_history()
+    calc.perform_operation("3", "4")
+    calc.save_history()
+
+    assert not config.history_file.exists()
+    assert [row["result"] for row in PartitionedHistory(config).read()] == ["3", "7"]
+
+    calc.undo()
+    calc.save_history()
+    reloaded = Calculator(config=config)
+    assert [str(item.result) for item in reloaded.history] == ["3"]
+
+    calc.clear_history()
+    calc.save_history()
+    assert Calculator(config=config).history == []
+
+
+def test_partition_appends_follow_durability_policy_and_quarantine(config_factory) -> None:
+    config = config_factory(durability="batch", fsync_every=2)
+    store = PartitionedHistory(config)
+    assert store.quarantine() == []
+
+    store.append([_calc(1, "2026-01-01T10:00:00"), _calc(2, "2026-01-02T10:00:00")])
+    assert store.durability.syncs == 0
+    store.sync()
+    assert store.durability.syncs == 1
+
+    moved = store.quarantine()
+
+    assert store.exists() is False
+    assert moved[0].name.startswith("partitions.corrupt-")
+    assert len(list(moved[0].iterdir())) == 2
@@ -1,9 +1,11 @@
 from decimal import Decimal
 from types import SimpleNamespace
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from app.exceptions import ValidationError
+from app.exceptions import BulkValidationError, ValidationError
 from app.input_validators import InputValidator
 
 
@@ -37,3 +39,119 @@ def test_validate_number_rejects_values_over_maximum() -> None:
 def test_validate_number_allows_value_at_limit() -> None:
 	assert InputValidator.validate_number("100", _config("100")) == Decimal("1E+2")
 
+
+
+def _backend_config(backend: str, max_value: str = "100") -> SimpleNamespace:
+	return SimpleNamespace(max_input_value=Decimal(max_value), numeric_backend=backend)
+
+
+@pytest.mark.parametrize("raw,expected", [(7, 7), ("-12", -12), (" +3 ", 3)])
+def test_validate_number_int_backend_keeps_integers(raw, expected: int) -> None:
+	result = InputValidator.validate_number(raw, _backend_config("int"))
+	assert type(result) is int
+	assert result == expected
+
+
+def test_validate_number_int_backend_falls_back_to_decimal() -> None:
+	result = InputValidator.validate_number("2.50", _backend_config("int"))
+	assert result == Decimal("2.5")
+	assert isinstance(result, Decimal)
+
+
+def test_validate_number_int_backend_checks_bounds() -> None:
+	with pytest.raises(ValidationError, match="exceeds maximum"):
+		InputValidator.validate_number(101, _backend_config("int"))
+
+
+def test_validate_number_float_backend() -> None:
+	result = InputValidator.validate_number(" 2.5 ", _backend_config("float"))
+	assert type(result) is float
+	assert result == 2.5
+
+
+@pytest.mark.parametrize("raw", ["abc", "nan", "inf", None])
+def test_validate_number_float_backend_rejects_invalid(raw) -> None:
+	with pytest.raises(ValidationError, match="Invalid number format"):
+		InputValidator.validate_number(raw, _backend_config("float"))
+
+
+def test_validate_number_float_backend_checks_bounds() -> None:
+	with pytest.raises(ValidationError, match="exceeds maximum"):
+		InputValidator.validate_number("-100.5", _backend_config("float"))
+
+
+def test_validate_number_reuses_cached_literals() -> None:
+	first = InputValidator.validate_number("42", _config())
+	second = InputValidator.validate_number(" 42 ", _config())
+	assert first is second
+
+
+def test_validate_many_accepts_mixed_sequence() -> None:
+	result = InputValidator.validate_many(["1", " 2.50 ", 3, Decimal("4"), "1e1"], _config())
+	assert result == [Decimal("1"), Decimal("2.5"), Decimal("3"), Decimal("4"), Decimal("10")]
+
+
+def test_validate_many_reports_every_failure_with_row_indexes() -> None:
+	with pytest.raises(BulkValidationError) as info:
+		InputValidator.validate_many(["1", "abc", "500", "nan", "2"], _config())
+
+	assert [(index, value) for index, value, _ in info.value.failures] == [(1, "abc"), (2, "500"), (3, "nan")]
+	assert "3 invalid value(s)" in str(info.value)
+	assert "row 2: Value exceeds maximum allowed: 100" in str(info.value)
+
+
+def test_validate_many_truncates_long_failure_messages() -> None:
+	with pytest.raises(BulkValidationError, match="and 2 more"):
+		InputValidator.validate_many(["x"] * 12, _config())
+
+
+@pytest.mark.parametrize(
+	"backend,expected_type",
+	[("decimal", Decimal), ("int", int), ("float", float)],
+)
+def test_validate_many_numpy_array_per_backend(backend: str, expected_type: type) -> None:
+	result = InputValidator.validate_many(np.array([[1, 2], [3, 4]]), _backend_config(backend))
+	assert result == [1, 2, 3, 4]
+	assert all(type(value) is expected_type for value in result)
+
+
+def test_validate_many_numpy_float_array_checks_finite_and_bounds() -> None:
+	with pytest.raises(BulkValidationError) as info:
+		InputValidator.validate_many(np.array([1.5, np.nan, -500.0, np.inf]), _config())
+
+	assert [index for index, _, _ in info.value.failures] == [1, 2, 3]
+	assert info.value.failures[0][2] == "Invalid number format: nan"
+	assert info.value.failures[1][2] == "Value exceeds maximum allowed: 100"
+
+
+def test_validate_many_pandas_series_and_object_columns() -> None:
+	assert InputValidator.validate_many(pd.Series([0.5, 2.0]), _backend_config("float")) == [0.5, 2.0]
+	assert InputValidator.validate_many(pd.Series(["7", "8"]), _config()) == [Decimal("7"), Decimal("8")]
+
+
+def test_validate_array_accepts_numbers_files_and_arrays(tmp_path) -> None:
+	from app.array_operands import ArrayOperand
+
+	path = tmp_path / "v.npy"
+	np.save(path, np.array([1.0, 2.0]))
+	operand = ArrayOperand([3.0])
+
+	assert InputValidator.validate_array(" 2.50 ", _config()) == Decimal("2.5")
+	assert InputValidator.validate_array(7, _config()) == Decimal("7")
+	assert InputValidator.validate_array(str(path), _config()).source == str(path)
+	assert InputValidator.validate_array(operand, _config()) is operand
+	assert InputValidator.validate_array([[1, 2]], _config()).shape == (1, 2)
+	assert InputValidator.validate_array([], _config()).shape == (0,)
+
+
+@pytest.mark.parametrize(
+	"value,message",
+	[
+		([1, float("nan")], "not finite"),
+		([1, 10**9], "exceeds maximum"),
+		([[1, 2], [3]], "Invalid array"),
+	],
+)
+def test_validate_array_rejects_bad_arrays(value, message: str) -> None:
+	with pytest.raises(ValidationError, match=message):
+		InputValidator.validate_array(value, _config())
@@ -0,0 +1,126 @@
+import json
+from pathlib import Path
+import random
+
+import pytest
+
+from app import calculator_repl
+from app.calculator import Calculator
+from app.load_generator import (
+    LoadReport,
+    LoadSpec,
+    build_workload,
+    check_mix,
+    main,
+    operand_sampler,
+    parse_mix,
+    run_load,
+    run_process_session,
+)
+
+
+def test_parse_mix_reads_weights() -> None:
+    assert parse_mix("add=4, Divide=0.5,multiply") == {"add": 4.0, "divide": 0.5, "multiply": 1.0}
+
+
+@pytest.mark.parametrize("text", ["", "add=x", "add=-1", "add=0"])
+def test_parse_mix_rejects_bad_weights(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_mix(text)
+
+
+@pytest.mark.parametrize("name", ["sum", "matmul", "nope"])
+def test_check_mix_rejects_non_binary_operations(name: str) -> None:
+    with pytest.raises(ValueError):
+        check_mix({"add": 1, name: 1})
+
+
+def test_operand_samplers() -> None:
+    uniform = operand_sampler("uniform:1:2", random.Random(1))
+    assert all(1 <= float(uniform()) <= 2 for _ in range(20))
+
+    zipf = operand_sampler("zipf:3:1:100", random.Random(1))
+    assert len({zipf() for _ in range(200)}) <= 3
+
+    for spec in ("normal:1:2", "uniform:1", "zipf:0:1:2", "uniform:a:b"):
+        with pytest.raises(ValueError):
+            operand_sampler(spec, random.Random(1))
+
+
+def test_workload_is_reproducible_per_session() -> None:
+    spec = LoadSpec(parse_mix("add,divide"), operations=5)
+
+    assert build_workload(spec, 0) == build_workload(spec, 0)
+    assert build_workload(spec, 0) != build_workload(spec, 1)
+    assert {name for name, _, _ in build_workload(spec, 0)} <= {"add", "divide"}
+
+
+def test_report_percentiles_and_throughput() -> None:
+    report = LoadReport("threads", "calculator", 1, [i / 1000 for i in range(1, 101)], 0, 2.0, 10, 20)
+
+    assert report.percentile(50) == pytest.approx(50)
+    assert report.percentile(99) == pytest.approx(99)
+    assert report.throughput == 50
+    assert report.lines()[-1] == "written 10 bytes to history_dir, 20 bytes to log_dir"
+    empty = LoadReport("threads", "calculator", 1, [], 0, 0.0, 0, 0)
+    assert (empty.percentile(95), empty.throughput) == (0.0, 0.0)
+
+
+@pytest.mark.parametrize("path", ["calculator", "repl"])
+def test_thread_sessions_share_one_history(tmp_path: Path, path: str) -> None:
+    spec = LoadSpec(parse_mix("add=3,divide=1"), operations=10, path=path)
+
+    report = run_load(spec, 3, "threads", tmp_path)
+
+    assert report.operations == 30
+    assert report.errors == 0
+    assert report.history_bytes > 0
+    assert report.log_bytes > 0
+    assert (tmp_path / "history" / "calculator_history.csv").exists()
+    assert "input" not in vars(calculator_repl)
+
+
+@pytest.mark.parametrize("path", ["calculator", "repl"])
+def test_failed_operations_are_counted(tmp_path: Path, path: str) -> None:
+    spec = LoadSpec(parse_mix("divide"), operands="uniform:0:0", operations=4, path=path)
+
+    report = run_load(spec, 1, "threads", tmp_path)
+
+    assert (report.operations, report.errors) == (4, 4)
+
+
+@pytest.mark.parametrize("path", ["calculator", "repl"])
+def test_process_session_uses_its_own_directory_and_saves_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, path: str) -> None:
+    saves = []
+    save_history = Calculator.save_history
+    monkeypatch.setattr(Calculator, "save_history", lambda calc, sync=False: saves.append(sync) or save_history(calc, sync))
+
+    result = run_process_session(tmp_path, LoadSpec(parse_mix("multiply"), operations=3, path=path), 2)
+
+    assert len(result.latencies) == 3
+    assert (tmp_path / "session-2" / "history" / "calculator_history.csv").exists()
+    assert saves.count(True) == 1
+    assert "print" not in vars(calculator_repl)
+
+
+def test_process_mode(tmp_path: Path) -> None:
+    report = run_load(LoadSpec(parse_mix("add"), operations=5), 2, "processes", tmp_path)
+
+    assert report.operations == 10
+    assert report.history_bytes > 0
+
+
+def test_main_prints_report(tmp_path: Path, capsys) -> None:
+    assert main(["--sessions", "2", "--operations", "5", "--base-dir", str(tmp_path), "--json"]) == 0
+    data = json.loads(capsys.readouterr().out)
+    assert data["operations"] == 10
+    assert set(data) >= {"p50_ms", "p95_ms", "p99_ms", "throughput_ops", "history_bytes", "log_bytes"}
+
+    assert main(["--sessions", "1", "--operations", "2", "--mix", "power"]) == 0
+    assert "latency p50" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("args", [["--sessions", "0"], ["--mix", "sum"], ["--operands", "normal"]])
+def test_main_rejects_bad_arguments(args: list, capsys) -> None:
+    assert main(args) == 2
+    assert "Load run failed" in capsys.readouterr().out
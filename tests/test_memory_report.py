@@ -0,0 +1,80 @@
+from decimal import Decimal
+import sys
+import tracemalloc
+
+import numpy as np
+
+from app.array_operands import ArrayOperand
+from app.calculation import Calculation
+from app.calculator_memento import CalculatorMemento
+from app.memory_report import MemoryReport, estimate_size, format_bytes, shallow_size, traced_memory
+
+
+def _report(**overrides) -> MemoryReport:
+    params = dict(
+        history_bytes=100, undo_bytes=20, redo_bytes=0, cache_bytes=30, observer_bytes=5,
+        history_entries=2, undo_entries=1, redo_entries=0,
+    )
+    params.update(overrides)
+    return MemoryReport(**params)
+
+
+def test_estimate_size_counts_shared_objects_once() -> None:
+    calc = Calculation("Addition", Decimal("1"), Decimal("2"))
+    history = [calc]
+    seen: set = set()
+
+    history_bytes = estimate_size([history], seen)
+    snapshot_bytes = estimate_size([CalculatorMemento(history.copy())], seen)
+
+    assert history_bytes > sys.getsizeof(calc) + sys.getsizeof(calc.result)
+    assert 0 < snapshot_bytes < history_bytes
+    assert estimate_size([history], seen) == 0
+
+
+def test_estimate_size_includes_array_data() -> None:
+    array = ArrayOperand(np.zeros((100, 100)))
+
+    assert estimate_size([array], set()) > array.data.nbytes
+
+
+def test_shallow_size_does_not_follow_references() -> None:
+    class Observer:
+        def __init__(self, target):
+            self.target = target
+
+    observer = Observer(list(range(10000)))
+    seen: set = set()
+
+    assert shallow_size([observer, observer], seen) < sys.getsizeof(observer.target)
+    assert shallow_size([observer], seen) == 0
+
+
+def test_report_totals_and_lines() -> None:
+    report = _report(peak_bytes=4096, process_peak_rss=3 * 2**20)
+
+    assert report.total_bytes == 155
+    assert report.to_dict()["total_bytes"] == 155
+    lines = report.lines()
+    assert lines[0] == "  history          100 B  2 calculations"
+    assert lines[3] == "  caches            30 B"
+    assert lines[5] == "  total            155 B  peak 4.0 KiB"
+    assert lines[6] == "  process        3.0 MiB  peak RSS"
+
+
+def test_traced_memory_only_while_tracing() -> None:
+    assert traced_memory() == {"traced_bytes": None, "traced_peak_bytes": None}
+    tracemalloc.start()
+    try:
+        traced = traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert traced["traced_peak_bytes"] >= traced["traced_bytes"] >= 0
+    assert _report(**traced).lines()[-1].startswith("  traced")
+
+
+def test_format_bytes() -> None:
+    assert format_bytes(None) == "0 B"
+    assert format_bytes(1536) == "1.5 KiB"
+    assert format_bytes(5 * 2**30) == "5.0 GiB"
@@ -1,17 +1,32 @@
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
+from app.array_operands import ArrayOperand
+
 from app.exceptions import ValidationError
+from app import operations
 from app.operations import (
 	Addition,
 	Division,
+	DotProduct,
+	LinearSolve,
+	MatrixMultiply,
+	Maximum,
+	Mean,
+	Minimum,
 	Multiplication,
 	Operation,
 	OperationFactory,
 	Power,
+	Product,
 	Root,
+	StandardDeviation,
 	Subtraction,
+	Sum,
+	VectorAddition,
+	VectorScale,
 )
 
 
@@ -98,3 +113,173 @@ def test_register_operation_allows_custom_operation() -> None:
 	op = OperationFactory.create_operation("mod")
 	assert op.execute(Decimal("10"), Decimal("4")) == Decimal("2")
 
+
+
+@pytest.mark.parametrize("a,b,expected", [(9, 3, 3), (-8, 2, -4)])
+def test_division_of_ints_stays_integral_when_exact(a: int, b: int, expected: int) -> None:
+	result = Division().execute(a, b)
+	assert type(result) is int
+	assert result == expected
+
+
+def test_division_of_ints_falls_back_to_decimal_when_inexact() -> None:
+	assert Division().execute(1, 4) == Decimal("0.25")
+
+
+
+@pytest.mark.parametrize(
+	"operation,values,expected",
+	[
+		(Sum(), [Decimal("0.1"), Decimal("0.2"), Decimal("0.3")], Decimal("0.6")),
+		(Sum(), [0.1, 0.2, 0.3], 0.6),
+		(Sum(), [1, 2, 3], 6),
+		(Product(), [Decimal("1.5"), Decimal("2"), Decimal("4")], Decimal("12.0")),
+		(Mean(), [Decimal("1"), Decimal("2")], Decimal("1.5")),
+		(Mean(), [1.0, 2.0, 4.5], 2.5),
+		(Mean(), [2, 4], 3),
+		(Mean(), [1, 2], Decimal("1.5")),
+		(StandardDeviation(), [Decimal("2"), Decimal("4"), Decimal("4"), Decimal("4"), Decimal("5"), Decimal("5"), Decimal("7"), Decimal("9")], Decimal("2")),
+		(StandardDeviation(), [2.0, 4.0, 4.0, 4.0, 5.0, 5.0, 7.0, 9.0], 2.0),
+		(Minimum(), [Decimal("3"), Decimal("-1"), Decimal("2")], Decimal("-1")),
+		(Minimum(), [3.0, -1.0], -1.0),
+		(Maximum(), [3, -1, 7], 7),
+		(Maximum(), [3.0, -1.0], 3.0),
+	],
+)
+def test_aggregate_operations(operation, values: list, expected) -> None:
+	result = operation.execute_vectors([values])
+	assert result == expected
+	assert type(result) is type(expected)
+
+
+def test_aggregate_execute_takes_two_operands_as_a_list() -> None:
+	assert Sum().execute(Decimal("2"), Decimal("3")) == Decimal("5")
+	assert DotProduct().execute(Decimal("2"), Decimal("3")) == Decimal("6")
+
+
+def test_dot_product_of_decimal_and_float_vectors() -> None:
+	assert DotProduct().execute_vectors([[Decimal("1"), Decimal("2")], [Decimal("3"), Decimal("4")]]) == Decimal("11")
+	assert DotProduct().execute_vectors([[1.5, 2.0], [2.0, 0.25]]) == 3.5
+
+
+@pytest.mark.parametrize(
+	"operation,vectors,message",
+	[
+		(Sum(), [[1], [2]], "takes 1 operand list"),
+		(Mean(), [[]], "needs at least one operand"),
+		(DotProduct(), [[1, 2], [3]], "equal length"),
+	],
+)
+def test_aggregate_operations_validate_operand_lists(operation, vectors: list, message: str) -> None:
+	with pytest.raises(ValidationError, match=message):
+		operation.execute_vectors(vectors)
+
+
+def test_operation_factory_creates_aggregates_and_finds_classes_by_name() -> None:
+	assert isinstance(OperationFactory.create_operation("stddev"), StandardDeviation)
+	assert OperationFactory.aggregate_names()[:7] == ["sum", "product", "mean", "stddev", "min", "max", "dot"]
+	assert "add" not in OperationFactory.aggregate_names()
+	assert OperationFactory.class_for("DotProduct") is DotProduct
+	assert OperationFactory.class_for("Modulus") is None
+
+
+def test_array_operations_return_array_operands() -> None:
+	matrix = ArrayOperand([[2.0, 0.0], [0.0, 4.0]])
+
+	assert VectorAddition().execute(ArrayOperand([1, 2]), np.array([3, 4])).data.tolist() == [4.0, 6.0]
+	assert VectorScale().execute(matrix, Decimal("0.5")).data.tolist() == [[1.0, 0.0], [0.0, 2.0]]
+	assert MatrixMultiply().execute(matrix, ArrayOperand([1, 1])).data.tolist() == [2.0, 4.0]
+	assert LinearSolve().execute(matrix, ArrayOperand([2, 8])).data.tolist() == [1.0, 2.0]
+
+
+@pytest.mark.parametrize(
+	"operation,a,b,message",
+	[
+		(VectorAddition(), [1, 2], [1, 2, 3], "Cannot add arrays"),
+		(VectorScale(), [1, 2], [2, 3], "single number"),
+		(MatrixMultiply(), [[1, 2]], [[1, 2]], "Cannot multiply"),
+		(MatrixMultiply(), [1, 2], 3, "Cannot multiply"),
+		(LinearSolve(), [[1, 2]], [1], "square matrix"),
+		(LinearSolve(), [[1, 0], [0, 1]], [1, 2, 3], "does not match"),
+		(LinearSolve(), [[1, 2], [2, 4]], [1, 2], "LinearSolve failed"),
+	],
+)
+def test_array_operations_validate_shapes(operation, a, b, message: str) -> None:
+	with pytest.raises(ValidationError, match=message):
+		operation.execute(np.array(a), b if isinstance(b, int) else np.array(b))
+
+
+def test_operation_factory_lists_array_operations() -> None:
+	assert OperationFactory.array_names() == ["vadd", "vscale", "matmul", "solve"]
+	assert isinstance(OperationFactory.create_operation("solve"), LinearSolve)
+
+
+@pytest.fixture
+def plugin_module(tmp_path, monkeypatch: pytest.MonkeyPatch) -> str:
+	# An importable plugin module and a factory whose registrations are undone after the test.
+	(tmp_path / "calc_plugins_test.py").write_text(
+		"from app.operations import Operation\n\n"
+		"class Modulus(Operation):\n"
+		"    def execute(self, a, b):\n"
+		"        return a % b\n\n"
+		"NotAnOperation = object\n",
+		encoding="utf-8",
+	)
+	monkeypatch.syspath_prepend(str(tmp_path))
+	monkeypatch.setattr(OperationFactory, "_operations", dict(OperationFactory._operations))
+	monkeypatch.setattr(OperationFactory, "_plugins", {})
+	monkeypatch.setattr(OperationFactory, "_instances", {})
+	return "calc_plugins_test"
+
+
+def test_create_operation_reuses_instances() -> None:
+	assert OperationFactory.create_operation("add") is OperationFactory.create_operation("ADD")
+	assert OperationFactory.instance(Addition) is OperationFactory.create_operation("add")
+
+
+def test_plugins_are_imported_on_first_use(plugin_module: str) -> None:
+	import sys
+
+	names = OperationFactory.discover_plugins({"modulus": f"{plugin_module}:Modulus", "add": "elsewhere:Add"})
+
+	assert names == ["add", "modulus"]
+	assert OperationFactory.plugin_names() == ["modulus"]
+	assert plugin_module not in sys.modules
+	operation = OperationFactory.create_operation("modulus")
+	assert operation.execute(Decimal("7"), Decimal("4")) == Decimal("3")
+	assert plugin_module in sys.modules
+	assert OperationFactory.create_operation("Modulus") is operation
+
+
+def test_plugins_can_be_found_by_class_name(plugin_module: str) -> None:
+	from app.calculation import Calculation
+
+	OperationFactory.register_plugin("modulus", f"{plugin_module}:Modulus")
+
+	assert Calculation("Modulus", Decimal("9"), Decimal("5")).result == Decimal("4")
+	assert OperationFactory.class_for("Unknown") is None
+
+
+def test_broken_plugins_raise_on_use(plugin_module: str) -> None:
+	with pytest.raises(ValueError, match="module:Class"):
+		OperationFactory.register_plugin("bad", plugin_module)
+
+	OperationFactory.register_plugin("missing", "no_such_module_xyz:Thing")
+	OperationFactory.register_plugin("wrong", f"{plugin_module}:NotAnOperation")
+	with pytest.raises(ValueError, match="Cannot load operation plugin missing"):
+		OperationFactory.create_operation("missing")
+	with pytest.raises(TypeError, match="inherit from Operation"):
+		OperationFactory.create_operation("wrong")
+
+
+def test_discover_plugins_reads_entry_points(plugin_module: str, monkeypatch: pytest.MonkeyPatch) -> None:
+	from importlib import metadata
+
+	entry_point = metadata.EntryPoint(name="modulus", value=f"{plugin_module}:Modulus", group=operations.PLUGIN_GROUP)
+	monkeypatch.setattr(metadata, "entry_points", lambda group: [entry_point] if group == operations.PLUGIN_GROUP else [])
+	operations._entry_point_plugins.cache_clear()
+	try:
+		assert OperationFactory.discover_plugins() == ["modulus"]
+	finally:
+		operations._entry_point_plugins.cache_clear()
+	assert OperationFactory.create_operation("modulus").execute(Decimal("5"), Decimal("3")) == Decimal("2")
@@ -0,0 +1,191 @@
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+import app.result_cache as result_cache
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.operations import Addition, Division, Power
+from app.result_cache import ResultCache
+
+
+CONFIG_DEFAULTS = {"max_history_size": 10, "result_cache_size": 100}
+
+
+def _cache(tmp_path: Path, **kwargs) -> ResultCache:
+    return ResultCache(tmp_path / "results.sqlite3", kwargs.pop("max_entries", 100), **kwargs)
+
+
+def test_results_persist_across_instances_with_their_types(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    cache.put("Addition", Decimal("1.5"), Decimal("2"), Decimal("3.5"))
+    cache.put("Division", 6, 3, 2)
+    cache.put("Multiplication", 0.1, 3.0, 0.30000000000000004)
+    cache.close()
+
+    reopened = _cache(tmp_path)
+
+    assert reopened.get("Addition", Decimal("1.5"), Decimal("2")) == Decimal("3.5")
+    assert type(reopened.get("Division", 6, 3)) is int
+    assert reopened.get("Multiplication", 0.1, 3.0) == 0.30000000000000004
+    assert reopened.get("Addition", Decimal("1"), Decimal("1")) is None
+    assert (reopened.hits, reopened.misses) == (3, 1)
+
+
+def test_unsupported_result_types_are_not_cached(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    cache.put("Custom", 1, 1, True)
+    cache.put("Custom", 1, 2, "text")
+
+    assert len(cache) == 0
+
+
+def test_backends_do_not_share_entries(tmp_path: Path) -> None:
+    _cache(tmp_path, backend="int").put("Addition", 1, 2, 3)
+
+    assert _cache(tmp_path, backend="decimal").get("Addition", 1, 2) is None
+
+
+def test_cache_keeps_only_the_newest_entries(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, max_entries=3)
+    for value in range(5):
+        cache.put("Addition", Decimal(value), Decimal("0"), Decimal(value))
+    cache.flush()
+
+    assert len(cache) == 3
+    assert _cache(tmp_path, max_entries=3).get("Addition", Decimal("0"), Decimal("0")) is None
+    assert _cache(tmp_path, max_entries=3).get("Addition", Decimal("4"), Decimal("0")) == Decimal("4")
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, max_entries=3)
+    for value in range(3):
+        cache.put("Addition", Decimal(value), Decimal("0"), Decimal(value))
+    cache.flush()
+    reopened = _cache(tmp_path, max_entries=3)
+    assert reopened.get("Addition", Decimal("0"), Decimal("0")) == Decimal("0")
+    reopened.put("Addition", Decimal("3"), Decimal("0"), Decimal("3"))
+    reopened.flush()
+
+    fresh = _cache(tmp_path, max_entries=3)
+    assert fresh.get("Addition", Decimal("0"), Decimal("0")) == Decimal("0")
+    assert fresh.get("Addition", Decimal("1"), Decimal("0")) is None
+
+
+def test_writes_are_batched(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(result_cache, "WRITE_BATCH", 2)
+    cache = _cache(tmp_path)
+    other_process = _cache(tmp_path)
+
+    cache.put("Addition", Decimal("1"), Decimal("1"), Decimal("2"))
+    assert other_process.get("Addition", Decimal("1"), Decimal("1")) is None
+
+    cache.put("Addition", Decimal("1"), Decimal("2"), Decimal("3"))
+    assert other_process.get("Addition", Decimal("1"), Decimal("1")) == Decimal("2")
+
+
+def test_memory_front_is_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(result_cache, "MEMORY_ENTRIES", 2)
+    cache = _cache(tmp_path)
+    for value in range(3):
+        cache.put("Addition", Decimal(value), Decimal("0"), Decimal(value))
+
+    assert len(cache._memory) == 2
+    cache.flush()
+    assert cache.get("Addition", Decimal("0"), Decimal("0")) == Decimal("0")
+    assert cache.get("Addition", Decimal("0"), Decimal("0")) == Decimal("0")
+    assert cache.hits == 2
+
+
+def test_memory_front_never_exceeds_the_configured_size(tmp_path: Path) -> None:
+    cache = _cache(tmp_path, max_entries=2)
+    for value in range(5):
+        cache.put("Addition", Decimal(value), Decimal("0"), Decimal(value))
+
+    assert cache.memory_entries == 2
+    assert list(cache._memory) == [cache.key("Addition", Decimal(value), Decimal("0")) for value in (3, 4)]
+
+
+def test_memory_bytes_counts_entries_not_seen_elsewhere(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    empty = cache.memory_bytes()
+    result = Decimal("12345.678")
+    cache.put("Addition", Decimal("1"), Decimal("2"), result)
+
+    assert cache.memory_bytes() > empty
+    assert cache.memory_bytes({id(result)}) < cache.memory_bytes()
+
+
+def test_warm_loads_history_results_of_built_in_operations(tmp_path: Path) -> None:
+    cache = _cache(tmp_path)
+    history = [
+        Calculation("Addition", Decimal("2"), Decimal("3")),
+        Calculation("Power", Decimal("3"), Decimal("40")),
+    ]
+
+    assert cache.warm(history) == 2
+    assert cache.get("Addition", Decimal("2"), Decimal("3")) == Decimal("5")
+    assert cache.get("Power", Decimal("3"), Decimal("40")) == Power().execute(Decimal("3"), Decimal("40"))
+    assert _cache(tmp_path / "int", backend="int").warm(history) == 0
+
+
+def test_database_errors_are_logged_and_treated_as_misses(tmp_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level("WARNING")
+    cache = _cache(tmp_path)
+    cache._connection.close()
+
+    assert cache.get("Addition", Decimal("1"), Decimal("1")) is None
+    cache.put("Addition", Decimal("1"), Decimal("1"), Decimal("2"))
+    cache.flush()
+
+    assert "Result cache lookup failed" in caplog.text
+    assert "Result cache write failed" in caplog.text
+
+
+def test_calculator_consults_cache_warmed_from_history(config_factory) -> None:
+    first = Calculator(config=config_factory())
+    first.set_operation(Addition())
+    first.perform_operation("2", "3")
+    first.save_history()
+    assert first.result_cache.misses == 1
+
+    calc = Calculator(config=config_factory())
+    calc.set_operation(Addition())
+    assert calc.perform_operation("2", "3") == Decimal("5")
+    assert (calc.result_cache.hits, calc.result_cache.misses) == (1, 0)
+    assert calc.history[-1].result == Decimal("5")
+    assert calc.history[-1].operand1 == Decimal("2")
+
+    calc.set_operation(Power())
+    calc.perform_operation("2", "3")
+    calc.perform_operation("2", "3")
+    assert (calc.result_cache.hits, calc.result_cache.misses) == (2, 1)
+
+
+def test_cache_hit_does_not_recompute_the_calculation(config_factory, monkeypatch: pytest.MonkeyPatch) -> None:
+    calc = Calculator(config=config_factory())
+    calc.set_operation(Addition())
+    calc.perform_operation("2", "3")
+
+    monkeypatch.setattr(Calculation, "calculate", lambda self: pytest.fail("recomputed"))
+    assert calc.perform_operation("2", "3") == Decimal("5")
+    assert calc.history[-1].result == Decimal("5")
+    assert calc.history[-1].timestamp >= calc.history[0].timestamp
+
+
+def test_failed_operations_are_not_cached(config_factory) -> None:
+    calc = Calculator(config=config_factory())
+    calc.set_operation(Division())
+
+    with pytest.raises(Exception):
+        calc.perform_operation("1", "0")
+
+    assert len(calc.result_cache) == 0
+
+
+def test_result_cache_is_disabled_by_default(config_factory) -> None:
+    calc = Calculator(config=config_factory(result_cache_size=0))
+
+    assert calc.result_cache is None
+    assert not calc.config.result_cache_file.exists()